@@ -1,65 +1,40 @@
 import json
 import os
+import sys
 import pandas as pd
-from collections import defaultdict, Counter
 
-# === Load Data ===
-with open('bandit_output_raw.json', 'r') as f:
-    bandit_data = json.load(f)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.issue_store import open_issues
+from common.issue_summary import IssueAggregate, batch_record, save_aggregate, severity_rows, top_rule_rows
+from common.issue_sketch import StreamingAggregate, stream_rows
+
+BANDIT_OUTPUT = 'bandit_output_raw.json'
+ISSUE_STORE = 'bandit_output_raw.issues'  # Columnar copy of BANDIT_OUTPUT, rebuilt when it changes
+AGGREGATE_FILE = 'bandit_output_raw.aggregate.json'  # Mergeable counts for UpdateIssueAggregate.py
+# --streaming: bounded-memory sketches (top-k rules, HyperLogLog distinct counts); --exact keeps exact counts
+STREAMING = '--streaming' in sys.argv
+EXACT = '--exact' in sys.argv
 
+# === Load Data ===
+source = {'kind': 'bandit', 'path': BANDIT_OUTPUT}
 with open('bandit_rule_categorization.json', 'r') as f:
     rule_categories = json.load(f)
 
-results = bandit_data.get('results', [])
-
-# === Initialize Counters ===
-severity_counts = defaultdict(int)
-files_per_severity = defaultdict(set)
-conversations_per_severity = defaultdict(set)
-issue_counter = Counter()
-
-# === Process Each Issue ===
-for issue in results:
-    rule = issue.get('test_id')
-    filename = issue.get('filename')
-    severity = issue.get('issue_severity', 'Undefined')
-
-    severity_counts[severity] += 1
-    files_per_severity[severity].add(filename)
-
-    conversation = os.path.basename(os.path.dirname(filename))
-    conversations_per_severity[severity].add(conversation)
-
-    issue_counter[rule] += 1
+# === Count Severities, Files, Conversations and Rules in One Pass ===
+if STREAMING:
+    aggregate = StreamingAggregate('severity', exact=EXACT)
+    aggregate.update(stream_rows(source))
+else:
+    issues = open_issues(ISSUE_STORE, [source]).issues
+    aggregate = IssueAggregate.from_table(issues)
+    aggregate.batches.append(batch_record('add', source))
+    save_aggregate(aggregate, AGGREGATE_FILE)
 
 # === Prepare Severity Summary ===
-severity_data = []
-for sev in ['HIGH', 'MEDIUM', 'LOW', 'UNDEFINED']:
-    total_issues = severity_counts.get(sev, 0)
-    if total_issues == 0:
-        continue
-    severity_data.append({
-        'Severity': sev,
-        'Total Issues': total_issues,
-        'Files Affected': len(files_per_severity[sev]),
-        'Conversations Affected': len(conversations_per_severity[sev])
-    })
-
-severity_df = pd.DataFrame(severity_data)
+severity_df = pd.DataFrame(severity_rows(aggregate))
 
 # === Top 5 Most Frequent Issues ===
-top_issues = issue_counter.most_common(5)
-top_issues_data = []
-for rule, count in top_issues:
-    rule_info = rule_categories.get(rule, {})
-    top_issues_data.append({
-        'Bandit Rule': rule,
-        'Occurrences': count,
-        'Severity': rule_info.get('default_severity', 'N/A'),
-        'Description': rule_info.get('description', 'No description')
-    })
-
-top_issues_df = pd.DataFrame(top_issues_data)
+top_issues_df = pd.DataFrame(top_rule_rows(aggregate, rule_categories, n=5))
 
 # === Export CSVs ===
 severity_df.to_csv('bandit_severity_summary.csv', index=False)
@@ -70,4 +45,6 @@ print("\n📊 Bandit Severity Summary:")
 print(severity_df)
 print("\n🏆 Top 5 Most Frequent Bandit Issues:")
 print(top_issues_df)
+if STREAMING:
+    print(f"\n📐 Streaming mode: {aggregate.error_note()}")
 print("\n✅ Analysis completed. CSV files generated.")
@@ -1,42 +1,100 @@
-import subprocess
 import json
 import os
+import sys
+import argparse
+from functools import partial
 from tqdm import tqdm
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.snippet_store import SnippetStore
+from common.lint_profile import load_profile, bandit_args, DEFAULT_PROFILE_FILE
+from common.lint_shards import make_shards, iter_shards, run_bandit, merge_bandit, bandit_totals, DEFAULT_SHARD_SIZE
+
 TARGET_FILES = 'successful_python_snippets.txt'
 BANDIT_RAW_OUTPUT = 'bandit_output_raw.json'
 BANDIT_RULES_JSON = 'bandit_rule_categorization.json'
 
+parser = argparse.ArgumentParser(description="Run Bandit on Python snippets and extract unique rules.")
+parser.add_argument('--store', metavar='STORE_DIR', default=None,
+                    help="Scan each unique body from Extract.py --dedup once and fan results out")
+parser.add_argument('--workers', type=int, default=1, help="Number of bandit processes running concurrently")
+parser.add_argument('--shard-size', type=int, default=DEFAULT_SHARD_SIZE,
+                    help=f"Files per bandit invocation (default: {DEFAULT_SHARD_SIZE})")
+parser.add_argument('--profile', default=DEFAULT_PROFILE_FILE,
+                    help="Lint profile compiled into bandit flags (default: lint_profile.json)")
+args = parser.parse_args()
+
+def fan_out_bandit(bandit_data, fan_out):
+    """Rewrite Bandit output on store objects as if every occurrence had been scanned."""
+    results = []
+    for item in bandit_data.get('results', []):
+        for occurrence in fan_out.get(item.get('filename', '').replace('\\', '/'), [item.get('filename')]):
+            results.append(dict(item, filename=occurrence))
+
+    metrics = {}
+    for filename, file_metrics in bandit_data.get('metrics', {}).items():
+        if filename == '_totals':
+            continue
+        for occurrence in fan_out.get(filename.replace('\\', '/'), [filename]):
+            metrics[occurrence] = file_metrics
+    metrics['_totals'] = bandit_totals(metrics)
+
+    return dict(bandit_data, results=results, metrics=metrics)
+
 # Load file list and normalize paths
 with open(TARGET_FILES, 'r') as f:
     files = [line.strip() for line in f if line.strip()]
 
 clean_files = [os.path.abspath(f).replace('\\', '/') for f in files]
 
-print(f"🔎 Running Bandit on {len(clean_files)} files...")
+# With a snippet store, scan each unique body once
+if args.store:
+    scan_targets, fan_out = SnippetStore(args.store).unique_targets(clean_files)
+else:
+    scan_targets, fan_out = clean_files, None
+
+def extract_unique_rules(results):
+    unique_rules = {}
+    for item in results:
+        test_id = item.get('test_id')
+        if test_id not in unique_rules:
+            unique_rules[test_id] = {
+                'test_name': item.get('test_name'),
+                'description': item.get('issue_text'),
+                'default_severity': item.get('issue_severity'),
+                'confidence': item.get('issue_confidence'),
+                'cwe': item.get('cwe', {}).get('id', 'N/A'),
+                'category': 'Code Vulnerability'
+            }
+    return unique_rules
+
+# Bandit scans files sorted by name, so sorted contiguous shards report in the same order as one run
+shards = make_shards(sorted(scan_targets), args.shard_size)
+print(f"🔎 Running Bandit on {len(scan_targets)} files in {len(shards)} shards...")
+
+# Run Bandit shards, extracting each shard's rules as soon as it finishes
+shard_outputs = [None] * len(shards)
+shard_rules = [None] * len(shards)
+# Rules the profile turns off are never computed by bandit
+run_shard = partial(run_bandit, extra_args=bandit_args(load_profile(args.profile)))
+for index, output in tqdm(iter_shards(run_shard, shards, args.workers), total=len(shards), desc="Bandit Shards"):
+    shard_outputs[index] = output
+    shard_rules[index] = extract_unique_rules(output.get('results', []))
 
-# Run Bandit with cleaned paths
-subprocess.run(['bandit', '-f', 'json', '-o', BANDIT_RAW_OUTPUT] + clean_files)
+bandit_data = merge_bandit(shard_outputs)
 
-# Load Bandit output
-with open(BANDIT_RAW_OUTPUT, 'r') as f:
-    bandit_data = json.load(f)
+# Fan store results back out so BanditAnalyze.py sees every occurrence
+if fan_out is not None:
+    bandit_data = fan_out_bandit(bandit_data, fan_out)
 
-results = bandit_data.get('results', [])
+with open(BANDIT_RAW_OUTPUT, 'w') as f:
+    json.dump(bandit_data, f, indent=2)
 
-# Extract unique rules
+# First shard to report a rule wins, as the first result did in a single run
 unique_rules = {}
-for item in tqdm(results, desc="Processing Bandit Results"):
-    test_id = item.get('test_id')
-    if test_id not in unique_rules:
-        unique_rules[test_id] = {
-            'test_name': item.get('test_name'),
-            'description': item.get('issue_text'),
-            'default_severity': item.get('issue_severity'),
-            'confidence': item.get('issue_confidence'),
-            'cwe': item.get('cwe', {}).get('id', 'N/A'),
-            'category': 'Code Vulnerability'
-        }
+for rules in shard_rules:
+    for test_id, rule in rules.items():
+        unique_rules.setdefault(test_id, rule)
 
 # Save categorization JSON
 with open(BANDIT_RULES_JSON, 'w') as f_out:
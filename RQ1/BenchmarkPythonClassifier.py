@@ -0,0 +1,102 @@
+import os
+import sys
+import ast
+import time
+import argparse
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.py_classifier import classify_source
+
+TARGET_DIR = "../conversations_new"
+
+# === Original multi-parse classifier (kept here as the reference implementation) ===
+def has_function_or_class(source):
+    try:
+        tree = ast.parse(source)
+        return any(isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)) for node in ast.walk(tree))
+    except SyntaxError:
+        return False
+
+def starts_with_import(source):
+    try:
+        tree = ast.parse(source)
+        first_statement = tree.body[0] if tree.body else None
+        return isinstance(first_statement, (ast.Import, ast.ImportFrom))
+    except SyntaxError:
+        return False
+
+def has_executable_code(source):
+    try:
+        tree = ast.parse(source)
+        return any(isinstance(node, (ast.For, ast.While, ast.If, ast.With, ast.Assign, ast.Expr)) for node in ast.walk(tree))
+    except SyntaxError:
+        return False
+
+def legacy_classify(source, filename):
+    if not source.strip():
+        return 'Failed'
+    try:
+        compile(source, filename, 'exec')
+        if has_function_or_class(source):
+            return 'Successful'
+        elif has_executable_code(source):
+            return 'Executable'
+        elif starts_with_import(source):
+            return 'Only Import'
+        else:
+            return 'No Function/Class Definition'
+    except (SyntaxError, ValueError):
+        return 'Failed'
+
+def safe(classify, source, filename):
+    try:
+        return classify(source, filename)
+    except Exception:
+        return 'Failed'  # Same bucket the scripts use for unexpected errors
+
+def load_corpus(directory):
+    corpus = []
+    for root, dirs, files in os.walk(directory):
+        for file in files:
+            if file.endswith('.py'):
+                try:
+                    with open(os.path.join(root, file), 'r', encoding='utf-8') as f:
+                        corpus.append((file, f.read()))
+                except Exception:
+                    continue
+    return corpus
+
+def time_classifier(classify, corpus, repeat):
+    best, results = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [safe(classify, source, name) for name, source in corpus]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, results
+
+parser = argparse.ArgumentParser(description="Benchmark the single-parse Python classifier against the original one.")
+parser.add_argument('--target', default=TARGET_DIR, help="Snippet folder (default: ../conversations_new)")
+parser.add_argument('--repeat', type=int, default=3, help="Timing runs per classifier; the best is reported")
+args = parser.parse_args()
+
+corpus = load_corpus(args.target)
+print(f"📂 Loaded {len(corpus)} Python snippets from {args.target}")
+
+legacy_time, legacy_results = time_classifier(legacy_classify, corpus, args.repeat)
+engine_time, engine_results = time_classifier(classify_source, corpus, args.repeat)
+
+mismatches = [(name, old, new) for (name, _), old, new in zip(corpus, legacy_results, engine_results) if old != new]
+
+print(f"\n⏱️ Original classifier: {legacy_time:.3f}s")
+print(f"⏱️ Single-parse classifier: {engine_time:.3f}s")
+if engine_time > 0:
+    print(f"🚀 Speedup: {legacy_time / engine_time:.2f}x")
+print(f"\n📊 Categories: {dict(Counter(engine_results))}")
+if mismatches:
+    print(f"\n❌ {len(mismatches)} snippets classified differently, e.g.:")
+    for name, old, new in mismatches[:10]:
+        print(f" - {name}: {old} -> {new}")
+    sys.exit(1)
+print("✅ Both classifiers agree on every snippet")
@@ -0,0 +1,40 @@
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.issue_store import build_store, save_store
+
+DEFAULT_OUTPUT = '../Data/issue_store.issues'
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Normalize linter outputs into one columnar issue store.")
+    parser.add_argument('--pylint', metavar='FILE', help="pylint_output.json from PylintBatch.py")
+    parser.add_argument('--pylint-categories', metavar='FILE', help="pylint_rule_categorization.json")
+    parser.add_argument('--flake8', metavar='FILE', help="flake8_output.json from Flake8Categorize.py")
+    parser.add_argument('--bandit', metavar='FILE', help="bandit_output_raw.json from BanditCategorize.py")
+    parser.add_argument('--bandit-categories', metavar='FILE', help="bandit_rule_categorization.json")
+    parser.add_argument('--fetched', metavar='FILE', help="linter_analysis_results.json from RQ2 step3")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help=f"Store file (default: {DEFAULT_OUTPUT})")
+    args = parser.parse_args()
+
+    sources = []
+    if args.pylint:
+        sources.append({'kind': 'pylint', 'path': args.pylint, 'categories': args.pylint_categories})
+    if args.flake8:
+        sources.append({'kind': 'flake8', 'path': args.flake8})
+    if args.bandit:
+        sources.append({'kind': 'bandit', 'path': args.bandit, 'categories': args.bandit_categories})
+    if args.fetched:
+        sources.append({'kind': 'linter_results', 'path': args.fetched})
+    if not sources:
+        parser.error("give at least one of --pylint, --flake8, --bandit, --fetched")
+
+    store = build_store(sources)
+    save_store(store, args.output)
+
+    for tool, stages in store.issues.group_counts('tool', 'stage').items():
+        for stage, count in stages.items():
+            print(f"🗄️ {tool} ({stage}): {count} issues")
+    print(f"\n✅ {len(store.issues)} issues from {len(sources)} sources saved to {args.output} "
+          f"({os.path.getsize(args.output)} bytes)")
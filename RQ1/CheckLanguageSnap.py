@@ -1,33 +1,30 @@
-import json
 import os
+import sys
 from collections import defaultdict
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.snapshot_reader import iter_sharings, iter_code_blocks
+
 DATA_DIR = "../Snapshot_20230831"
 
 def analyze_file(filepath):
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
     snippet_counts = defaultdict(int)
     conversations_with_lang = defaultdict(set)
 
-    sources = data.get("Sources", [])
-    for source_index, source in enumerate(sources):
-        for sharing_index, sharing in enumerate(source.get("ChatgptSharing", [])):
-            conversation_id = f"{os.path.basename(filepath)}|S{source_index}|C{sharing_index}"
+    for source_index, sharing_index, source, sharing in iter_sharings(filepath):
+        conversation_id = f"{os.path.basename(filepath)}|S{source_index}|C{sharing_index}"
 
-            languages_found = set()
+        languages_found = set()
 
-            for conv in sharing.get("Conversations", []):
-                for snippet in conv.get("ListOfCode", []):
-                    lang = (snippet.get("Type") or "").strip()
-                    if lang == "":
-                        continue
-                    snippet_counts[lang] += 1
-                    languages_found.add(lang)
+        for snippet in iter_code_blocks(sharing):
+            lang = (snippet.get("Type") or "").strip()
+            if lang == "":
+                continue
+            snippet_counts[lang] += 1
+            languages_found.add(lang)
 
-            for lang in languages_found:
-                conversations_with_lang[lang].add(conversation_id)
+        for lang in languages_found:
+            conversations_with_lang[lang].add(conversation_id)
 
     return snippet_counts, conversations_with_lang
 
@@ -0,0 +1,20 @@
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.snippet_archive import SnippetArchive
+
+# Materializes a packed archive (Extract.py --archive) as the usual conversations_new/ tree,
+# for external linters such as flake8, bandit or eslint that need real file paths.
+parser = argparse.ArgumentParser(description="Export a packed snippet archive to a folder tree.")
+parser.add_argument('archive', help="Archive base path (without .pack / .idx.json)")
+parser.add_argument('--output', default="../conversations_new", help="Target folder (default: ../conversations_new)")
+parser.add_argument('--language', choices=['python', 'javascript'], default=None,
+                    help="Only export snippets of one language")
+args = parser.parse_args()
+
+with SnippetArchive(args.archive) as archive:
+    count = archive.export_tree(args.output, args.language)
+
+print(f"✅ Exported {count} snippets to {args.output}")
@@ -1,9 +1,23 @@
-import json
+import argparse
 import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.snapshot_reader import iter_sharings, iter_code_blocks
+from common.snippet_store import SnippetStore, content_hash
+from common.extract_manifest import (load_manifest, save_manifest, fingerprint, snippet_map,
+                                     compute_delta, save_delta, MANIFEST_VERSION)
+from common.snippet_archive import ArchiveWriter, merge_archives
 
 # Set your paths
 DATA_DIR = "../Snapshot_20230831"
 OUTPUT_DIR = "../conversations_new"
+MANIFEST_FILE = "../extract_manifest.json"
+DELTA_FILE = "../extract_delta.json"
+
+# Snapshot files above this size are split into several shards in parallel mode
+LARGE_FILE_BYTES = 64 * 1024 * 1024
 
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
@@ -11,86 +25,197 @@ def sanitize_name(name):
     """Sanitize folder and file names to remove problematic characters."""
     return "".join(c if c.isalnum() or c in ('-', '_') else '_' for c in name)
 
-def extract_code_snippets(filepath):
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    sources = data.get("Sources", [])
-    skipped_snippets = 0
-    total_saved = 0
-    python_detected = 0
-    javascript_detected = 0
-    unknown_languages = set()
-
-    for source_index, source in enumerate(sources):
-        for sharing_index, sharing in enumerate(source.get("ChatgptSharing", [])):
-
-            # Use Title or fallback name
-            raw_name = sharing.get("Title") or f"{os.path.basename(filepath)}_S{source_index}_C{sharing_index}"
-            convo_dir_name = sanitize_name(raw_name)
-            convo_dir_path = os.path.join(OUTPUT_DIR, convo_dir_name)
-            os.makedirs(convo_dir_path, exist_ok=True)
-
-            snippet_counter = 1
-
-            for conv in sharing.get("Conversations", []):
-                for snippet in conv.get("ListOfCode", []):
-                    lang_raw = snippet.get("Type")
-                    lang = (lang_raw or "").strip().lower()
-                    content = snippet.get("Content", "")
-
-                    # Language detection
-                    if lang.startswith("python"):
-                        ext = ".py"
-                        python_detected += 1
-                    elif lang == "javascript":
-                        ext = ".js"
-                        javascript_detected += 1
-                    else:
-                        if lang != "":
-                            unknown_languages.add(lang)
-                        continue  # Skip non-Python/JS
-
-                    # Skip empty content
-                    if content is None or not content.strip():
-                        skipped_snippets += 1
-                        continue
-
-                    # Unique filename
-                    filename = f"snippet_{source_index}_{sharing_index}_{snippet_counter}{ext}"
-                    full_path = os.path.join(convo_dir_path, filename)
-
-                    with open(full_path, 'w', encoding='utf-8') as code_file:
-                        code_file.write(content)
-
-                    snippet_counter += 1
-                    total_saved += 1
+def write_snippet(full_path, content):
+    """Write a snippet atomically so concurrent workers never leave a half-written file."""
+    tmp_path = f"{full_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as code_file:
+        code_file.write(content)
+    os.replace(tmp_path, full_path)
 
+def empty_totals():
     return {
-        "saved": total_saved,
-        "skipped": skipped_snippets,
-        "python_detected": python_detected,
-        "javascript_detected": javascript_detected,
-        "unknown_languages": unknown_languages
-    }
-
-def process_all_files():
-    totals = {
         "saved": 0,
         "skipped": 0,
         "python_detected": 0,
         "javascript_detected": 0,
-        "unknown_languages": set()
+        "unknown_languages": set(),
+        "occurrences": [],
+        "archive_parts": [],
+        "produced": {}
     }
 
-    for filename in os.listdir(DATA_DIR):
-        if filename.endswith('.json'):
-            result = extract_code_snippets(os.path.join(DATA_DIR, filename))
-            totals["saved"] += result["saved"]
-            totals["skipped"] += result["skipped"]
-            totals["python_detected"] += result["python_detected"]
-            totals["javascript_detected"] += result["javascript_detected"]
-            totals["unknown_languages"].update(result["unknown_languages"])
+def merge_totals(totals, result):
+    """Fold one per-file (or per-shard) result into the running totals."""
+    for key, value in result.items():
+        if isinstance(value, set):
+            totals[key].update(value)
+        elif isinstance(value, dict):
+            for name, snippets in value.items():
+                totals[key].setdefault(name, {}).update(snippets)
+        else:
+            totals[key] += value
+    return totals
+
+def source_index_of(snippet_id):
+    """Source index encoded in a ``<title>/snippet_<source>_<sharing>_<n>.<ext>`` id."""
+    return int(snippet_id.rsplit('/', 1)[1].split('_')[1])
+
+def extract_code_snippets(filepath, shard_index=0, shard_count=1, store_dir=None, archive_part=None, only=None):
+    """Extract snippets from one snapshot file.
+
+    With ``shard_count > 1`` only sources whose index falls in this shard are
+    decoded and written (the others are skipped unparsed), so several workers
+    can split one large file between them.
+    With ``only`` (a set of snippet ids) only those snippet files are rewritten.
+    With ``store_dir`` each unique body is stored once in a content-addressed
+    store and every occurrence is returned as a mapping row instead.
+    With ``archive_part`` snippets are appended to a packed part archive.
+    """
+    result = empty_totals()
+    produced = result["produced"].setdefault(os.path.basename(filepath), {})
+    store = SnippetStore(store_dir) if store_dir else None
+    archive = ArchiveWriter(archive_part) if archive_part else None
+    if archive is not None:
+        result["archive_parts"].append(archive_part)
+
+    sources = None if only is None else {source_index_of(snippet_id) for snippet_id in only}
+    def keep(source_index):
+        return source_index % shard_count == shard_index and (sources is None or source_index in sources)
+
+    # Sharings are streamed one at a time instead of loading the whole snapshot
+    for source_index, sharing_index, source, sharing in iter_sharings(filepath, keep=keep):
+        # Use Title or fallback name
+        raw_name = sharing.get("Title") or f"{os.path.basename(filepath)}_S{source_index}_C{sharing_index}"
+        convo_dir_name = sanitize_name(raw_name)
+        convo_dir_path = os.path.join(OUTPUT_DIR, convo_dir_name)
+        if store is None and archive is None:
+            os.makedirs(convo_dir_path, exist_ok=True)  # Safe if another worker created it first
+
+        snippet_counter = 1
+
+        for snippet in iter_code_blocks(sharing):
+            lang_raw = snippet.get("Type")
+            lang = (lang_raw or "").strip().lower()
+            content = snippet.get("Content", "")
+
+            # Language detection
+            if lang.startswith("python"):
+                ext = ".py"
+                result["python_detected"] += 1
+            elif lang == "javascript":
+                ext = ".js"
+                result["javascript_detected"] += 1
+            else:
+                if lang != "":
+                    result["unknown_languages"].add(lang)
+                continue  # Skip non-Python/JS
+
+            # Skip empty content
+            if content is None or not content.strip():
+                result["skipped"] += 1
+                continue
+
+            # Unique filename
+            filename = f"snippet_{source_index}_{sharing_index}_{snippet_counter}{ext}"
+            language = "python" if ext == ".py" else "javascript"
+            produced[f"{convo_dir_name}/{filename}"] = content_hash(content)
+            if archive is not None:
+                archive.add(f"{convo_dir_name}/{filename}", content, language, convo_dir_name,
+                            source_index, sharing_index, snippet_counter)
+            elif store is None:
+                if only is None or f"{convo_dir_name}/{filename}" in only:
+                    write_snippet(os.path.join(convo_dir_path, filename), content)
+            else:
+                result["occurrences"].append({
+                    "hash": store.add(content, ext),
+                    "snippet_id": f"{convo_dir_name}/{filename}",
+                    "conversation": convo_dir_name,
+                    "source_index": source_index,
+                    "sharing_index": sharing_index,
+                    "position": snippet_counter,
+                    "language": language
+                })
+
+            snippet_counter += 1
+            result["saved"] += 1
+
+    if archive is not None:
+        archive.close()
+    return result
+
+def snapshot_files():
+    return sorted(filename for filename in os.listdir(DATA_DIR) if filename.endswith('.json'))
+
+def plan_tasks(workers, shards=None, filenames=None):
+    """Build (filepath, shard_index, shard_count) tasks for every (or every listed) snapshot file."""
+    tasks = []
+    for filename in snapshot_files() if filenames is None else filenames:
+        path = os.path.join(DATA_DIR, filename)
+        shard_count = shards or 1
+        if shards is None and workers > 1 and os.path.getsize(path) > LARGE_FILE_BYTES:
+            shard_count = workers
+        tasks.extend((path, shard_index, shard_count) for shard_index in range(shard_count))
+    return tasks
+
+def rewrite_collisions(produced):
+    """Give snippet ids written by several snapshot files the content of the last file in name order.
+
+    That is what a serial run leaves behind; parallel workers finish in any order.
+    Returns the number of rewritten snippets.
+    """
+    producers = {}
+    for filename in sorted(produced):
+        for snippet_id, digest in produced[filename].items():
+            producers.setdefault(snippet_id, []).append((filename, digest))
+    rewrite = {}
+    for snippet_id, versions in producers.items():
+        if len({digest for _, digest in versions}) > 1:
+            rewrite.setdefault(versions[-1][0], set()).add(snippet_id)
+    for filename, snippet_ids in sorted(rewrite.items()):
+        extract_code_snippets(os.path.join(DATA_DIR, filename), only=snippet_ids)
+    return sum(len(snippet_ids) for snippet_ids in rewrite.values())
+
+def remove_stale_snippets(snippet_ids):
+    """Delete snippet files that no snapshot produces any more."""
+    for snippet_id in snippet_ids:
+        path = os.path.join(OUTPUT_DIR, *snippet_id.split('/'))
+        if os.path.exists(path):
+            os.remove(path)
+
+def process_all_files(workers=1, shards=None, store_dir=None, archive_base=None, incremental=False):
+    totals = empty_totals()
+
+    # Incremental mode: only parse snapshot files that are new or changed since the last manifest
+    filenames = None
+    if incremental:
+        old_files = load_manifest(MANIFEST_FILE)['files']
+        new_files, filenames = {}, []
+        for filename in snapshot_files():
+            entry, changed = fingerprint(os.path.join(DATA_DIR, filename), old_files.get(filename))
+            new_files[filename] = entry
+            if changed:
+                filenames.append(filename)
+        print(f"🧾 {len(filenames)} of {len(new_files)} snapshot files are new or changed")
+
+    tasks = [
+        task + (store_dir, f"{archive_base}.part{task_index}" if archive_base else None)
+        for task_index, task in enumerate(plan_tasks(workers, shards, filenames))
+    ]
+
+    if workers <= 1:
+        for task in tasks:
+            merge_totals(totals, extract_code_snippets(*task))
+    else:
+        print(f"🚀 Extracting {len(tasks)} tasks with {workers} workers...")
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(extract_code_snippets, *task) for task in tasks]
+            # Results are merged in task order so totals and mappings match a serial run
+            for future in futures:
+                merge_totals(totals, future.result())
+        if not store_dir and not archive_base:
+            rewritten = rewrite_collisions(totals['produced'])
+            if rewritten:
+                print(f"🔁 Rewrote {rewritten} snippets produced by several snapshot files (last file wins)")
 
     # Final Report
     print(f"\n🔹 Total Python snippets detected: {totals['python_detected']}")
@@ -101,4 +226,50 @@ def process_all_files():
     if totals['unknown_languages']:
         print(f"\n⚠️ Unknown languages found: {totals['unknown_languages']}")
 
-process_all_files()
+    if store_dir:
+        SnippetStore(store_dir).write_occurrences(totals['occurrences'])
+        unique = len({row['hash'] for row in totals['occurrences']})
+        print(f"🗃️ Unique snippet bodies stored: {unique} (mapping saved to {store_dir})")
+
+    if archive_base:
+        merge_archives(sorted(totals['archive_parts'], key=lambda p: int(p.rsplit('.part', 1)[1])), archive_base)
+        print(f"📦 Packed archive written to {archive_base}.pack / {archive_base}.idx.json")
+
+    if incremental:
+        for filename in filenames:
+            new_files[filename]['snippets'] = totals['produced'].get(filename, {})
+        delta = compute_delta(snippet_map(old_files), snippet_map(new_files))
+        remove_stale_snippets(delta['removed'])
+
+        # An id produced by an unchanged file too (same title and indices) must end up with
+        # the manifest's winner, so replay every producer of a touched id in name order
+        touched = set(delta['added']) | set(delta['changed'])
+        producers = [name for name, entry in new_files.items() if touched & entry.get('snippets', {}).keys()]
+        if any(name not in filenames for name in producers):
+            for task in plan_tasks(1, 1, sorted(producers)):
+                extract_code_snippets(*task)
+        save_manifest(MANIFEST_FILE, {'version': MANIFEST_VERSION, 'files': new_files})
+        save_delta(DELTA_FILE, delta)
+        print(f"🧾 Delta: {len(delta['added'])} added, {len(delta['changed'])} changed, "
+              f"{len(delta['removed'])} removed (saved to {DELTA_FILE})")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extract Python/JavaScript snippets from DevGPT snapshots.")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Number of worker processes (default: 1, serial)")
+    parser.add_argument('--shards', type=int, default=None,
+                        help="Shards per snapshot file (default: one per worker for files over 64 MB)")
+    output_mode = parser.add_mutually_exclusive_group()
+    output_mode.add_argument('--dedup', metavar='STORE_DIR', default=None,
+                             help="Store each unique snippet body once in a content-addressed store")
+    output_mode.add_argument('--archive', metavar='BASE', default=None,
+                             help="Write one packed archive (BASE.pack + BASE.idx.json) instead of the folder tree")
+    parser.add_argument('--incremental', action='store_true',
+                        help=f"Only re-extract new or changed snapshot files (tracked in {MANIFEST_FILE}) "
+                             f"and write the snippet delta to {DELTA_FILE}")
+    args = parser.parse_args()
+    if args.incremental and (args.dedup or args.archive):
+        parser.error("--incremental only supports the conversations_new/ folder tree")
+
+    process_all_files(workers=args.workers, shards=args.shards, store_dir=args.dedup,
+                      archive_base=args.archive, incremental=args.incremental)
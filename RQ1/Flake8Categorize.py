@@ -1,36 +1,36 @@
-import subprocess
 import json
-import csv
 import os
-from collections import defaultdict, Counter
+import sys
+import argparse
+from functools import partial
 from tqdm import tqdm
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.snippet_store import SnippetStore
+from common.issue_store import flake8_rows
+from common.issue_sketch import StreamingAggregate
+from common.issue_summary import (IssueAggregate, EMPTY_SUMMARY, batch_record, category_rows, save_aggregate,
+                                  write_rows)
+from common.lint_profile import load_profile, flake8_args, DEFAULT_PROFILE_FILE
+from common.lint_shards import make_shards, iter_shards, run_flake8, merge_flake8, DEFAULT_SHARD_SIZE
+
 SUCCESSFUL_SNIPPETS = 'successful_python_snippets.txt'
 FLAKE8_OUTPUT = 'flake8_output.json'
 OUTPUT_CSV = 'flake8_analysis_summary.csv'
-
-# === Define Prefix-Based Categorization ===
-def categorize_flake8_code(code):
-    if code.startswith(('E', 'W', 'N')):
-        return 'Code Style'
-    elif code.startswith('F'):
-        return 'Potential Bug'
-    elif code.startswith('C'):
-        return 'Code Smell'
-    elif code.startswith('B'):
-        return 'Potential Bug'
-    elif code.startswith('S'):
-        return 'Code Vulnerability'
-    else:
-        return 'Uncategorized'
-
-# === Extract Conversation from Parent Folder ===
-def extract_conversation(filepath):
-    normalized = filepath.replace('\\', '/')
-    parts = normalized.split('/')
-    if len(parts) >= 2:
-        return parts[-2]  # Parent folder as conversation name
-    return "unknown_conversation"
+AGGREGATE_FILE = 'flake8_output.aggregate.json'  # Mergeable counts for UpdateIssueAggregate.py
+
+parser = argparse.ArgumentParser(description="Run Flake8 on Python snippets and categorize findings.")
+parser.add_argument('--store', metavar='STORE_DIR', default=None,
+                    help="Lint each unique body from Extract.py --dedup once and fan results out")
+parser.add_argument('--workers', type=int, default=1, help="Number of flake8 processes running concurrently")
+parser.add_argument('--shard-size', type=int, default=DEFAULT_SHARD_SIZE,
+                    help=f"Files per flake8 invocation (default: {DEFAULT_SHARD_SIZE})")
+parser.add_argument('--profile', default=DEFAULT_PROFILE_FILE,
+                    help="Lint profile compiled into flake8 flags (default: lint_profile.json)")
+parser.add_argument('--streaming', action='store_true',
+                    help="Summarize with bounded-memory sketches (top-k rules, HyperLogLog distinct counts)")
+parser.add_argument('--exact', action='store_true', help="With --streaming, keep exact counts instead of sketches")
+args = parser.parse_args()
 
 # === Step 1: Load and Normalize Paths ===
 with open(SUCCESSFUL_SNIPPETS, 'r') as f:
@@ -38,67 +38,76 @@ with open(SUCCESSFUL_SNIPPETS, 'r') as f:
 
 clean_files = [os.path.abspath(f).replace('\\', '/') for f in files]
 
-print(f"🚀 Running Flake8 on {len(clean_files)} files...\n")
+# With a snippet store, lint each unique body once
+if args.store:
+    lint_targets, fan_out = SnippetStore(args.store).unique_targets(clean_files)
+else:
+    lint_targets, fan_out = clean_files, None
+
+# === Count One Shard's Issues ===
+def count_issues(results):
+    issue_rows, _ = flake8_rows(results)
+    return IssueAggregate.from_rows(issue_rows)
+
+# Fan store results back out to every snippet that shares the body
+def expand_store_results(results):
+    expanded = {}
+    for target, issues in results.items():
+        for occurrence in fan_out.get(target.replace('\\', '/'), [target]):
+            expanded[occurrence] = [dict(issue, filename=occurrence) for issue in issues]
+    return expanded
+
+shards = make_shards(lint_targets, args.shard_size)
+print(f"🚀 Running Flake8 on {len(lint_targets)} files in {len(shards)} shards...\n")
+
+# === Step 2: Run Flake8 Shards, Counting Each One As Soon As It Finishes ===
+shard_results = [None] * len(shards)
+shard_counts = [None] * len(shards)
+# Streaming: every shard's issues go straight into one set of sketches, in completion order
+streaming = StreamingAggregate('category', exact=args.exact) if args.streaming else None
+# Rules the profile turns off are never computed by flake8
+run_shard = partial(run_flake8, extra_args=flake8_args(load_profile(args.profile)))
+for index, results in tqdm(iter_shards(run_shard, shards, args.workers), total=len(shards), desc="Flake8 Shards"):
+    if fan_out is not None:
+        results = expand_store_results(results)
+    shard_results[index] = results
+    if streaming is not None:
+        streaming.update(flake8_rows(results)[0])
+    else:
+        shard_counts[index] = count_issues(results)
 
-# === Step 2: Run Flake8 ===
-subprocess.run(['flake8', '--format=json'] + clean_files, stdout=open(FLAKE8_OUTPUT, 'w'))
+# === Step 3: Save Output Exactly As A Single Run Would Have Produced It ===
+flake8_results = merge_flake8(shard_results)
+with open(FLAKE8_OUTPUT, 'w') as f:
+    json.dump(flake8_results, f)
 
 print(f"✅ Flake8 scan completed. Output saved to {FLAKE8_OUTPUT}")
 
-# === Step 3: Load Flake8 Output ===
-with open(FLAKE8_OUTPUT, 'r') as f:
-    flake8_results = json.load(f)
-
-# === Step 4: Initialize Counters ===
-category_issue_count = defaultdict(int)
-category_conversations = defaultdict(set)
-category_files = defaultdict(set)
-rule_frequency = defaultdict(Counter)
-
-# === Step 5: Process Each File's Issues ===
-for file_path, issues in tqdm(flake8_results.items(), desc="Processing Flake8 Results"):
-    conversation = extract_conversation(file_path)
-
-    for issue in issues:
-        code = issue.get('code')
-        category = categorize_flake8_code(code)
-        category_issue_count[category] += 1
-        category_conversations[category].add(conversation)
-        category_files[category].add(file_path)
-        rule_frequency[category][code] += 1
+# === Step 4/5: Combine Shard Aggregates In Shard Order (keeps rule tie order identical) ===
+if streaming is not None:
+    aggregate = streaming
+    print(f"📐 Streaming mode: {aggregate.error_note()}")
+else:
+    aggregate = IssueAggregate()
+    for shard_aggregate in shard_counts:
+        aggregate.merge(shard_aggregate)
+    aggregate.batches.append(batch_record('add', {'kind': 'flake8', 'path': FLAKE8_OUTPUT}))
+    save_aggregate(aggregate, AGGREGATE_FILE)
 
 # === Step 6: Output Summary ===
 print("\n📊 Flake8 Analysis Summary\n" + "-"*50)
 
-summary_rows = []
-for category in ['Code Style', 'Code Smell', 'Potential Bug', 'Code Vulnerability', 'Uncategorized']:
-    total_issues = category_issue_count[category]
-    conversations_affected = len(category_conversations[category])
-    files_affected = len(category_files[category])
-    top_rules = rule_frequency[category].most_common(3)
-
-    print(f"\n{category}:")
-    print(f" - Total Issues: {total_issues}")
-    print(f" - Conversations Affected: {conversations_affected}")
-    print(f" - Files Affected: {files_affected}")
-    for rule, count in top_rules:
+summary_rows = category_rows(aggregate, top=3)
+by_category = aggregate.summarize('category')
+for row in summary_rows:
+    print(f"\n{row['Category']}:")
+    print(f" - Total Issues: {row['Total Issues']}")
+    print(f" - Conversations Affected: {row['Conversations Affected']}")
+    print(f" - Files Affected: {row['Files Affected']}")
+    for rule, count in by_category.get(row['Category'], EMPTY_SUMMARY).rules.most_common(3):
         print(f"   - {rule}: {count} times")
 
-    summary_rows.append({
-        'Category': category,
-        'Total Issues': total_issues,
-        'Conversations Affected': conversations_affected,
-        'Files Affected': files_affected,
-        'Top Rules': ', '.join([f"{r} ({c})" for r, c in top_rules])
-    })
-
 # === Step 7: Export to CSV ===
-with open(OUTPUT_CSV, 'w', newline='', encoding='utf-8') as csvfile:
-    fieldnames = ['Category', 'Total Issues', 'Conversations Affected', 'Files Affected', 'Top Rules']
-    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-
-    writer.writeheader()
-    for row in summary_rows:
-        writer.writerow(row)
+write_rows(OUTPUT_CSV, summary_rows)
 
 print(f"\n✅ Summary exported to {OUTPUT_CSV}")
@@ -1,63 +1,65 @@
-import json
 import os
-import csv
-from collections import defaultdict, Counter
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.issue_store import open_issues
+from common.issue_summary import IssueAggregate, batch_record, save_aggregate, write_category_totals
+from common.issue_sketch import StreamingAggregate, stream_rows, streaming_source
 
 # File paths
 PYLINT_OUTPUT = 'pylint_output.json'
 CATEGORY_FILE = 'pylint_rule_categorization.json'
+ISSUE_STORE = 'pylint_output.issues'  # Columnar copy of PYLINT_OUTPUT, rebuilt when either JSON file changes
+AGGREGATE_FILE = 'pylint_output.aggregate.json'  # Mergeable counts for UpdateIssueAggregate.py
 CSV_OUTPUT = 'pylint_analysis_summary.csv'
+METRICS_FILE = '../Data/snippet_metrics.csv'  # Written by SnippetMetrics.py
+METRICS_OUTPUT = 'pylint_issues_by_metrics.csv'
+# --streaming [PATH]: bounded-memory sketches (top-k rules, HyperLogLog distinct counts) over PATH
+# (default PYLINT_OUTPUT), e.g. PylintBatch's pylint_output.ndjson journal; add --exact for exact counts
+STREAMING = '--streaming' in sys.argv
+EXACT = '--exact' in sys.argv
+PYLINT_STREAM = streaming_source(sys.argv, PYLINT_OUTPUT)
+
+if STREAMING:
+    # Issues are read one at a time; only the per-category sketches are kept
+    aggregate = StreamingAggregate('category', exact=EXACT)
+    aggregate.update(stream_rows({'kind': 'pylint', 'path': PYLINT_STREAM, 'categories': CATEGORY_FILE}))
+else:
+    # Load data
+    source = {'kind': 'pylint', 'path': PYLINT_OUTPUT, 'categories': CATEGORY_FILE}
+    store = open_issues(ISSUE_STORE, [source])
+    issues = store.issues
 
-# Load data
-with open(PYLINT_OUTPUT, 'r', encoding='utf-8') as f:
-    pylint_results = json.load(f)
-
-with open(CATEGORY_FILE, 'r', encoding='utf-8') as f:
-    category_map = json.load(f)
-
-# Initialize counters
-category_counts = defaultdict(int)
-file_set = set()
-conversation_set = set()
-issue_counter = Counter()
-
-# Process each issue
-for issue in pylint_results:
-    code = issue.get('message-id')
-    file_path = issue.get('path')
-    
-    # Track files and conversations
-    file_set.add(file_path)
-    conversation = os.path.normpath(file_path).split(os.sep)[-2]
-    conversation_set.add(conversation)
-    
-    # Categorize
-    category = category_map.get(code, {}).get('category', 'Uncategorized')
-    category_counts[category] += 1
-    issue_counter[code] += 1
+    # Count categories, rules, files and conversations in one pass over the columns
+    aggregate = IssueAggregate.from_table(issues)
+    aggregate.batches.append(batch_record('add', source))
+    save_aggregate(aggregate, AGGREGATE_FILE)
+overall = aggregate.overall()
 
 # Summary
 print("📊 Pylint Analysis Summary")
-print(f"Total Issues: {sum(category_counts.values())}")
-print(f"Total Files Affected: {len(file_set)}")
-print(f"Total Conversations Affected: {len(conversation_set)}\n")
+print(f"Total Issues: {overall.total}")
+print(f"Total Files Affected: {len(overall.files)}")
+print(f"Total Conversations Affected: {len(overall.conversations)}\n")
+if STREAMING:
+    print(f"📐 Streaming mode: {aggregate.error_note()}\n")
 
-for cat, count in category_counts.items():
-    print(f"{cat}: {count} issues")
+for cat, summary in aggregate.summarize('category').items():
+    print(f"{cat}: {summary.total} issues")
 
 print("\n⭐ Top 5 Most Frequent Issues:")
-for code, count in issue_counter.most_common(5):
+for code, count in overall.rules.most_common(5):
     print(f"{code}: {count} times")
 
 # Export to CSV
-with open(CSV_OUTPUT, 'w', newline='', encoding='utf-8') as csvfile:
-    writer = csv.writer(csvfile)
-    writer.writerow(['Category', 'Total Issues'])
-    for cat, count in category_counts.items():
-        writer.writerow([cat, count])
-    writer.writerow([])
-    writer.writerow(['Top 5 Issues', 'Occurrences'])
-    for code, count in issue_counter.most_common(5):
-        writer.writerow([code, count])
+write_category_totals(CSV_OUTPUT, aggregate, top=5)
 
 print(f"\n✅ Summary exported to {CSV_OUTPUT}")
+
+# Join per-snippet issue counts to the structural metrics table (SnippetMetrics.py), if it was built
+if not STREAMING and os.path.exists(METRICS_FILE):
+    from common.snippet_metrics import load_metrics, join_issue_counts
+
+    metrics = join_issue_counts(load_metrics(METRICS_FILE), issues.column('snippet_id'), issues.column('category'))
+    metrics.to_csv(METRICS_OUTPUT)
+    print(f"✅ Issue counts joined to snippet metrics in {METRICS_OUTPUT}")
@@ -1,51 +1,213 @@
-import subprocess
 import os
+import sys
 import json
+import argparse
 from tqdm import tqdm  # Progress bar
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.snippet_store import SnippetStore, snippet_id
+from common.snippet_archive import SnippetArchive
+from common.extract_manifest import load_delta
+from common.pylint_engine import lint_many, filter_issues, DEFAULT_BATCH_SIZE
+from common.lint_cache import (LintCache, pylint_key, linter_version, config_fingerprint, stored_issues, localize_issues,
+                               PYLINT_CONFIG_FILES, DEFAULT_CACHE_FILE)
+from common.lint_profile import load_profile, pylint_args, DEFAULT_PROFILE_FILE
+from common.lint_journal import LintJournal, journal_path, finalize_list
+from common.stdin_lint import PylintServer
+from common.lint_scheduler import (LintHistory, LintBudget, run_scheduled, write_quarantine_report,
+                                   DEFAULT_HISTORY_FILE, DEFAULT_QUARANTINE_AFTER, DEFAULT_QUARANTINE_DAYS)
+
 # === CONFIGURATION ===
 OUTPUT_FILE = 'pylint_output.json'
-THIRD_PARTY_LIBS = ['scrapy', 'selenium', 'pims', 'pandas', 'numpy', 'cv2', 'matplotlib', 'torch']
+JOURNAL_FILE = journal_path(OUTPUT_FILE)  # One NDJSON record per linted file, appended as it finishes
+QUARANTINE_REPORT = 'pylint_quarantine.json'  # Files skipped because they timed out repeatedly
+
+def reported_path(path):
+    """The path pylint reports for a normalized absolute snippet path (relative to the working directory)."""
+    return path.replace(os.getcwd().replace('\\', '/') + '/', '', 1)
+
+def fan_out_issues(issues, target, fan_out):
+    """Copy issues found in a store object to every snippet that shares its body."""
+    if fan_out[target] == [target]:
+        return issues
+    copies = []
+    for occurrence in fan_out[target]:
+        module = os.path.splitext(os.path.basename(occurrence))[0]
+        copies.extend(dict(issue, path=reported_path(occurrence), module=module) for issue in issues)
+    return copies
+
+def read_text(path, text):
+    if text is not None:
+        return text
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        return f.read()
+
+def lint_with_cache(items, cache, lint_misses, extra_args, keep):
+    """Yield ``(path, filtered issues)``: cached snippets first, then the rest as ``lint_misses`` finishes them.
+
+    Issues are None for files that timed out, are quarantined or failed.
+    """
+    version, rc = linter_version('pylint'), config_fingerprint(PYLINT_CONFIG_FILES)
+    pending, hits, misses = {}, [], []
+    config = {'config': rc, 'args': extra_args}
+    for path, text in items:
+        key, module = pylint_key(read_text(path, text), version, config, path)
+        cached = cache.get(key)
+        if cached is None:
+            misses.append((path, text))
+            pending[path] = key, module
+        else:
+            # Report cached issues under this snippet's path and module
+            hits.append((path, localize_issues(cached, path, reported_path(path))))
+
+    print(f"🗄️ Lint cache: {len(hits)} of {len(items)} snippets already linted")
+    for path, issues in hits:
+        yield path, keep(issues)
+    for path, issues in tqdm(lint_misses(misses), total=len(misses), desc="Pylint Progress"):
+        if issues is not None:
+            # Same entry as step3/step5 store for this code and module name
+            key, module = pending[path]
+            cache.put(key, 'pylint', stored_issues(issues, module, path))
+        yield path, None if issues is None else keep(issues)
+
+class ScheduledWorker:
+    """One long-lived pylint process for ``run_scheduled``; each job is one ``(path, text_or_None)`` item."""
+
+    def __init__(self, extra_args):
+        self.server = PylintServer(extra_args=extra_args)
+
+    def lint(self, item, timeout):
+        return self.server.lint_items([item], timeout)[0][1]
+
+    def close(self):
+        self.server.close()
+
+def lint_scheduled(items, budget, workers, extra_args):
+    """Yield ``(path, issues)`` as files finish: largest first, one file per job, under per-file time budgets."""
+    jobs = []
+    for path, text in items:
+        text_for_key = read_text(path, text)
+        jobs.append(((path, text), budget.key(text_for_key), len(text_for_key.encode('utf-8'))))
+    for (path, _), issues in run_scheduled(jobs, budget, lambda: ScheduledWorker(extra_args), workers,
+                                           name=lambda item: item[0]):
+        yield path, issues
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run Pylint on successful Python snippets.")
+    source_mode = parser.add_mutually_exclusive_group()
+    source_mode.add_argument('--store', metavar='STORE_DIR', default=None,
+                             help="Lint each unique body from Extract.py --dedup once and fan results out")
+    source_mode.add_argument('--archive', metavar='BASE', default=None,
+                             help="Feed snippets to pylint over stdin from a packed archive written by Extract.py --archive")
+    parser.add_argument('--delta', metavar='DELTA_FILE', default=None,
+                        help="Only lint snippets listed in an Extract.py --incremental delta and merge into the existing output")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Lint batches in N long-lived worker processes (output order is unchanged)")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"Snippets per in-process pylint run (default: {DEFAULT_BATCH_SIZE})")
+    parser.add_argument('--cache', metavar='CACHE_FILE', nargs='?', const=DEFAULT_CACHE_FILE, default=None,
+                        help="Reuse results from the lint cache shared with step3/step5 (default file: Data/lint_cache.sqlite)")
+    parser.add_argument('--profile', default=DEFAULT_PROFILE_FILE,
+                        help="Lint profile compiled into pylint flags (default: lint_profile.json)")
+    parser.add_argument('--resume', action='store_true',
+                        help=f"Keep the files already recorded in {JOURNAL_FILE} and lint only the rest")
+    parser.add_argument('--finalize', action='store_true',
+                        help=f"Only rebuild {OUTPUT_FILE} from {JOURNAL_FILE} (e.g. after an interrupted run)")
+    parser.add_argument('--schedule', action='store_true',
+                        help="Lint file by file, largest first, with adaptive per-file timeouts and quarantine")
+    parser.add_argument('--timeout', type=float, default=120,
+                        help="With --schedule: longest time budget for one file in seconds (default: 120)")
+    parser.add_argument('--quarantine-after', type=int, default=DEFAULT_QUARANTINE_AFTER,
+                        help=f"With --schedule: skip files that timed out this many times (default: {DEFAULT_QUARANTINE_AFTER})")
+    parser.add_argument('--quarantine-days', type=float, default=DEFAULT_QUARANTINE_DAYS,
+                        help=f"With --schedule: days a quarantine lasts after the last timeout (default: {DEFAULT_QUARANTINE_DAYS})")
+    parser.add_argument('--retry-quarantined', action='store_true',
+                        help="With --schedule: lift the quarantine and lint those files again")
+    args = parser.parse_args()
+
+    if args.finalize:
+        count = finalize_list(JOURNAL_FILE, OUTPUT_FILE, indent=4)
+        print(f"✅ {count} issues from {JOURNAL_FILE} saved to {OUTPUT_FILE}")
+        sys.exit(0)
+
+    # Disabled rules are pushed down to pylint itself; third-party import errors are filtered out afterwards
+    profile = load_profile(args.profile)
+    extra_args = pylint_args(profile)
+    keep = lambda issues: filter_issues(issues, profile['third_party_modules'], profile['pylint'].get('disable', []))
+
+    # Load successful snippets
+    with open('successful_python_snippets.txt', 'r') as f:
+        files = [line.strip() for line in f if line.strip()]
+
+    # Normalize paths
+    clean_files = [os.path.abspath(f).replace('\\', '/') for f in files]
 
-# Load successful snippets
-with open('successful_python_snippets.txt', 'r') as f:
-    files = [line.strip() for line in f if line.strip()]
+    # With a delta, keep previous results for untouched snippets and lint only the rest
+    previous_issues = []
+    if args.delta:
+        delta = load_delta(args.delta)
+        stale = delta['touched'] | delta['removed']
+        with open(OUTPUT_FILE, 'r') as f_prev:
+            previous_issues = [i for i in json.load(f_prev) if snippet_id(i.get('path', '')) not in stale]
+        clean_files = [f for f in clean_files if snippet_id(f) in delta['touched']]
 
-# Normalize paths
-clean_files = [os.path.abspath(f).replace('\\', '/') for f in files]
+    # With a snippet store, lint each unique body once
+    if args.store:
+        lint_targets, fan_out = SnippetStore(args.store).unique_targets(clean_files)
+    else:
+        lint_targets, fan_out = clean_files, {f: [f] for f in clean_files}
 
-all_issues = []
+    # Output keeps the input order, whatever order files finish in
+    output_order = list(lint_targets)
 
-print(f"🔧 Running Pylint on {len(clean_files)} files...\n")
+    # --schedule: per-file jobs ordered by past lint time / size, timeouts adapted to observed lint times
+    if args.schedule:
+        history = LintHistory(DEFAULT_HISTORY_FILE)
+        if args.retry_quarantined:
+            print(f"🚧 Lifted the quarantine of {history.clear_timeouts('pylint')} files")
+        budget = LintBudget('pylint', args.timeout, history, quarantine_after=args.quarantine_after,
+                            quarantine_days=args.quarantine_days)
+        lint_misses = lambda misses: lint_scheduled(misses, budget, args.workers, extra_args)
+    else:
+        lint_misses = lambda misses: lint_many(misses, workers=args.workers, batch_size=args.batch_size,
+                                               extra_args=extra_args, apply_filter=False)
 
-for file_path in tqdm(clean_files, desc="Pylint Progress"):
-    result = subprocess.run(
-        ['pylint', file_path, '--output-format=json', '--score=n'],
-        capture_output=True, text=True
-    )
-    try:
-        issues = json.loads(result.stdout)
-    except json.JSONDecodeError:
-        issues = []
+    # Results are appended to the journal as each file finishes; --resume skips files already in it
+    with LintJournal(JOURNAL_FILE, resume=args.resume) as journal:
+        if journal.done:
+            print(f"⏩ Resuming: {len(journal.done)} files already in {JOURNAL_FILE}")
+            lint_targets = [f for f in lint_targets if f not in journal.done]
 
-    # === FILTERING LOGIC ===
-    filtered_issues = []
-    for issue in issues:
-        code = issue.get('message-id')
-        if code in ['C0114', 'C0115', 'C0116']:
-            continue  # Skip missing docstrings
+        # Archive snippets are fed over stdin; file_path is then only used as the reported name
+        if args.archive:
+            with SnippetArchive(args.archive) as archive:
+                items = [(f, archive.get_text(snippet_id(f), '')) for f in lint_targets]
+        else:
+            items = [(f, None) for f in lint_targets]
 
-        if code == 'E0401':
-            msg = issue.get('message', '').lower()
-            if any(lib.lower() in msg for lib in THIRD_PARTY_LIBS):
-                continue  # Skip known third-party import errors
+        print(f"🔧 Running Pylint on {len(lint_targets)} files...\n")
 
-        filtered_issues.append(issue)
+        # Pylint is loaded once per worker; anything the profile flags miss is filtered as batches finish.
+        # Files without a result (timed out, quarantined, failed) are not recorded: --resume retries them
+        if args.cache:
+            with LintCache(args.cache) as cache:
+                left_out = journal.write_all(lint_with_cache(items, cache, lint_misses, extra_args, keep),
+                                             lambda file_path, issues: fan_out_issues(issues, file_path, fan_out))
+                print(f"🗄️ Lint cache: {cache.stats()}")
+        else:
+            left_out = journal.write_all(tqdm(lint_misses(items), total=len(items), desc="Pylint Progress"),
+                                         lambda file_path, issues: fan_out_issues(keep(issues), file_path, fan_out))
+    if left_out:
+        print(f"⏱️ {len(left_out)} files timed out, are quarantined or failed; left out of {OUTPUT_FILE} "
+              f"(--resume retries them)")
 
-    all_issues.extend(filtered_issues)
+    if args.schedule:
+        history.save()
+        quarantined = write_quarantine_report(history, args.quarantine_after, QUARANTINE_REPORT, args.quarantine_days)
+        if quarantined:
+            print(f"🚧 {quarantined} files quarantined after repeated timeouts, see {QUARANTINE_REPORT}")
 
-# Save combined filtered output
-with open(OUTPUT_FILE, 'w') as f_out:
-    json.dump(all_issues, f_out, indent=4)
+    # Save combined filtered output in the legacy format, streamed from the journal
+    issue_count = finalize_list(JOURNAL_FILE, OUTPUT_FILE, indent=4, head=previous_issues, order=output_order)
 
-print(f"\n✅ Pylint completed. {len(all_issues)} issues saved to {OUTPUT_FILE}")
+    print(f"\n✅ Pylint completed. {issue_count} issues saved to {OUTPUT_FILE}")
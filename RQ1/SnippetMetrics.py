@@ -0,0 +1,40 @@
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.snippet_archive import SnippetArchive
+from common.ast_cache import AstFactsCache, DEFAULT_CACHE_FILE
+from common.snippet_metrics import build_metrics, save_metrics, METRICS_FILE
+
+# Builds the per-snippet structural metrics table (one row per Python snippet) that
+# the analysis scripts join lint results to.
+TARGET_DIR = "../conversations_new"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compute structural metrics for every Python snippet.")
+    parser.add_argument('--archive', metavar='BASE', default=None,
+                        help="Read snippets from a packed archive written by Extract.py --archive")
+    parser.add_argument('--workers', type=int, default=1, help="Analyze in parallel with N worker processes")
+    parser.add_argument('--cache', metavar='CACHE_FILE', nargs='?', const=DEFAULT_CACHE_FILE, default=None,
+                        help=f"Reuse AST facts from a persistent cache (default file: {DEFAULT_CACHE_FILE})")
+    parser.add_argument('--output', default=METRICS_FILE, help=f"Metrics CSV (default: {METRICS_FILE})")
+    args = parser.parse_args()
+
+    if args.archive:
+        with SnippetArchive(args.archive) as archive:
+            keys = sorted(entry['snippet_id'] for entry in archive.iter_entries(language='python'))
+        ids = keys
+    else:
+        keys = sorted(os.path.join(root, file) for root, _, files in os.walk(TARGET_DIR)
+                      for file in files if file.endswith('.py'))
+        ids = None
+
+    cache = AstFactsCache(args.cache) if args.cache else None
+    metrics = build_metrics(keys, ids, workers=args.workers, cache=cache, archive_base=args.archive)
+    if cache:
+        print(f"🗄️ AST cache: {cache.hits} hits, {cache.misses} misses")
+        cache.close()
+
+    save_metrics(metrics, args.output)
+    print(f"✅ Metrics for {len(metrics)} snippets ({metrics.shape[1]} columns) saved to {args.output}")
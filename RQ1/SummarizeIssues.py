@@ -0,0 +1,50 @@
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.issue_store import load_store
+from common.issue_summary import IssueAggregate, CELL_COLUMNS, top_rules_text, write_rows
+
+DEFAULT_STORE = '../Data/issue_store.issues'
+DEFAULT_OUTPUT = '../Data/issue_summary.csv'
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Summarize an issue store (BuildIssueStore.py) by any grouping.")
+    parser.add_argument('--store', default=DEFAULT_STORE, help=f"Issue store file (default: {DEFAULT_STORE})")
+    parser.add_argument('--by', default='tool,category',
+                        help=f"Comma-separated grouping columns out of {', '.join(CELL_COLUMNS)} (default: tool,category)")
+    parser.add_argument('--stage', help="Only issues of this stage (generated / fetched)")
+    parser.add_argument('--top', type=int, default=3, help="Top rules listed per group (default: 3)")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help=f"CSV file (default: {DEFAULT_OUTPUT})")
+    args = parser.parse_args()
+
+    by = [name.strip() for name in args.by.split(',') if name.strip()]
+    unknown = [name for name in by if name not in CELL_COLUMNS]
+    if unknown:
+        parser.error(f"unknown grouping column(s): {', '.join(unknown)}")
+
+    issues = load_store(args.store).issues
+    if args.stage:
+        issues = issues.where(stage=args.stage)
+
+    started = time.perf_counter()
+    aggregate = IssueAggregate.from_table(issues)
+    aggregated = time.perf_counter()
+    groups = aggregate.summarize(by)
+    summarized = time.perf_counter()
+
+    rows = []
+    for group, summary in groups.items():
+        row = dict(zip(by, group if len(by) > 1 else (group,)))
+        row.update({'Total Issues': summary.total, 'Files Affected': len(summary.files),
+                    'Conversations Affected': len(summary.conversations),
+                    'Top Rules': top_rules_text(summary, args.top)})
+        rows.append(row)
+    write_rows(args.output, rows, fieldnames=by + ['Total Issues', 'Files Affected', 'Conversations Affected',
+                                                   'Top Rules'])
+
+    print(f"📊 {len(issues)} issues in {len(aggregate.cells)} cells, {len(rows)} groups by {', '.join(by)}")
+    print(f"⏱️ Aggregated in {(aggregated - started) * 1000:.1f} ms, re-grouped in {(summarized - aggregated) * 1000:.1f} ms")
+    print(f"✅ Summary exported to {args.output}")
@@ -1,7 +1,7 @@
-const esprima = require('esprima');
 const fs = require('fs');
 const path = require('path');
 const { Parser } = require('json2csv');
+const { analyzeSnippet } = require('./SyntaxJSCheck');
 
 let errorCount = 0;
 let functionOrClassCount = 0;
@@ -11,40 +11,14 @@ const results = [];
 const csvOutputPath = 'syntax_check_results.csv';
 const textOutputPath = 'syntax_check_summary.txt';
 
-function hasFunctionOrClass(content) {
-    let found = false;
-    esprima.parseScript(content, { tolerant: true }, node => {
-        if (node.type === 'FunctionDeclaration' || node.type === 'ClassDeclaration') {
-            found = true;
-            return false; // Stop traversal
-        }
-    });
-    return found;
-}
-
-function isBracesBalanced(content) {
-    let balance = 0;
-    for (let char of content) {
-        if (char === '{') {
-            balance += 1;
-        } else if (char === '}') {
-            balance -= 1;
-        }
-        if (balance < 0) {
-            return false; // more closing braces than opening
-        }
-    }
-    return balance === 0;
-}
-
-function checkSyntax(filePath) {
+function checkSyntax(filePath, content) {
     let syntaxOK = false, hasFunctionClass = false, bracesBalanced = false;
     try {
-        const content = fs.readFileSync(filePath, 'utf8');
-        esprima.parseScript(content);
-        syntaxOK = true;
-        hasFunctionClass = hasFunctionOrClass(content);
-        bracesBalanced = isBracesBalanced(content);
+        if (content === undefined) {
+            content = fs.readFileSync(filePath, 'utf8');
+        }
+        ({ syntaxOK, hasFunctionClass, bracesBalanced } = analyzeSnippet(content));
+        if (!syntaxOK) errorCount++;
     } catch (error) {
         errorCount++;
     }
@@ -74,8 +48,28 @@ function traverseDirectory(directory) {
     });
 }
 
+// Reads JavaScript snippets straight from a packed archive written by Extract.py --archive
+function traverseArchive(archiveBase, directory) {
+    const index = JSON.parse(fs.readFileSync(`${archiveBase}.idx.json`, 'utf8'));
+    const data = fs.readFileSync(`${archiveBase}.pack`);
+    const field = name => index.fields.indexOf(name);
+    const [idCol, offsetCol, lengthCol, langCol] = ['snippet_id', 'offset', 'length', 'language'].map(field);
+
+    index.entries.forEach(entry => {
+        if (entry[langCol] !== 'javascript') return;
+        const content = data.subarray(entry[offsetCol], entry[offsetCol] + entry[lengthCol]).toString('utf8');
+        checkSyntax(path.join(directory, ...entry[idCol].split('/')), content);
+    });
+}
+
 // Replace 'path_to_your_js_files' with the path to your JavaScript files
-traverseDirectory('../conversations_new');
+// Usage: node SyntaxJS.js [--archive <base>]
+const archiveArg = process.argv.indexOf('--archive');
+if (archiveArg !== -1) {
+    traverseArchive(process.argv[archiveArg + 1], '../conversations_new');
+} else {
+    traverseDirectory('../conversations_new');
+}
 
 // Writing CSV
 const json2csvParser = new Parser();
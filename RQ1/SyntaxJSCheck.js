@@ -0,0 +1,34 @@
+// Syntax/completeness checks shared by SyntaxJS.js, SyntaxJSWrite.js and SyntaxJSWorker.js
+const esprima = require('esprima');
+
+// Braces are counted on the token stream, so '{' / '}' inside strings, comments,
+// template literal text and regex literals are ignored.
+function isBracesBalanced(tokens) {
+    let balance = 0;
+    for (const token of tokens) {
+        if (token.type !== 'Punctuator') continue;
+        if (token.value === '{') balance++;
+        if (token.value === '}') balance--;
+        if (balance < 0) return false; // more closing braces than opening
+    }
+    return balance === 0;
+}
+
+// Returns { syntaxOK, hasFunctionClass, bracesBalanced } from a single parse;
+// the last two are only computed for valid code
+function analyzeSnippet(content) {
+    let hasFunctionClass = false;
+    let program;
+    try {
+        program = esprima.parseScript(content, { tokens: true }, node => {
+            if (node.type === 'FunctionDeclaration' || node.type === 'ClassDeclaration') {
+                hasFunctionClass = true;
+            }
+        });
+    } catch (error) {
+        return { syntaxOK: false, hasFunctionClass: false, bracesBalanced: false };
+    }
+    return { syntaxOK: true, hasFunctionClass, bracesBalanced: isBracesBalanced(program.tokens) };
+}
+
+module.exports = { analyzeSnippet, isBracesBalanced };
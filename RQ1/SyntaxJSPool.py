@@ -0,0 +1,74 @@
+import os
+import sys
+import json
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.snippet_archive import SnippetArchive
+from common.js_classifier import JSWorkerPool, DEFAULT_BATCH_SIZE
+
+# Same outputs as SyntaxJSWrite.js, but checks snippets on a pool of long-lived
+# Node workers (SyntaxJSWorker.js) driven from Python.
+TARGET_DIR = "../conversations_new"
+OUTPUT_DIR = "../Data/snippet_lists_js"
+
+def list_js_snippets(directory):
+    """Return .js paths in the order SyntaxJSWrite.js visits them (sorted names, depth first)."""
+    paths = []
+    for name in sorted(os.listdir(directory)):
+        full_path = os.path.join(directory, name)
+        if os.path.isdir(full_path):
+            paths.extend(list_js_snippets(full_path))
+        elif name.endswith('.js'):
+            paths.append(full_path)
+    return paths
+
+def categorize(rel_paths, results):
+    categories = {
+        'SyntaxError': [],
+        'HasFunctionOrClass': [],
+        'BalancedBraces': [],
+        'Complete': []
+    }
+    for rel_path, facts in zip(rel_paths, results):
+        if facts['error']:
+            print(f"⚠️ Error reading {rel_path}: {facts['error']}")
+        if not facts['syntax_ok']:
+            categories['SyntaxError'].append(rel_path)
+            continue
+        if facts['has_function_or_class']:
+            categories['HasFunctionOrClass'].append(rel_path)
+        if facts['braces_balanced']:
+            categories['BalancedBraces'].append(rel_path)
+        if facts['has_function_or_class'] and facts['braces_balanced']:
+            categories['Complete'].append(rel_path)
+    return categories
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Categorize JavaScript snippets on a pool of Node workers.")
+    parser.add_argument('--archive', metavar='BASE', default=None,
+                        help="Read snippets from a packed archive written by Extract.py --archive")
+    parser.add_argument('--workers', type=int, default=1, help="Number of Node worker processes")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="Snippets sent per request")
+    args = parser.parse_args()
+
+    with JSWorkerPool(args.workers, args.batch_size) as pool:
+        if args.archive:
+            with SnippetArchive(args.archive) as archive:
+                texts = sorted(((entry['snippet_id'], text) for entry, text in archive.iter_texts('javascript')))
+            rel_paths = [os.path.join(*snippet_id.split('/')) for snippet_id, _ in texts]
+            results = pool.check_contents([text for _, text in texts])
+        else:
+            paths = list_js_snippets(TARGET_DIR)
+            rel_paths = [os.path.relpath(p, TARGET_DIR) for p in paths]
+            results = pool.check_paths(paths)
+
+    categories = categorize(rel_paths, results)
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    with open(os.path.join(OUTPUT_DIR, 'js_snippet_categories.json'), 'w', encoding='utf-8') as json_file:
+        json.dump(categories, json_file, indent=4)
+    with open(os.path.join(OUTPUT_DIR, 'complete_js_snippets.txt'), 'w', encoding='utf-8') as txt_file:
+        txt_file.write('\n'.join(f"{TARGET_DIR}/{p}" for p in categories['Complete']))
+
+    print(f"\n✅ JavaScript snippet categorization complete. Files saved in {OUTPUT_DIR}")
@@ -0,0 +1,36 @@
+// Long-lived JavaScript syntax worker driven by common/js_classifier.py.
+// Reads one JSON request per line from stdin:
+//   {"id": 1, "items": [{"path": "a.js"}, {"content": "let x = 1;"}]}
+// and writes one JSON response per line to stdout, in request order:
+//   {"id": 1, "results": [{"syntax_ok": true, "has_function_or_class": false, "braces_balanced": true, "error": null}, ...]}
+const fs = require('fs');
+const readline = require('readline');
+const { analyzeSnippet } = require('./SyntaxJSCheck');
+
+function checkItem(item) {
+    try {
+        const content = item.content !== undefined ? item.content : fs.readFileSync(item.path, 'utf8');
+        const facts = analyzeSnippet(content);
+        return {
+            syntax_ok: facts.syntaxOK,
+            has_function_or_class: facts.hasFunctionClass,
+            braces_balanced: facts.bracesBalanced,
+            error: null
+        };
+    } catch (error) {
+        return { syntax_ok: false, has_function_or_class: false, braces_balanced: false, error: String(error.message || error) };
+    }
+}
+
+const input = readline.createInterface({ input: process.stdin, crlfDelay: Infinity });
+input.on('line', line => {
+    if (!line.trim()) return;
+    let response;
+    try {
+        const request = JSON.parse(line);
+        response = { id: request.id, results: request.items.map(checkItem) };
+    } catch (error) {
+        response = { id: null, error: String(error.message || error) };
+    }
+    process.stdout.write(JSON.stringify(response) + '\n');
+});
@@ -1,6 +1,6 @@
-const esprima = require('esprima');
 const fs = require('fs');
 const path = require('path');
+const { analyzeSnippet } = require('./SyntaxJSCheck');
 
 const TARGET_DIR = '../conversations_new';
 const OUTPUT_DIR = '../Data/snippet_lists_js';
@@ -16,46 +16,19 @@ const categories = {
     Complete: []
 };
 
-function hasFunctionOrClass(content) {
-    let found = false;
-    try {
-        esprima.parseScript(content, { tolerant: true }, node => {
-            if (node.type === 'FunctionDeclaration' || node.type === 'ClassDeclaration') {
-                found = true;
-            }
-        });
-    } catch (err) {
-        // Ignore parsing errors here, handled elsewhere
-    }
-    return found;
-}
-
-function isBracesBalanced(content) {
-    let balance = 0;
-    for (let char of content) {
-        if (char === '{') balance++;
-        if (char === '}') balance--;
-        if (balance < 0) return false;
-    }
-    return balance === 0;
-}
-
 function checkSyntax(filePath) {
     const content = fs.readFileSync(filePath, 'utf8');
     const relPath = path.relative(TARGET_DIR, filePath);
 
-    try {
-        esprima.parseScript(content);
-        const hasFuncClass = hasFunctionOrClass(content);
-        const bracesBalanced = isBracesBalanced(content);
-
-        if (hasFuncClass) categories.HasFunctionOrClass.push(relPath);
-        if (bracesBalanced) categories.BalancedBraces.push(relPath);
-        if (hasFuncClass && bracesBalanced) categories.Complete.push(relPath);
+    const { syntaxOK, hasFunctionClass, bracesBalanced } = analyzeSnippet(content);
 
-    } catch (err) {
+    if (!syntaxOK) {
         categories.SyntaxError.push(relPath);
+        return;
     }
+    if (hasFunctionClass) categories.HasFunctionOrClass.push(relPath);
+    if (bracesBalanced) categories.BalancedBraces.push(relPath);
+    if (hasFunctionClass && bracesBalanced) categories.Complete.push(relPath);
 }
 
 function traverseDirectory(directory) {
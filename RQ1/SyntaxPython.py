@@ -1,70 +1,45 @@
 import os
-import ast
+import sys
 import csv
+import argparse
 
-TARGET_DIR = "../conversations_new"
-
-def has_function_or_class(source):
-    try:
-        tree = ast.parse(source)
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
-                return True
-        return False
-    except SyntaxError:
-        return False
-
-def starts_with_import(source):
-    try:
-        tree = ast.parse(source)
-        first_statement = tree.body[0] if tree.body else None
-        return isinstance(first_statement, (ast.Import, ast.ImportFrom))
-    except SyntaxError:
-        return False
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.snippet_archive import SnippetArchive
+from common.ast_cache import AstFactsCache, DEFAULT_CACHE_FILE
+from common.py_classifier import (classify_many, CATEGORIES, SUCCESSFUL, FAILED, EXECUTABLE,
+                                   NO_DEFINITION, ONLY_IMPORT)
 
-def has_executable_code(source):
-    try:
-        tree = ast.parse(source)
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.For, ast.While, ast.If, ast.With, ast.Assign, ast.Expr)):
-                return True
-        return False
-    except SyntaxError:
-        return False
+TARGET_DIR = "../conversations_new"
 
-def check_python_snippets(directory):
-    success, failure, executable, no_def_or_class, only_import = [], [], [], [], []
+def list_python_snippets(directory, archive_base=None):
+    """Return (file_path, key) for every Python snippet; key is the path or the archive snippet id."""
+    if archive_base:
+        with SnippetArchive(archive_base) as archive:
+            return [(os.path.join(directory, *entry['snippet_id'].split('/')), entry['snippet_id'])
+                    for entry in archive.iter_entries(language='python')]
 
+    snippets = []
     for root, dirs, files in os.walk(directory):
         for file in files:
             if file.endswith('.py'):
                 file_path = os.path.join(root, file)
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        source = f.read()
-
-                    if not source.strip():
-                        failure.append(file_path)
-                        continue
+                snippets.append((file_path, file_path))
+    return snippets
 
-                    try:
-                        compile(source, file_path, 'exec')
-                        if has_function_or_class(source):
-                            success.append(file_path)
-                        elif has_executable_code(source):
-                            executable.append(file_path)
-                        elif starts_with_import(source):
-                            only_import.append(file_path)
-                        else:
-                            no_def_or_class.append(file_path)
-                    except (SyntaxError, ValueError):
-                        failure.append(file_path)
+def check_python_snippets(directory, archive_base=None, workers=1, cache=None):
+    buckets = {category: [] for category in CATEGORIES}
+    snippets = list_python_snippets(directory, archive_base)
 
-                except Exception as e:
-                    print(f"⚠️ Error reading {file_path}: {e}")
-                    failure.append(file_path)
+    # Results come back in input order, so the output matches a serial run
+    results = classify_many([key for _, key in snippets], workers=workers, archive_base=archive_base,
+                            cache=cache)
+    for (file_path, _), (category, error) in zip(snippets, results):
+        if error:
+            print(f"⚠️ Error reading {file_path}: {error}")
+        buckets[category].append(file_path)
 
-    return success, failure, executable, no_def_or_class, only_import
+    return (buckets[SUCCESSFUL], buckets[FAILED], buckets[EXECUTABLE],
+            buckets[NO_DEFINITION], buckets[ONLY_IMPORT])
 
 def write_to_csv(filename, data):
     headers = ['Code Snippet', 'Category']
@@ -75,29 +50,47 @@ def write_to_csv(filename, data):
             for snippet in snippets:
                 writer.writerow({'Code Snippet': snippet, 'Category': category})
 
-# Running the snippet check
-success_snippets, failed_snippets, executable_snippets, no_def_class_snippets, only_import_snippets = check_python_snippets(TARGET_DIR)
-
-# Preparing data for CSV
-data_for_csv = {
-    'Successful': success_snippets,
-    'Failed': failed_snippets,
-    'Executable': executable_snippets,
-    'No Function/Class Definition': no_def_class_snippets,
-    'Only Import': only_import_snippets
-}
-
-# Writing to CSV
-csv_filename = 'snippet_analysis_results.csv'
-write_to_csv(csv_filename, data_for_csv)
-
-# Writing summary to text file
-txt_filename = 'snippet_summary.txt'
-with open(txt_filename, 'w') as file:
-    file.write(f"Number of Successful Snippets: {len(success_snippets)}\n")
-    file.write(f"Number of Failed Snippets: {len(failed_snippets)}\n")
-    file.write(f"Number of Executable Snippets: {len(executable_snippets)}\n")
-    file.write(f"Number of Snippets Without Function/Class Definition: {len(no_def_class_snippets)}\n")
-    file.write(f"Number of Snippets With Only Import Statements: {len(only_import_snippets)}\n")
-
-print("\n✅ Analysis complete. Results written to CSV and summary written to text file.")
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Validate and categorize Python snippets.")
+    parser.add_argument('--archive', metavar='BASE', default=None,
+                        help="Read snippets from a packed archive written by Extract.py --archive")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Classify in parallel with N worker processes (output is identical to a serial run)")
+    parser.add_argument('--cache', metavar='CACHE_FILE', nargs='?', const=DEFAULT_CACHE_FILE, default=None,
+                        help=f"Reuse AST facts from a persistent cache (default file: {DEFAULT_CACHE_FILE})")
+    parser.add_argument('--clear-cache', action='store_true', help="Empty the AST cache before running")
+    args = parser.parse_args()
+
+    cache = AstFactsCache(args.cache) if args.cache else None
+    if cache and args.clear_cache:
+        cache.clear()
+
+    # Running the snippet check
+    success_snippets, failed_snippets, executable_snippets, no_def_class_snippets, only_import_snippets = check_python_snippets(TARGET_DIR, args.archive, args.workers, cache)
+    if cache:
+        print(f"🗄️ AST cache: {cache.hits} hits, {cache.misses} misses")
+        cache.close()
+
+    # Preparing data for CSV
+    data_for_csv = {
+        'Successful': success_snippets,
+        'Failed': failed_snippets,
+        'Executable': executable_snippets,
+        'No Function/Class Definition': no_def_class_snippets,
+        'Only Import': only_import_snippets
+    }
+
+    # Writing to CSV
+    csv_filename = 'snippet_analysis_results.csv'
+    write_to_csv(csv_filename, data_for_csv)
+
+    # Writing summary to text file
+    txt_filename = 'snippet_summary.txt'
+    with open(txt_filename, 'w') as file:
+        file.write(f"Number of Successful Snippets: {len(success_snippets)}\n")
+        file.write(f"Number of Failed Snippets: {len(failed_snippets)}\n")
+        file.write(f"Number of Executable Snippets: {len(executable_snippets)}\n")
+        file.write(f"Number of Snippets Without Function/Class Definition: {len(no_def_class_snippets)}\n")
+        file.write(f"Number of Snippets With Only Import Statements: {len(only_import_snippets)}\n")
+
+    print("\n✅ Analysis complete. Results written to CSV and summary written to text file.")
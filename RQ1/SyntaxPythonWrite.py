@@ -1,36 +1,33 @@
 import os
-import ast
+import sys
 import json
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.snippet_store import SnippetStore
+from common.snippet_archive import SnippetArchive
+from common.extract_manifest import load_delta
+from common.py_classifier import classify_many
+from common.ast_cache import AstFactsCache, DEFAULT_CACHE_FILE
 
 TARGET_DIR = "../conversations_new"
 OUTPUT_DIR = "../Data/snippet_lists_py"
+AST_CACHE = None  # Set to an AstFactsCache to skip parsing snippets seen in earlier runs
 
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-def has_function_or_class(source):
-    try:
-        tree = ast.parse(source)
-        return any(isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)) for node in ast.walk(tree))
-    except SyntaxError:
-        return False
-
-def starts_with_import(source):
-    try:
-        tree = ast.parse(source)
-        first_statement = tree.body[0] if tree.body else None
-        return isinstance(first_statement, (ast.Import, ast.ImportFrom))
-    except SyntaxError:
-        return False
-
-def has_executable_code(source):
-    try:
-        tree = ast.parse(source)
-        return any(isinstance(node, (ast.For, ast.While, ast.If, ast.With, ast.Assign, ast.Expr)) for node in ast.walk(tree))
-    except SyntaxError:
-        return False
-
-def check_python_snippets(directory):
-    categories = {
+def classify_all(keys, labels, workers=1, archive_base=None):
+    """Classify snippet files (or archive ids) in input order, reporting unreadable ones."""
+    results = classify_many(keys, workers=workers, archive_base=archive_base, cache=AST_CACHE)
+    categories = []
+    for label, (category, error) in zip(labels, results):
+        if error:
+            print(f"⚠️ Error reading {label}: {error}")
+        categories.append(category)
+    return categories
+
+def empty_categories():
+    return {
         'Successful': [],
         'Failed': [],
         'Executable': [],
@@ -38,47 +35,112 @@ def check_python_snippets(directory):
         'Only Import': []
     }
 
+def check_python_snippets(directory, workers=1):
+    categories = empty_categories()
+
+    rel_paths = []
     for root, dirs, files in os.walk(directory):
         for file in files:
             if file.endswith('.py'):
-                rel_path = os.path.relpath(os.path.join(root, file), directory)
-                try:
-                    with open(os.path.join(root, file), 'r', encoding='utf-8') as f:
-                        source = f.read()
-
-                    if not source.strip():
-                        categories['Failed'].append(rel_path)
-                        continue
-
-                    try:
-                        compile(source, file, 'exec')
-                        if has_function_or_class(source):
-                            categories['Successful'].append(rel_path)
-                        elif has_executable_code(source):
-                            categories['Executable'].append(rel_path)
-                        elif starts_with_import(source):
-                            categories['Only Import'].append(rel_path)
-                        else:
-                            categories['No Function/Class Definition'].append(rel_path)
-                    except (SyntaxError, ValueError):
-                        categories['Failed'].append(rel_path)
-
-                except Exception as e:
-                    print(f"⚠️ Error reading {rel_path}: {e}")
-                    categories['Failed'].append(rel_path)
+                rel_paths.append(os.path.relpath(os.path.join(root, file), directory))
+
+    paths = [os.path.join(directory, rel_path) for rel_path in rel_paths]
+    for rel_path, category in zip(rel_paths, classify_all(paths, rel_paths, workers)):
+        categories[category].append(rel_path)
+
+    return categories
+
+def check_store_snippets(store_dir, workers=1):
+    """Classify each unique body in a snippet store once and fan out to every occurrence."""
+    store = SnippetStore(store_dir)
+    categories = empty_categories()
+    rows = [row for row in store.load_occurrences() if row['snippet_id'].endswith('.py')]
+
+    first_seen = {}
+    for row in rows:
+        first_seen.setdefault(row['hash'], row['snippet_id'])
+    digests = list(first_seen)
+    paths = [store.object_path(digest, '.py') for digest in digests]
+    category_by_hash = dict(zip(digests, classify_all(paths, list(first_seen.values()), workers)))
 
+    for row in rows:
+        categories[category_by_hash[row['hash']]].append(row['snippet_id'])
+
+    print(f"🗃️ Classified {len(category_by_hash)} unique bodies for {len(rows)} snippets")
     return categories
 
-# Run the analysis
-categorized_snippets = check_python_snippets(TARGET_DIR)
+def check_archive_snippets(archive_base, workers=1):
+    """Classify Python snippets straight from a packed archive written by Extract.py --archive."""
+    categories = empty_categories()
+
+    with SnippetArchive(archive_base) as archive:
+        snippet_ids = [entry['snippet_id'] for entry in archive.iter_entries(language='python')]
+
+    for snippet_id, category in zip(snippet_ids, classify_all(snippet_ids, snippet_ids, workers, archive_base)):
+        categories[category].append(snippet_id)
+
+    return categories
+
+def update_with_delta(delta_path, workers=1):
+    """Reclassify only the snippets in an Extract.py --incremental delta and merge into the previous results."""
+    delta = load_delta(delta_path)
+    with open(os.path.join(OUTPUT_DIR, 'python_snippet_categories.json'), 'r', encoding='utf-8') as json_file:
+        categories = json.load(json_file)
+
+    # Drop stale entries for changed and removed snippets
+    stale = delta['touched'] | delta['removed']
+    for category, paths in categories.items():
+        categories[category] = [p for p in paths if p.replace('\\', '/') not in stale]
+
+    rel_paths = [os.path.join(*snippet_id.split('/')) for snippet_id in sorted(delta['touched']) if snippet_id.endswith('.py')]
+    paths = [os.path.join(TARGET_DIR, rel_path) for rel_path in rel_paths]
+    for rel_path, category in zip(rel_paths, classify_all(paths, rel_paths, workers)):
+        categories[category].append(rel_path)
+
+    print(f"🧾 Reclassified {len(rel_paths)} snippets from {delta_path}")
+    return categories
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Categorize Python snippets by syntax and structure.")
+    parser.add_argument('--store', metavar='STORE_DIR', default=None,
+                        help="Read unique bodies from a content-addressed store written by Extract.py --dedup")
+    parser.add_argument('--archive', metavar='BASE', default=None,
+                        help="Read snippets from a packed archive written by Extract.py --archive")
+    parser.add_argument('--delta', metavar='DELTA_FILE', default=None,
+                        help="Only reclassify snippets listed in an Extract.py --incremental delta (e.g. ../extract_delta.json)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Classify in parallel with N worker processes (output is identical to a serial run)")
+    parser.add_argument('--cache', metavar='CACHE_FILE', nargs='?', const=DEFAULT_CACHE_FILE, default=None,
+                        help=f"Reuse AST facts from a persistent cache (default file: {DEFAULT_CACHE_FILE})")
+    parser.add_argument('--clear-cache', action='store_true', help="Empty the AST cache before running")
+    args = parser.parse_args()
+
+    if args.cache:
+        AST_CACHE = AstFactsCache(args.cache)
+        if args.clear_cache:
+            AST_CACHE.clear()
+
+    # Run the analysis
+    if args.delta:
+        categorized_snippets = update_with_delta(args.delta, args.workers)
+    elif args.archive:
+        categorized_snippets = check_archive_snippets(args.archive, args.workers)
+    elif args.store:
+        categorized_snippets = check_store_snippets(args.store, args.workers)
+    else:
+        categorized_snippets = check_python_snippets(TARGET_DIR, args.workers)
+
+    if AST_CACHE:
+        print(f"🗄️ AST cache: {AST_CACHE.hits} hits, {AST_CACHE.misses} misses")
+        AST_CACHE.close()
 
-# Save full categorized list as JSON
-with open(os.path.join(OUTPUT_DIR, 'python_snippet_categories.json'), 'w', encoding='utf-8') as json_file:
-    json.dump(categorized_snippets, json_file, indent=4)
+    # Save full categorized list as JSON
+    with open(os.path.join(OUTPUT_DIR, 'python_snippet_categories.json'), 'w', encoding='utf-8') as json_file:
+        json.dump(categorized_snippets, json_file, indent=4)
 
-# Save only Successful snippets to a separate TXT file
-with open(os.path.join(OUTPUT_DIR, 'successful_python_snippets.txt'), 'w', encoding='utf-8') as txt_file:
-    for path in categorized_snippets['Successful']:
-        txt_file.write(f"{TARGET_DIR}/{path}\n")
+    # Save only Successful snippets to a separate TXT file
+    with open(os.path.join(OUTPUT_DIR, 'successful_python_snippets.txt'), 'w', encoding='utf-8') as txt_file:
+        for path in categorized_snippets['Successful']:
+            txt_file.write(f"{TARGET_DIR}/{path}\n")
 
-print(f"\n✅ Categorization complete. Files saved in '{OUTPUT_DIR}' folder.")
+    print(f"\n✅ Categorization complete. Files saved in '{OUTPUT_DIR}' folder.")
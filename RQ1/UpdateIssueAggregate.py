@@ -0,0 +1,126 @@
+import os
+import sys
+import json
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.issue_store import INGESTERS, source_fingerprint
+from common.issue_summary import (IssueAggregate, aggregate_differences, aggregate_source, batch_record,
+                                  category_rows, load_aggregate, save_aggregate, severity_rows, top_rule_rows,
+                                  write_category_totals, write_rows)
+from common.snippet_paths import SnippetIndex
+from common.snippet_store import snippet_id
+
+# Summary CSVs that can be rewritten from an aggregate, as the RQ1 scripts write them
+SUMMARIES = {
+    'pylint-analyze': lambda aggregate, path, rule_info: write_category_totals(path, aggregate, top=5),
+    'pylint-exec': lambda aggregate, path, rule_info: write_rows(path, category_rows(aggregate, files=False)),
+    'flake8': lambda aggregate, path, rule_info: write_rows(path, category_rows(aggregate)),
+    'bandit-severity': lambda aggregate, path, rule_info: write_rows(
+        path, severity_rows(aggregate), ['Severity', 'Total Issues', 'Files Affected', 'Conversations Affected']),
+    'bandit-top5': lambda aggregate, path, rule_info: write_rows(
+        path, top_rule_rows(aggregate, rule_info), ['Bandit Rule', 'Occurrences', 'Severity', 'Description']),
+}
+
+
+def folded_in(batches):
+    """Fingerprints of the sources currently folded in: every add, minus those subtracted since."""
+    sources = []
+    for batch in batches:
+        if batch['op'] == 'add':
+            sources.append(batch['source'])
+        elif batch['op'] == 'subtract' and batch['source'] in sources:
+            sources.remove(batch['source'])
+    return sources
+
+
+def make_source(kind, path, categories):
+    source = {'kind': kind, 'path': path}
+    if categories:
+        source['categories'] = categories
+    return source
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Fold linter batches into (or out of) a saved issue aggregate without rescanning old outputs.")
+    parser.add_argument('--aggregate', required=True,
+                        help="Aggregate file, e.g. flake8_output.aggregate.json from Flake8Categorize.py")
+    parser.add_argument('--add', nargs=2, action='append', default=[], metavar=('KIND', 'FILE'),
+                        help=f"Fold in a new batch output; KIND is one of {', '.join(INGESTERS)}")
+    parser.add_argument('--subtract', nargs=2, action='append', default=[], metavar=('KIND', 'FILE'),
+                        help="Take a batch that was folded in before back out")
+    parser.add_argument('--remove-snippets', metavar='FILE',
+                        help="Drop every issue of the snippets listed in FILE (one path per line)")
+    parser.add_argument('--categories', help="Rule categorization JSON for pylint/bandit batches")
+    parser.add_argument('--snippets', metavar='FILE',
+                        help="Only keep issues of snippets in this list (PylintExec uses successful_python_snippets.txt)")
+    parser.add_argument('--verify', nargs=2, action='append', default=[], metavar=('KIND', 'FILE'),
+                        help="Full raw output(s) to recompute from and compare with the updated aggregate")
+    parser.add_argument('--summary', choices=sorted(SUMMARIES), help="Rewrite this summary CSV from the aggregate")
+    parser.add_argument('--tool', help="Only summarize issues of this linter (e.g. pylint)")
+    parser.add_argument('--output', help="Summary CSV path (required with --summary)")
+    args = parser.parse_args()
+
+    for kind, _ in args.add + args.subtract + args.verify:
+        if kind not in INGESTERS:
+            parser.error(f"unknown KIND {kind}; expected one of {', '.join(INGESTERS)}")
+    if args.summary and not args.output:
+        parser.error("--summary needs --output")
+
+    snippet_index = None
+    if args.snippets:
+        with open(args.snippets, 'r') as f:
+            snippet_index = SnippetIndex(f.read().splitlines())
+
+    aggregate = load_aggregate(args.aggregate) if os.path.exists(args.aggregate) else IssueAggregate()
+
+    for kind, path in args.add:
+        source = make_source(kind, path, args.categories)
+        if source_fingerprint([source])[0] in folded_in(aggregate.batches):
+            print(f"⏭️ {path} is already folded into {args.aggregate} unchanged, skipping")
+            continue
+        batch = aggregate_source(source, snippet_index)
+        aggregate.merge(batch)
+        print(f"➕ {path}: {batch.overall().total} issues in {len(batch.conversations)} snippets")
+
+    for kind, path in args.subtract:
+        source = make_source(kind, path, args.categories)
+        batch = aggregate_source(source, snippet_index)
+        aggregate.subtract(batch)
+        aggregate.batches.append(batch_record('subtract', source))
+        print(f"➖ {path}: {batch.overall().total} issues in {len(batch.conversations)} snippets")
+
+    if args.remove_snippets:
+        with open(args.remove_snippets, 'r') as f:
+            removed = [snippet_id(line.strip()) for line in f if line.strip()]
+        before = aggregate.overall().total
+        aggregate.discard_snippets(removed)
+        aggregate.batches.append({'op': 'remove_snippets', 'snippets': removed})
+        print(f"🗑️ Removed {len(removed)} snippets ({before - aggregate.overall().total} issues)")
+
+    save_aggregate(aggregate, args.aggregate)
+    overall = aggregate.overall()
+    print(f"✅ {args.aggregate}: {overall.total} issues, {len(overall.files)} files, "
+          f"{len(overall.conversations)} conversations")
+
+    if args.summary:
+        rule_info = {}
+        if args.categories:
+            with open(args.categories, 'r') as f:
+                rule_info = json.load(f)
+        selected = aggregate.select(tool=args.tool) if args.tool else aggregate
+        SUMMARIES[args.summary](selected, args.output, rule_info)
+        print(f"✅ Summary exported to {args.output}")
+
+    if args.verify:
+        expected = IssueAggregate()
+        for kind, path in args.verify:
+            expected.merge(aggregate_source(make_source(kind, path, args.categories), snippet_index))
+        differences = aggregate_differences(aggregate, expected)
+        for difference in differences[:20]:
+            print(f"❌ {difference}")
+        if differences:
+            print(f"❌ {len(differences)} differences from a full recompute")
+            sys.exit(1)
+        print("✅ Incremental aggregate matches a full recompute")
@@ -1,9 +1,10 @@
-import json
-from collections import Counter
-with open(r"C:\Users\USER\Downloads\THESIS2\linter_analysis_results.json", 'r') as f:
-    results = json.load(f)
-issue_types = Counter()
-for r in results.values():
-    for issue in r["linter_results"]["fetched_issues"]:
-        issue_types[issue["code"]] += 1
-print("Most common linter issues:", issue_types.most_common(5))
\ No newline at end of file
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.issue_store import open_issues
+
+LINTER_RESULTS_FILE = r"C:\Users\USER\Downloads\THESIS2\linter_analysis_results.json"
+ISSUE_STORE = r"C:\Users\USER\Downloads\THESIS2\linter_analysis_results.issues"  # Rebuilt when the JSON changes
+store = open_issues(ISSUE_STORE, [{'kind': 'linter_results', 'path': LINTER_RESULTS_FILE}])
+print("Most common linter issues:", store.issues.most_common('rule', 5))
\ No newline at end of file
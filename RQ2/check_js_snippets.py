@@ -1,6 +1,11 @@
-import json
-with open(r"C:\Users\USER\Downloads\THESIS2\linter_analysis_results.json", 'r', encoding='utf-8') as f:
-    results = json.load(f)
-js_snippets = [(k, v) for k, v in results.items() if k.endswith('.js')]
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.json_artifact import open_artifact
+
+# Keys come from the sidecar index; only the listed JS entries are decoded
+results = open_artifact(r"C:\Users\USER\Downloads\THESIS2\linter_analysis_results.json")
+js_snippets = [(k, results[k]) for k in results if k.endswith('.js')]
 print(f"JavaScript snippets processed: {len(js_snippets)}")
 print("Sample JS snippets (first 3):", js_snippets[:3])
\ No newline at end of file
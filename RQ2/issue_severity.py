@@ -1,14 +1,15 @@
-import json
-from collections import Counter
-with open(r"C:\Users\USER\Downloads\THESIS2\linter_analysis_results.json", 'r', encoding='utf-8') as f:
-    results = json.load(f)
-error_issues = Counter()
-convention_issues = Counter()
-for k, r in results.items():
-    for issue in r["linter_results"]["fetched_issues"]:
-        counter = error_issues if issue["code"].startswith('E') else convention_issues if issue["code"].startswith('C') else Counter()
-        counter[issue["code"]] += 1
-print(f"Total errors: {sum(error_issues.values())}")
-print("Top errors:", error_issues.most_common(5))
-print(f"Total conventions: {sum(convention_issues.values())}")
-print("Top conventions:", convention_issues.most_common(5))
\ No newline at end of file
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.issue_store import open_issues
+
+LINTER_RESULTS_FILE = r"C:\Users\USER\Downloads\THESIS2\linter_analysis_results.json"
+ISSUE_STORE = r"C:\Users\USER\Downloads\THESIS2\linter_analysis_results.issues"  # Rebuilt when the JSON changes
+store = open_issues(ISSUE_STORE, [{'kind': 'linter_results', 'path': LINTER_RESULTS_FILE}])
+error_issues = store.issues.where(rule=lambda code: code.startswith('E'))
+convention_issues = store.issues.where(rule=lambda code: code.startswith('C'))
+print(f"Total errors: {len(error_issues)}")
+print("Top errors:", error_issues.most_common('rule', 5))
+print(f"Total conventions: {len(convention_issues)}")
+print("Top conventions:", convention_issues.most_common('rule', 5))
\ No newline at end of file
@@ -1,15 +1,16 @@
-import json
-from collections import Counter
-with open(r"C:\Users\USER\Downloads\THESIS2\linter_analysis_results.json", 'r', encoding='utf-8') as f:
-    results = json.load(f)
-py_issues = Counter()
-js_issues = Counter()
-for k, r in results.items():
-    issues = r["linter_results"]["fetched_issues"]
-    counter = py_issues if k.endswith('.py') else js_issues if k.endswith('.js') else Counter()
-    for issue in issues:
-        counter[issue["code"]] += 1
-print(f"Python snippets: {sum(1 for k in results if k.endswith('.py'))}")
-print("Top Python issues:", py_issues.most_common(5))
-print(f"JavaScript snippets: {sum(1 for k in results if k.endswith('.js'))}")
-print("Top JavaScript issues:", js_issues.most_common(5))
\ No newline at end of file
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.issue_store import open_issues
+
+LINTER_RESULTS_FILE = r"C:\Users\USER\Downloads\THESIS2\linter_analysis_results.json"
+ISSUE_STORE = r"C:\Users\USER\Downloads\THESIS2\linter_analysis_results.issues"  # Rebuilt when the JSON changes
+store = open_issues(ISSUE_STORE, [{'kind': 'linter_results', 'path': LINTER_RESULTS_FILE}])
+snippet_languages = store.snippets.counts('language')
+py_issues = store.issues.where(language='python')
+js_issues = store.issues.where(language='javascript')
+print(f"Python snippets: {snippet_languages.get('python', 0)}")
+print("Top Python issues:", py_issues.most_common('rule', 5))
+print(f"JavaScript snippets: {snippet_languages.get('javascript', 0)}")
+print("Top JavaScript issues:", js_issues.most_common('rule', 5))
\ No newline at end of file
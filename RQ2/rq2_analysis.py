@@ -1,50 +1,77 @@
-import json
+import os
+import sys
 import matplotlib.pyplot as plt
 from collections import Counter
 import numpy as np
 
-# Load results
-with open(r"C:\Users\USER\Downloads\THESIS2\linter_analysis_results.json", 'r', encoding='utf-8') as f:
-    results = json.load(f)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.issue_store import ISSUE_COLUMNS, SNIPPET_COLUMNS, open_issues
+from common.issue_sketch import CountHistogram, SketchSummary, StreamingAggregate, stream_batches, streaming_source
 
-# Initialize counters
-error_issues = Counter()
-convention_issues = Counter()
-warning_issues = Counter()
-per_snippet_issues = []
+LINTER_RESULTS_FILE = r"C:\Users\USER\Downloads\THESIS2\linter_analysis_results.json"
+ISSUE_STORE = r"C:\Users\USER\Downloads\THESIS2\linter_analysis_results.issues"  # Rebuilt when the JSON changes
+# --streaming [PATH]: one pass over PATH (default the JSON; e.g. step3's .ndjson journal) keeping only
+# top-k sketches per issue type and a histogram of issues per snippet; add --exact for exact rule counts
+STREAMING = '--streaming' in sys.argv
+EXACT = '--exact' in sys.argv
+LINTER_RESULTS_STREAM = streaming_source(sys.argv, LINTER_RESULTS_FILE)
+RULE, LANGUAGE = ISSUE_COLUMNS.index('rule'), SNIPPET_COLUMNS.index('language')
 
-# Categorize issues
-for k, r in results.items():
-    issues = r["linter_results"]["fetched_issues"]
-    snippet_issues = 0
-    for issue in issues:
-        code = issue["code"]
-        snippet_issues += 1
-        if code.startswith('E'):
-            error_issues[code] += 1
-        elif code.startswith('C'):
-            convention_issues[code] += 1
-        elif code.startswith('W'):
-            warning_issues[code] += 1
-    per_snippet_issues.append(snippet_issues)
+if STREAMING:
+    snippet_languages = Counter()
+    per_snippet_issues = CountHistogram()
+    issue_types = StreamingAggregate(lambda row: row[RULE][:1] if row[RULE][:1] in ('E', 'C', 'W') else None,
+                                     exact=EXACT)
+    # One record per snippet: its language, issue count and E/C/W rules
+    for issue_rows, snippet_rows in stream_batches({'kind': 'linter_results', 'path': LINTER_RESULTS_STREAM}):
+        snippet_languages.update(row[LANGUAGE] for row in snippet_rows)
+        per_snippet_issues.add(len(issue_rows))
+        issue_types.update(issue_rows)
+    snippet_count = len(per_snippet_issues)
+    error_issues, convention_issues, warning_issues = (
+        issue_types.groups.get(prefix, SketchSummary(EXACT)).rules for prefix in ('E', 'C', 'W'))
+    error_count, convention_count, warning_count = (
+        issue_types.groups.get(prefix, SketchSummary(EXACT)).total for prefix in ('E', 'C', 'W'))
+    total_issues = per_snippet_issues.total()
+    mean_issues, median_issues, max_issues = (per_snippet_issues.mean(), per_snippet_issues.median(),
+                                              per_snippet_issues.max())
+    top_issues = issue_types.overall().rules.most_common(5)
+else:
+    # Load results
+    store = open_issues(ISSUE_STORE, [{'kind': 'linter_results', 'path': LINTER_RESULTS_FILE}])
+    snippet_languages = store.snippets.counts('language')
+    snippet_count = len(store.snippets)
+
+    # Categorize issues
+    error_issues = Counter(store.issues.where(rule=lambda code: code.startswith('E')).counts('rule'))
+    convention_issues = Counter(store.issues.where(rule=lambda code: code.startswith('C')).counts('rule'))
+    warning_issues = Counter(store.issues.where(rule=lambda code: code.startswith('W')).counts('rule'))
+    error_count, convention_count, warning_count = (
+        sum(error_issues.values()), sum(convention_issues.values()), sum(warning_issues.values()))
+    per_snippet_issues = store.issues_per_snippet()
+    total_issues = sum(per_snippet_issues)
+    mean_issues, median_issues, max_issues = (np.mean(per_snippet_issues), np.median(per_snippet_issues),
+                                              max(per_snippet_issues))
+    top_issues = (error_issues + convention_issues + warning_issues).most_common(5)
 
 # Print statistics
-print(f"Total snippets: {len(results)}")
-print(f"Python snippets: {sum(1 for k in results if k.endswith('.py'))}")
-print(f"JavaScript snippets: {sum(1 for k in results if k.endswith('.js'))}")
-print(f"\nTotal issues: {sum(per_snippet_issues)}")
-print(f"Errors: {sum(error_issues.values())} ({sum(error_issues.values())/2849*100:.1f}%)")
-print(f"Conventions: {sum(convention_issues.values())} ({sum(convention_issues.values())/2849*100:.1f}%)")
-print(f"Warnings: {sum(warning_issues.values())} ({sum(warning_issues.values())/2849*100:.1f}%)")
+print(f"Total snippets: {snippet_count}")
+print(f"Python snippets: {snippet_languages.get('python', 0)}")
+print(f"JavaScript snippets: {snippet_languages.get('javascript', 0)}")
+print(f"\nTotal issues: {total_issues}")
+print(f"Errors: {error_count} ({error_count/2849*100:.1f}%)")
+print(f"Conventions: {convention_count} ({convention_count/2849*100:.1f}%)")
+print(f"Warnings: {warning_count} ({warning_count/2849*100:.1f}%)")
 print("\nTop 5 errors:", error_issues.most_common(5))
 print("Top 5 conventions:", convention_issues.most_common(5))
 print("Top 5 warnings:", warning_issues.most_common(5))
-print(f"\nAverage issues per snippet: {np.mean(per_snippet_issues):.1f}")
-print(f"Median issues per snippet: {np.median(per_snippet_issues):.1f}")
-print(f"Max issues in a snippet: {max(per_snippet_issues)}")
+print(f"\nAverage issues per snippet: {mean_issues:.1f}")
+print(f"Median issues per snippet: {median_issues:.1f}")
+print(f"Max issues in a snippet: {max_issues}")
+if STREAMING:
+    print(f"📐 Streaming mode: {issue_types.error_note()}")
 
 # Optional: Plot top issues
-top_issues = (error_issues + convention_issues + warning_issues).most_common(5)
 codes, counts = zip(*top_issues)
 plt.figure(figsize=(10, 6))
 plt.bar(codes, counts, color='skyblue')
@@ -3,6 +3,10 @@ import os
 import traceback
 import re
 import difflib
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.snapshot_reader import iter_sources
 
 # File paths
 json_path = r"C:\Users\USER\Downloads\THESIS2\THESIS2\Thesis_2\Snapshot_20230831\20230831_072722_file_sharings.json"
@@ -59,26 +63,15 @@ def normalize_title(title):
         return title_translations[raw_title]
     return normalized.strip()
 
-# Load the JSON file with UTF-8 encoding
-print("Loading the large JSON file... This might take a moment.")
-try:
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-except FileNotFoundError:
-    print(f"Error: {json_path} not found.")
-    data = {"Sources": []}
-except json.JSONDecodeError as e:
-    print(f"Error decoding JSON: {e}")
-    data = {"Sources": []}
+# Stream the JSON file source by source instead of loading it whole
+print("Streaming the large JSON file...")
 
 # Map titles to GitHub URLs
 title_to_github = {}
-sources = data.get("Sources", [])
-if not isinstance(sources, list):
-    print(f"Error: 'Sources' is not a list, found {type(sources)}")
-else:
-    print(f"Found {len(sources)} entries in 'Sources'.")
-    for i, source in enumerate(sources):
+source_count = 0
+try:
+    for i, source in iter_sources(json_path):
+        source_count += 1
         try:
             if not isinstance(source, dict):
                 print(f"Skipping invalid source at index {i} (not a dict): {str(source)[:50]}...")
@@ -103,6 +96,11 @@ else:
         except Exception as e:
             print(f"Error processing Source[{i}]: {e}")
             traceback.print_exc()
+except FileNotFoundError:
+    print(f"Error: {json_path} not found.")
+except ValueError as e:  # includes json.JSONDecodeError
+    print(f"Error decoding JSON: {e}")
+print(f"Found {source_count} entries in 'Sources'.")
 
 print(f"Extracted {len(title_to_github)} unique titles from JSON. First few: {list(title_to_github.keys())[:5]}")
 
@@ -7,11 +7,17 @@ import time
 import logging
 import unicodedata
 import re
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.snippet_archive import SnippetArchive
 
 # Configuration
 TOKEN_FILE = r"C:\Users\USER\Downloads\THESIS2\THESIS2\Thesis_2\token.txt"
 MAPPINGS_FILE = r"C:\Users\USER\Downloads\THESIS2\snippet_to_github_filtered.json"
 ORIGINAL_SNIPPETS_DIR = r"C:\Users\USER\Downloads\THESIS2\conversations_new"
+# Optional packed archive from Extract.py --archive (base path without .pack); used instead of ORIGINAL_SNIPPETS_DIR when set
+ORIGINAL_SNIPPETS_ARCHIVE = None
 OUTPUT_FILE = r"C:\Users\USER\Downloads\THESIS2\snippet_reuse_results.json"
 LOG_FILE = r"C:\Users\USER\Downloads\THESIS2\step2_log.txt"
 
@@ -111,10 +117,28 @@ def get_relative_path(snippet_path):
         relative_path = path
     return relative_path
 
+_archive = None
+
+def get_archive():
+    """Open the packed snippet archive once and reuse it for every lookup."""
+    global _archive
+    if _archive is None:
+        _archive = SnippetArchive(ORIGINAL_SNIPPETS_ARCHIVE)
+        logging.info(f"Opened snippet archive {ORIGINAL_SNIPPETS_ARCHIVE} with {len(_archive)} snippets")
+    return _archive
+
 def read_original_snippet(snippet_path):
-    """Read the original snippet from the local file system."""
+    """Read the original snippet from the packed archive or the local file system."""
     try:
         relative_path = get_relative_path(snippet_path)
+        if ORIGINAL_SNIPPETS_ARCHIVE:
+            snippet_id = '/'.join(relative_path.split(os.sep)[-2:])
+            content = get_archive().get_text(snippet_id)
+            if content is None:
+                logging.warning(f"Original snippet not found in archive: {snippet_id}")
+                return None
+            # Match the newline translation of a text-mode file read
+            return content.replace('\r\n', '\n').replace('\r', '\n')
         full_path = os.path.join(ORIGINAL_SNIPPETS_DIR, relative_path)
         logging.debug(f"Attempting to read snippet: {full_path}, Exists: {os.path.exists(full_path)}")
         if os.path.exists(full_path):
@@ -1,14 +1,48 @@
 import json
 import os
 import subprocess
-import tempfile
 import logging
 import re
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.lint_cache import (LintCache, cached_lint_as, linter_version, config_fingerprint,
+                               DEFAULT_CACHE_FILE, PYLINT_CONFIG_FILES, ESLINT_CONFIG_FILES)
+from common.stdin_lint import PylintServer, run_eslint_stdin, virtual_path
+from common.eslint_client import ESLintDaemon, DaemonStartError, global_node_modules
+from common.pylint_engine import filter_issues
+from common.lint_journal import LintJournal, journal_path, finalize_dict
+from common.lint_scheduler import LintHistory, LintBudget, write_quarantine_report, DEFAULT_HISTORY_FILE
+from common.lint_profile import (load_profile, pylint_args, eslint_args, eslint_rules, eslint_quiet,
+                                 DEFAULT_PROFILE_FILE)
 
 # Configuration
 RESULTS_FILE = r"C:\Users\USER\Downloads\THESIS2\snippet_reuse_results.json"
 OUTPUT_FILE = r"C:\Users\USER\Downloads\THESIS2\linter_analysis_results.json"
 LOG_FILE = r"C:\Users\USER\Downloads\THESIS2\step3_log.txt"
+# One NDJSON record per snippet, appended as it finishes; OUTPUT_FILE is written from it at the end
+JOURNAL_FILE = journal_path(OUTPUT_FILE)
+RESUME = '--resume' in sys.argv  # Keep snippets already recorded in JOURNAL_FILE and process only the rest
+# Lint results shared with PylintBatch.py and step5 (set to None to always run the linters)
+LINT_CACHE_FILE = DEFAULT_CACHE_FILE
+LINT_CACHE = None
+# Rules, ignored third-party modules and severity floors shared by every linting stage
+LINT_PROFILE = load_profile(DEFAULT_PROFILE_FILE)
+PYLINT_ARGS = pylint_args(LINT_PROFILE)
+ESLINT_ARGS = eslint_args(LINT_PROFILE)
+# Code is linted in memory: pylint in one long-lived worker, eslint in a long-lived daemon
+PYLINT_SERVER = PylintServer(timeout=30, extra_args=PYLINT_ARGS)
+USE_ESLINT_DAEMON = True  # False: one `eslint --stdin` process per snippet (also used if the daemon cannot start)
+# The daemon loads the same global eslint the `eslint` command on PATH runs
+ESLINT_DAEMON = ESLintDaemon(timeout=30, node_path=global_node_modules('eslint'),
+                             rules=eslint_rules(LINT_PROFILE), quiet=eslint_quiet(LINT_PROFILE))
+# Per-snippet timeouts adapt to observed lint times (30 s at most); snippets that keep timing out are quarantined
+# for 30 days. Timed-out and quarantined snippets are left out of OUTPUT_FILE (a resumed run retries them).
+RETRY_QUARANTINED = '--retry-quarantined' in sys.argv  # Lift the quarantine and lint those snippets again
+LINT_HISTORY = LintHistory(DEFAULT_HISTORY_FILE)
+PYLINT_BUDGET = LintBudget('pylint', 30, LINT_HISTORY)
+ESLINT_BUDGET = LintBudget('eslint', 30, LINT_HISTORY)
+QUARANTINE_REPORT = r"C:\Users\USER\Downloads\THESIS2\step3_quarantine.json"
 
 # Set up logging
 logging.basicConfig(filename=LOG_FILE, level=logging.DEBUG, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -28,51 +62,52 @@ def is_valid_code(code, file_extension):
 
 def run_pylint(code, file_path):
     """Run pylint on the provided Python code."""
-    try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(code)
-        
-        result = subprocess.run(
-            ['pylint', file_path, '--output-format=json'],
-            capture_output=True, text=True, timeout=30
-        )
-        if result.stdout:
-            issues = json.loads(result.stdout)
-            return [{"code": issue["message-id"], "message": issue["message"], "line": issue["line"]} for issue in issues]
-        return []
-    except subprocess.TimeoutExpired:
-        logging.error(f"Pylint timed out for {file_path}")
-        return []
-    except json.JSONDecodeError:
-        logging.error(f"Pylint output not valid JSON for {file_path}")
-        return []
-    except Exception as e:
-        logging.error(f"Pylint error for {file_path}: {str(e)}")
-        return []
+    def lint(lint_path):
+        try:
+            return PYLINT_BUDGET.run(PYLINT_BUDGET.key(code), len(code), os.path.basename(file_path),
+                                     lambda timeout: PYLINT_SERVER.lint(code, lint_path, timeout))
+        except subprocess.TimeoutExpired as e:
+            logging.error(f"Pylint {'skipped (quarantined)' if e.output == 'quarantined' else 'timed out'} for {file_path}")
+            raise  # No result is not a clean result: main() leaves the snippet out
+        except json.JSONDecodeError:
+            logging.error(f"Pylint output not valid JSON for {file_path}")
+        except Exception as e:
+            logging.error(f"Pylint error for {file_path}: {str(e)}")
+        return None  # Failed runs are not cached
+
+    config = {'config': config_fingerprint(PYLINT_CONFIG_FILES), 'args': PYLINT_ARGS}
+    issues = cached_lint_as(LINT_CACHE, code, 'pylint', linter_version('pylint'), config, file_path, lint) or []
+    issues = filter_issues(issues, LINT_PROFILE['third_party_modules'], LINT_PROFILE['pylint'].get('disable', []))
+    return [{"code": issue["message-id"], "message": issue["message"], "line": issue["line"]} for issue in issues]
 
 def run_eslint(code, file_path):
     """Run eslint on the provided JavaScript code."""
-    try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(code)
-        
-        result = subprocess.run(
-            ['eslint', file_path, '--format=json'],
-            capture_output=True, text=True, timeout=30
-        )
-        if result.stdout:
-            issues = json.loads(result.stdout)[0].get("messages", [])
-            return [{"code": issue["ruleId"], "message": issue["message"], "line": issue["line"]} for issue in issues]
-        return []
-    except subprocess.TimeoutExpired:
-        logging.error(f"ESLint timed out for {file_path}")
-        return []
-    except json.JSONDecodeError:
-        logging.error(f"ESLint output not valid JSON for {file_path}")
-        return []
-    except Exception as e:
-        logging.error(f"ESLint error for {file_path}: {str(e)}")
-        return []
+    def lint(lint_path):
+        try:
+            def lint_once(timeout):
+                global USE_ESLINT_DAEMON
+                if USE_ESLINT_DAEMON:
+                    try:
+                        return ESLINT_DAEMON.lint(code, lint_path, timeout)
+                    except DaemonStartError as e:
+                        USE_ESLINT_DAEMON = False
+                        logging.error(f"ESLint daemon could not start ({e}), falling back to eslint --stdin")
+                        print(f"⚠️ ESLint daemon could not start ({e}); linting with one `eslint --stdin` per snippet")
+                return run_eslint_stdin(code, lint_path, extra_args=ESLINT_ARGS, timeout=timeout)
+            output = ESLINT_BUDGET.run(ESLINT_BUDGET.key(code), len(code), os.path.basename(file_path), lint_once)
+            return output[0].get("messages", []) if output else []
+        except subprocess.TimeoutExpired as e:
+            logging.error(f"ESLint {'skipped (quarantined)' if e.output == 'quarantined' else 'timed out'} for {file_path}")
+            raise  # No result is not a clean result: main() leaves the snippet out
+        except json.JSONDecodeError:
+            logging.error(f"ESLint output not valid JSON for {file_path}")
+        except Exception as e:
+            logging.error(f"ESLint error for {file_path}: {str(e)}")
+        return None  # Failed runs are not cached
+
+    config = {'config': config_fingerprint(ESLINT_CONFIG_FILES), 'args': ESLINT_ARGS}
+    issues = cached_lint_as(LINT_CACHE, code, 'eslint', linter_version('eslint'), config, file_path, lint) or []
+    return [{"code": issue["ruleId"], "message": issue["message"], "line": issue["line"]} for issue in issues]
 
 def analyze_snippet(snippet_path, data):
     """Analyze the snippet using the appropriate linter."""
@@ -103,28 +138,33 @@ def analyze_snippet(snippet_path, data):
         logging.warning(f"Fetched content does not resemble {file_extension} code for {snippet_path}")
         return None
     
-    # Create temporary files for linter analysis
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_file = os.path.join(temp_dir, os.path.basename(snippet_path))
-        
-        # Analyze fetched code
-        logging.info(f"Running {linter_type} on fetched code for {snippet_path}")
-        fetched_issues = []
-        if linter_type == 'pylint':
-            fetched_issues = run_pylint(fetched_code, temp_file)
-        elif linter_type == 'eslint':
-            fetched_issues = run_eslint(fetched_code, temp_file)
-        
-        return {
-            "fetched_issues": fetched_issues,
-            "comparison": {
-                "fixed": 0,  # No original to compare
-                "introduced": len(fetched_issues),
-                "total_fetched_issues": len(fetched_issues)
-            }
+    # The code is passed in memory, reported under its file name in an empty directory
+    lint_path = virtual_path(os.path.basename(snippet_path))
+    
+    # Analyze fetched code
+    logging.info(f"Running {linter_type} on fetched code for {snippet_path}")
+    fetched_issues = []
+    if linter_type == 'pylint':
+        fetched_issues = run_pylint(fetched_code, lint_path)
+    elif linter_type == 'eslint':
+        fetched_issues = run_eslint(fetched_code, lint_path)
+    
+    return {
+        "fetched_issues": fetched_issues,
+        "comparison": {
+            "fixed": 0,  # No original to compare
+            "introduced": len(fetched_issues),
+            "total_fetched_issues": len(fetched_issues)
         }
+    }
 
 def main():
+    global LINT_CACHE
+    if LINT_CACHE_FILE:
+        LINT_CACHE = LintCache(LINT_CACHE_FILE)
+    if RETRY_QUARANTINED:
+        print(f"Lifted the quarantine of {LINT_HISTORY.clear_timeouts()} snippets")
+
     # Load snippet reuse results
     try:
         with open(RESULTS_FILE, 'r', encoding='utf-8') as f:
@@ -136,33 +176,61 @@ def main():
         print(f"Error loading {RESULTS_FILE}: {str(e)}")
         return
     
-    linter_results = {}
-    for i, (snippet_path, data) in enumerate(results.items()):
-        logging.info(f"Processing {snippet_path}")
-        analysis = analyze_snippet(snippet_path, data)
-        if analysis:
-            linter_results[snippet_path] = {
-                "url": data.get("url", ""),
-                "status": data.get("status"),
-                "linter_results": analysis
-            }
-            print(f"Processed {snippet_path}")
-        else:
-            print(f"Skipped {snippet_path}")
-        
-        if i % 50 == 0:
-            logging.info(f"Processed {i} snippets")
-            print(f"Processed {i} snippets")
-    
-    # Save linter analysis results
+    # Skipped snippets are recorded too (as null), so a resumed run does not retry them;
+    # snippets whose lint timed out are not recorded at all
+    timed_out = 0
+    with LintJournal(JOURNAL_FILE, resume=RESUME) as journal:
+        if journal.done:
+            logging.info(f"Resuming: {len(journal.done)} snippets already in {JOURNAL_FILE}")
+            print(f"Resuming: {len(journal.done)} snippets already in {JOURNAL_FILE}")
+        for i, (snippet_path, data) in enumerate(results.items()):
+            if snippet_path in journal.done:
+                continue
+            logging.info(f"Processing {snippet_path}")
+            try:
+                analysis = analyze_snippet(snippet_path, data)
+            except subprocess.TimeoutExpired as e:
+                timed_out += 1
+                print(f"{'Quarantined' if e.output == 'quarantined' else 'Timed out'} {snippet_path}, left out")
+            else:
+                if analysis:
+                    journal.write(snippet_path, {
+                        "url": data.get("url", ""),
+                        "status": data.get("status"),
+                        "linter_results": analysis
+                    })
+                    print(f"Processed {snippet_path}")
+                else:
+                    journal.write(snippet_path, None)
+                    print(f"Skipped {snippet_path}")
+
+            if i % 50 == 0:
+                logging.info(f"Processed {i} snippets")
+                print(f"Processed {i} snippets")
+
+    # Save linter analysis results in the legacy format, streamed from the journal
     try:
-        with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-            json.dump(linter_results, f, indent=2)
-        logging.info(f"Results saved to {OUTPUT_FILE}")
+        count = finalize_dict(JOURNAL_FILE, OUTPUT_FILE, indent=2)
+        logging.info(f"{count} results saved to {OUTPUT_FILE}")
         print(f"Results saved to {OUTPUT_FILE}")
     except Exception as e:
         logging.error(f"Error saving {OUTPUT_FILE}: {str(e)}")
         print(f"Error saving {OUTPUT_FILE}: {str(e)}")
 
+    PYLINT_SERVER.close()
+    ESLINT_DAEMON.close()
+    LINT_HISTORY.save()
+    if timed_out:
+        logging.warning(f"{timed_out} snippets timed out or are quarantined and were left out of {OUTPUT_FILE}")
+        print(f"{timed_out} snippets timed out or are quarantined and were left out of {OUTPUT_FILE}")
+    quarantined = write_quarantine_report(LINT_HISTORY, path=QUARANTINE_REPORT)
+    if quarantined:
+        logging.warning(f"{quarantined} snippets quarantined after repeated timeouts, see {QUARANTINE_REPORT}")
+        print(f"{quarantined} snippets quarantined after repeated timeouts, see {QUARANTINE_REPORT}")
+    if LINT_CACHE is not None:
+        logging.info(f"Lint cache: {LINT_CACHE.stats()}")
+        print(f"Lint cache: {LINT_CACHE.stats()}")
+        LINT_CACHE.close()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
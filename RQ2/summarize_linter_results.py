@@ -1,7 +1,13 @@
-import json
-with open(r"C:\Users\USER\Downloads\THESIS2\linter_analysis_results.json", 'r', encoding='utf-8') as f:
-    results = json.load(f)
-total_snippets = len(results)
-total_issues = sum(r["linter_results"]["comparison"]["introduced"] for r in results.values())
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.issue_store import open_issues
+
+LINTER_RESULTS_FILE = r"C:\Users\USER\Downloads\THESIS2\linter_analysis_results.json"
+ISSUE_STORE = r"C:\Users\USER\Downloads\THESIS2\linter_analysis_results.issues"  # Rebuilt when the JSON changes
+store = open_issues(ISSUE_STORE, [{'kind': 'linter_results', 'path': LINTER_RESULTS_FILE}])
+total_snippets = len(store.snippets)
+total_issues = len(store.issues)
 print(f"Processed snippets: {total_snippets}")
 print(f"Total linter issues in fetched code: {total_issues}")
\ No newline at end of file
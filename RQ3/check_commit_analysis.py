@@ -1,7 +1,11 @@
-import json
+import os
+import sys
 
-with open(r"C:\Users\USER\Downloads\THESIS2\commit_analysis_results.json", 'r', encoding='utf-8') as f:
-    results = json.load(f)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.json_artifact import open_artifact
+
+# Lazy view: only the inspected snippet's entry is decoded
+results = open_artifact(r"C:\Users\USER\Downloads\THESIS2\commit_analysis_results.json")
 
 py_snippets = [k for k in results if k.endswith('.py')]
 js_snippets = [k for k in results if k.endswith('.js')]
@@ -2,13 +2,39 @@ import json
 import subprocess
 import os
 import logging
-import tempfile
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.lint_cache import LintCache, cached_lint_as, linter_version, config_fingerprint, DEFAULT_CACHE_FILE, PYLINT_CONFIG_FILES
+from common.stdin_lint import PylintServer, run_eslint_stdin, virtual_path
+from common.eslint_client import ESLintDaemon, DaemonStartError
+from common.pylint_engine import filter_issues
+from common.lint_profile import load_profile, pylint_args, eslint_args, eslint_rules, eslint_quiet, DEFAULT_PROFILE_FILE
+from common.lint_scheduler import LintHistory, LintBudget, write_quarantine_report, DEFAULT_HISTORY_FILE
+from common.json_artifact import open_artifact
 
 # Configuration
 COMMIT_ANALYSIS_FILE = r"C:\Users\USER\Downloads\THESIS2\commit_analysis_results.json"
 LINTER_RESULTS_FILE = r"C:\Users\USER\Downloads\THESIS2\linter_comparison.json"
 LOG_FILE = r"C:\Users\USER\Downloads\THESIS2\step5_log.txt"
 ESLINT_PATH = r"C:\Users\USER\AppData\Roaming\npm\eslint.cmd"  # Confirmed path
+# Lint results shared with PylintBatch.py and step3 (set to None to always run the linters)
+LINT_CACHE_FILE = DEFAULT_CACHE_FILE
+LINT_CACHE = None
+# Rules, ignored third-party modules and severity floors shared by every linting stage
+LINT_PROFILE = load_profile(DEFAULT_PROFILE_FILE)
+PYLINT_ARGS = pylint_args(LINT_PROFILE)
+ESLINT_ARGS = eslint_args(LINT_PROFILE)
+# Code is linted in memory: pylint in one long-lived worker, eslint in a long-lived daemon
+PYLINT_SERVER = PylintServer(timeout=60, extra_args=PYLINT_ARGS)
+USE_ESLINT_DAEMON = True  # False: one `eslint --stdin` process per item (also used if the daemon cannot start)
+ESLINT_DAEMON = None  # Started in analyze_linter_changes once the config exists
+# Per-version timeouts adapt to observed lint times (60 s at most); code that keeps timing out is quarantined
+# for 30 days. Snippets with a timed-out or quarantined version are left out of LINTER_RESULTS_FILE.
+RETRY_QUARANTINED = '--retry-quarantined' in sys.argv  # Lift the quarantine and lint that code again
+LINT_HISTORY = LintHistory(DEFAULT_HISTORY_FILE)
+LINT_BUDGETS = {'pylint': LintBudget('pylint', 60, LINT_HISTORY), 'eslint': LintBudget('eslint', 60, LINT_HISTORY)}
+QUARANTINE_REPORT = r"C:\Users\USER\Downloads\THESIS2\step5_quarantine.json"
 
 # Set up logging
 logging.basicConfig(
@@ -18,65 +44,72 @@ logging.basicConfig(
 )
 
 def run_linter(code, file_path, linter_type):
-    """Run linter on the given code."""
+    """Run linter on the given code, reusing cached results for identical code and settings."""
+    if linter_type == 'pylint':
+        version, config_files, args = linter_version('pylint'), PYLINT_CONFIG_FILES, PYLINT_ARGS
+    else:
+        version = linter_version(ESLINT_PATH)
+        config_files, args = [os.path.join(os.path.dirname(__file__), '.eslintrc.json')], ESLINT_ARGS
+    config = {'config': config_fingerprint(config_files), 'args': args}
+    issues = cached_lint_as(LINT_CACHE, code, linter_type, version, config, file_path,
+                            lambda lint_path: _run_linter(code, lint_path, linter_type, os.path.basename(file_path)))
+    if issues is None:
+        return []
+    if linter_type == 'pylint':
+        # Same filter as PylintBatch, applied after the cache so cached and fresh results match
+        issues = filter_issues(issues, LINT_PROFILE['third_party_modules'], LINT_PROFILE['pylint'].get('disable', []))
+    return issues
+
+def _run_linter(code, file_path, linter_type, name=None):
+    """Run linter on the given code (passed in memory) as ``file_path``; returns None if the linter failed.
+
+    ``name`` is how the code is listed in the quarantine report (default: the file name).
+    """
     try:
-        # Write code to temporary file
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(code)
-        logging.info(f"Created temporary file: {file_path}")
-        
-        # Prepare command based on linter type
+        budget = LINT_BUDGETS.get(linter_type)
+        run = lambda lint_once: budget.run(budget.key(code), len(code), name or os.path.basename(file_path), lint_once)
         if linter_type == 'pylint':
-            cmd = ['pylint', file_path, '--output-format=json']
+            logging.info(f"Running pylint in-process on {file_path} (stdin)")
+            return run(lambda timeout: PYLINT_SERVER.lint(code, file_path, timeout))
         elif linter_type == 'eslint':
             # Use .eslintrc.json if it exists, otherwise use default
             config_path = os.path.join(os.path.dirname(__file__), '.eslintrc.json')
-            cmd = [ESLINT_PATH, file_path, '--format=json']
-            if os.path.exists(config_path):
-                cmd.append(f"--config={config_path}")
-        else:
-            logging.error(f"Unknown linter type: {linter_type}")
-            return []
-        
-        logging.info(f"Executing command: {' '.join(cmd)}")
-        
-        # Run linter with explicit shell=False for security
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=60,
-            shell=False
-        )
-        
-        logging.debug(f"{linter_type} stdout: {result.stdout}")
-        logging.debug(f"{linter_type} stderr: {result.stderr}")
-        logging.debug(f"{linter_type} return code: {result.returncode}")
-        
-        if result.stdout:
-            try:
-                if linter_type == 'pylint':
-                    issues = json.loads(result.stdout)
-                    return issues
-                elif linter_type == 'eslint':
-                    # ESLint outputs a list of file results
-                    output = json.loads(result.stdout)
-                    return output[0].get("messages", []) if output else []
-            except json.JSONDecodeError as e:
-                logging.error(f"Failed to parse {linter_type} output for {file_path}: {e}")
+            extra_args = ([f"--config={config_path}"] if os.path.exists(config_path) else []) + ESLINT_ARGS
+            
+            # ESLint outputs a list of file results
+            def lint_once(timeout):
+                global USE_ESLINT_DAEMON
+                if USE_ESLINT_DAEMON:
+                    logging.info(f"Sending {file_path} to the ESLint daemon")
+                    try:
+                        return ESLINT_DAEMON.lint(code, file_path, timeout)
+                    except DaemonStartError as e:
+                        USE_ESLINT_DAEMON = False
+                        logging.error(f"ESLint daemon could not start ({e}), falling back to eslint --stdin")
+                        print(f"ESLint daemon could not start ({e}); linting with one `eslint --stdin` per item")
+                logging.info(f"Executing command: {ESLINT_PATH} --stdin --stdin-filename={file_path} {' '.join(extra_args)}")
+                return run_eslint_stdin(code, file_path, ESLINT_PATH, extra_args, timeout=timeout)
+            output = run(lint_once)
+            logging.debug(f"eslint output: {output}")
+            if output is None:
+                logging.warning(f"No output from eslint for {file_path}")
                 return []
+            return output[0].get("messages", []) if output else []
         else:
-            logging.warning(f"No output from {linter_type} for {file_path}")
-            return []
-    except subprocess.TimeoutExpired:
-        logging.error(f"{linter_type} timed out for {file_path}")
-        return []
+            logging.error(f"Unknown linter type: {linter_type}")
+            return None
+    except json.JSONDecodeError as e:
+        logging.error(f"Failed to parse {linter_type} output for {file_path}: {e}")
+        return None
+    except subprocess.TimeoutExpired as e:
+        logging.error(f"{linter_type} {'skipped (quarantined)' if e.output == 'quarantined' else 'timed out'} for {file_path}")
+        raise  # No result is not a clean result: the snippet is left out of the comparison
     except FileNotFoundError as e:
         logging.error(f"{linter_type} executable not found: {e}")
-        return []
+        return None
     except Exception as e:
         logging.error(f"Error running {linter_type} on {file_path}: {e}")
-        return []
+        return None
 
 def compare_linter_issues(initial_issues, final_issues):
     """Compare linter issues between versions."""
@@ -100,9 +133,20 @@ def compare_linter_issues(initial_issues, final_issues):
 
 def analyze_linter_changes():
     """Analyze linter changes between initial and final code."""
+    global LINT_CACHE, ESLINT_DAEMON
+    if LINT_CACHE_FILE:
+        LINT_CACHE = LintCache(LINT_CACHE_FILE)
+    if RETRY_QUARANTINED:
+        print(f"Lifted the quarantine of {LINT_HISTORY.clear_timeouts()} code versions")
+    # The daemon loads the config and plugins once; eslint itself is resolved from ESLINT_PATH's npm folder
+    config_path = os.path.join(os.path.dirname(__file__), '.eslintrc.json')
+    ESLINT_DAEMON = ESLintDaemon(config=config_path if os.path.exists(config_path) else None, timeout=60,
+                                 node_path=os.path.join(os.path.dirname(ESLINT_PATH), 'node_modules'),
+                                 rules=eslint_rules(LINT_PROFILE), quiet=eslint_quiet(LINT_PROFILE))
+
     try:
-        with open(COMMIT_ANALYSIS_FILE, 'r', encoding='utf-8') as f:
-            commit_analysis = json.load(f)
+        # Entries are decoded one at a time from the binary sidecar as the loop reaches them
+        commit_analysis = open_artifact(COMMIT_ANALYSIS_FILE)
         logging.info(f"Loaded {COMMIT_ANALYSIS_FILE} with {len(commit_analysis)} snippets")
     except Exception as e:
         logging.error(f"Failed to load {COMMIT_ANALYSIS_FILE}: {e}")
@@ -110,6 +154,7 @@ def analyze_linter_changes():
         return
     
     linter_comparison = {}
+    timed_out = 0
     for snippet_path, data in commit_analysis.items():
         initial_code = data.get("initial_code")
         final_code = data.get("final_code")
@@ -125,19 +170,23 @@ def analyze_linter_changes():
         
         logging.info(f"Processing {snippet_path} with {linter_type}")
         
-        # Use temporary directory for files
-        with tempfile.TemporaryDirectory() as temp_dir:
-            initial_file = os.path.join(temp_dir, f"initial_{os.path.basename(snippet_path)}")
-            final_file = os.path.join(temp_dir, f"final_{os.path.basename(snippet_path)}")
-            
-            # Run linters
+        # Code is passed in memory, reported under the old temp-file names in an empty directory
+        initial_file = virtual_path(f"initial_{os.path.basename(snippet_path)}")
+        final_file = virtual_path(f"final_{os.path.basename(snippet_path)}")
+        
+        # Run linters
+        try:
             initial_issues = run_linter(initial_code, initial_file, linter_type)
             final_issues = run_linter(final_code, final_file, linter_type)
-            
-            # Compare issues
-            comparison = compare_linter_issues(initial_issues, final_issues)
-            linter_comparison[snippet_path] = comparison
-            logging.info(f"Comparison for {snippet_path}: {comparison}")
+        except subprocess.TimeoutExpired:
+            timed_out += 1
+            logging.warning(f"Skipping {snippet_path}: a version timed out or is quarantined")
+            continue
+        
+        # Compare issues
+        comparison = compare_linter_issues(initial_issues, final_issues)
+        linter_comparison[snippet_path] = comparison
+        logging.info(f"Comparison for {snippet_path}: {comparison}")
     
     try:
         with open(LINTER_RESULTS_FILE, 'w', encoding='utf-8') as f:
@@ -148,6 +197,21 @@ def analyze_linter_changes():
         logging.error(f"Failed to save {LINTER_RESULTS_FILE}: {e}")
         print(f"Error: Failed to save {LINTER_RESULTS_FILE}")
 
+    PYLINT_SERVER.close()
+    ESLINT_DAEMON.close()
+    LINT_HISTORY.save()
+    if timed_out:
+        logging.warning(f"{timed_out} snippets timed out or are quarantined and were left out of {LINTER_RESULTS_FILE}")
+        print(f"{timed_out} snippets timed out or are quarantined and were left out of {LINTER_RESULTS_FILE}")
+    quarantined = write_quarantine_report(LINT_HISTORY, path=QUARANTINE_REPORT)
+    if quarantined:
+        logging.warning(f"{quarantined} code versions quarantined after repeated timeouts, see {QUARANTINE_REPORT}")
+        print(f"{quarantined} code versions quarantined after repeated timeouts, see {QUARANTINE_REPORT}")
+    if LINT_CACHE is not None:
+        logging.info(f"Lint cache: {LINT_CACHE.stats()}")
+        print(f"Lint cache: {LINT_CACHE.stats()}")
+        LINT_CACHE.close()
+
 if __name__ == "__main__":
     # Ensure ESLint configuration exists
     eslint_config = {
@@ -1,14 +1,18 @@
 import json
+import os
+import sys
 import pandas as pd
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.json_artifact import load_artifact
+
 # Configuration
 LINTER_COMPARISON_FILE = r"C:\Users\USER\Downloads\THESIS2\linter_comparison.json"
 OUTPUT_SUMMARY_FILE = r"C:\Users\USER\Downloads\THESIS2\rq3_summary.json"
 OUTPUT_TABLE_FILE = r"C:\Users\USER\Downloads\THESIS2\rq3_summary_table.csv"
 
 def summarize_results():
-    with open(LINTER_COMPARISON_FILE, 'r', encoding='utf-8') as f:
-        comparison = json.load(f)
+    comparison = load_artifact(LINTER_COMPARISON_FILE)
     
     # Initialize totals
     total_fixed = 0
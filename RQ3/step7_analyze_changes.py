@@ -1,8 +1,13 @@
 import json
+import os
+import sys
 import pandas as pd
 import matplotlib.pyplot as plt
 from collections import Counter
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.json_artifact import load_artifact, open_artifact
+
 # Configuration
 LINTER_COMPARISON_FILE = r"C:\Users\USER\Downloads\THESIS2\linter_comparison.json"
 COMMIT_ANALYSIS_FILE = r"C:\Users\USER\Downloads\THESIS2\commit_analysis_results.json"
@@ -12,10 +17,9 @@ OUTPUT_TABLE_FILE = r"C:\Users\USER\Downloads\THESIS2\rq3_language_table.csv"
 
 def analyze_changes():
     # Load linter comparison and commit analysis
-    with open(LINTER_COMPARISON_FILE, 'r', encoding='utf-8') as f:
-        linter_comparison = json.load(f)
-    with open(COMMIT_ANALYSIS_FILE, 'r', encoding='utf-8') as f:
-        commit_analysis = json.load(f)
+    linter_comparison = load_artifact(LINTER_COMPARISON_FILE)
+    # Only membership is checked, which the lazy view answers from its key index
+    commit_analysis = open_artifact(COMMIT_ANALYSIS_FILE)
     
     # Initialize counters
     py_fixed = Counter()
@@ -0,0 +1 @@
+"""Shared helpers used by the RQ1/RQ2/RQ3 pipeline scripts."""
@@ -0,0 +1,108 @@
+"""Persistent cache of per-snippet AST facts.
+
+Facts (syntax ok, category and the structural metrics of
+``py_classifier.analyze_source``) are stored in a SQLite file keyed by
+(content hash, Python minor version), so warm re-runs only hash snippets
+instead of parsing them. Entries remember when they were
+last used, and the cache is trimmed to ``max_entries`` by evicting the least
+recently used ones. Bumping ``CLASSIFIER_VERSION`` in ``py_classifier``
+invalidates every stored fact.
+"""
+import json
+import os
+import sqlite3
+import sys
+import time
+
+DEFAULT_CACHE_FILE = "../Data/ast_facts_cache.sqlite"
+DEFAULT_MAX_ENTRIES = 500000
+PYTHON_VERSION = f"{sys.version_info.major}.{sys.version_info.minor}"
+
+# SQLite limits the number of bound parameters per statement
+_BATCH = 500
+
+
+class AstFactsCache:
+    def __init__(self, path=DEFAULT_CACHE_FILE, logic_version=None, max_entries=DEFAULT_MAX_ENTRIES):
+        if logic_version is None:
+            from common.py_classifier import CLASSIFIER_VERSION
+            logic_version = CLASSIFIER_VERSION
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'logic_version'").fetchone()
+        if row is None or row[0] != str(logic_version):
+            # Classifier logic changed: every stored fact may be wrong (and the layout may differ)
+            self._conn.execute("DROP TABLE IF EXISTS facts")
+            self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('logic_version', ?)", (str(logic_version),))
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS facts ("
+            " content_hash TEXT, py_version TEXT, syntax_ok INTEGER, category TEXT,"
+            " metrics TEXT, last_used REAL,"
+            " PRIMARY KEY (content_hash, py_version))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS facts_last_used ON facts (last_used)")
+        self._conn.commit()
+
+    def clear(self):
+        self._conn.execute("DELETE FROM facts")
+        self._conn.commit()
+
+    def get_many(self, hashes):
+        """Return ``{content_hash: facts}`` for the hashes that are cached, marking them as used."""
+        hashes = list(hashes)
+        found = {}
+        for i in range(0, len(hashes), _BATCH):
+            batch = hashes[i:i + _BATCH]
+            marks = ','.join('?' * len(batch))
+            rows = self._conn.execute(
+                f"SELECT content_hash, syntax_ok, category, metrics FROM facts"
+                f" WHERE py_version = ? AND content_hash IN ({marks})", [PYTHON_VERSION] + batch
+            ).fetchall()
+            for digest, syntax_ok, category, metrics in rows:
+                found[digest] = dict(json.loads(metrics), syntax_ok=bool(syntax_ok), category=category)
+        if found:
+            now = time.time()
+            self._conn.executemany(
+                "UPDATE facts SET last_used = ? WHERE content_hash = ? AND py_version = ?",
+                [(now, digest, PYTHON_VERSION) for digest in found]
+            )
+            self._conn.commit()
+        self.hits += len(found)
+        self.misses += len(set(hashes)) - len(found)
+        return found
+
+    def put_many(self, facts_by_hash):
+        now = time.time()
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO facts VALUES (?, ?, ?, ?, ?, ?)",
+            [(digest, PYTHON_VERSION, int(f['syntax_ok']), f['category'],
+              json.dumps({k: v for k, v in f.items() if k not in ('syntax_ok', 'category')}, sort_keys=True), now)
+             for digest, f in facts_by_hash.items()]
+        )
+        self._conn.commit()
+        self.evict()
+
+    def evict(self):
+        """Drop the least recently used entries beyond ``max_entries``."""
+        count = self._conn.execute("SELECT COUNT(*) FROM facts").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM facts WHERE rowid IN (SELECT rowid FROM facts ORDER BY last_used LIMIT ?)", (excess,)
+            )
+            self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,155 @@
+"""Python client for the ESLint daemon (``common/eslint_daemon.js``).
+
+The daemon is one ``node`` process that loads ESLint, the config and its
+plugins once and lints source text sent over stdio as newline-delimited
+JSON. ``ESLintDaemon`` starts it lazily, reuses it for every request, and
+enforces a per-request timeout: a daemon that does not answer in time is
+killed and transparently restarted on the next request. A daemon that
+cannot start (no ``node``, or eslint not found from ``node_path``) raises
+``DaemonStartError`` on that and every later request, so callers can fall
+back to ``eslint --stdin`` instead of restarting it for every snippet.
+"""
+import functools
+import json
+import os
+import queue
+import shutil
+import subprocess
+import threading
+
+NODE = os.environ.get('NODE', 'node')
+DAEMON_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'eslint_daemon.js')
+
+
+class DaemonStartError(RuntimeError):
+    """The daemon exited before answering its first request."""
+
+
+@functools.lru_cache(maxsize=None)
+def global_node_modules(eslint_cmd='eslint'):
+    """Global ``node_modules`` folder holding eslint, for ``node_path``; None if it cannot be found.
+
+    Asks ``npm root -g``, else derives it from ``eslint_cmd`` on PATH (a
+    Windows ``npm\\eslint.cmd`` sits next to ``npm\\node_modules``; elsewhere
+    the command links into ``<root>/eslint/bin``).
+    """
+    candidates = []
+    npm = shutil.which('npm')
+    if npm:
+        try:
+            result = subprocess.run([npm, 'root', '-g'], capture_output=True, text=True, timeout=60)
+            candidates.append(result.stdout.strip())
+        except (OSError, subprocess.SubprocessError):
+            pass
+    eslint = shutil.which(eslint_cmd)
+    if eslint:
+        candidates.append(os.path.join(os.path.dirname(eslint), 'node_modules'))
+        candidates.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(eslint)))))
+    for candidate in candidates:
+        if candidate and os.path.isdir(os.path.join(candidate, 'eslint')):
+            return candidate
+    return None
+
+
+class ESLintDaemon:
+    def __init__(self, config=None, timeout=30, node=NODE, node_path=None, rules=None, quiet=False):
+        """``config`` is passed as ``--config``; ``node_path`` points Node at a global ``node_modules`` holding eslint.
+
+        ``rules`` (rule overrides) and ``quiet`` (errors only) come from the lint profile.
+        """
+        self.config = config
+        self.rules = rules or {}
+        self.quiet = quiet
+        self.timeout = timeout
+        self.node = node
+        self.node_path = node_path
+        self._proc = None
+        self._responses = None
+        self._next_id = 0
+        self._answered = False  # Whether the current process has answered a request
+        self.start_error = None
+
+    def _start(self):
+        cmd = [self.node, DAEMON_SCRIPT] + (['--config', self.config] if self.config else [])
+        if self.rules:
+            cmd += ['--rules', json.dumps(self.rules)]
+        if self.quiet:
+            cmd.append('--quiet')
+        env = dict(os.environ)
+        if self.node_path:
+            env['NODE_PATH'] = os.pathsep.join(p for p in (self.node_path, env.get('NODE_PATH')) if p)
+        try:
+            self._proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                          text=True, encoding='utf-8', bufsize=1, env=env)
+        except OSError as e:
+            self.start_error = f"cannot run {self.node}: {e}"
+            raise DaemonStartError(self.start_error)
+        self._answered = False
+        self._responses = queue.Queue()
+        # A reader thread lets lint() wait on the response with a timeout
+        threading.Thread(target=self._read, args=(self._proc, self._responses), daemon=True).start()
+
+    @staticmethod
+    def _read(proc, responses):
+        for line in proc.stdout:
+            responses.put(line)
+        responses.put(None)  # Daemon exited
+
+    def lint(self, code, file_path, timeout=None):
+        """ESLint results for ``code`` reported as ``file_path`` (same list as ``eslint --format=json``).
+
+        ``timeout`` overrides the daemon's default for this request.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        if self.start_error:
+            raise DaemonStartError(self.start_error)
+        if self._proc is None or self._proc.poll() is not None:
+            self._start()
+        self._next_id += 1
+        try:
+            self._proc.stdin.write(json.dumps({'id': self._next_id, 'code': code, 'filePath': file_path}) + '\n')
+            self._proc.stdin.flush()
+        except OSError:
+            pass  # Daemon already gone: the reader reports it below
+        try:
+            line = self._responses.get(timeout=timeout)
+        except queue.Empty:
+            self._kill()
+            raise subprocess.TimeoutExpired(['eslint_daemon', file_path], timeout)
+        if line is None:
+            proc = self._proc
+            self._kill()
+            if not self._answered:
+                # Never answered: it failed to start (its reason went to stderr), so do not respawn it
+                self.start_error = f"ESLint daemon exited with code {proc.returncode} before answering"
+                raise DaemonStartError(self.start_error)
+            raise RuntimeError("ESLint daemon exited unexpectedly")
+        self._answered = True
+        response = json.loads(line)
+        if response.get('id') != self._next_id:
+            self._kill()
+            raise RuntimeError(f"ESLint daemon error: {response.get('error', 'out-of-order response')}")
+        if 'error' in response:
+            raise RuntimeError(f"ESLint daemon error: {response['error']}")
+        return response['results']
+
+    def _kill(self):
+        if self._proc is not None:
+            self._proc.kill()
+            self._proc.wait()
+            self._proc = None
+
+    def close(self):
+        if self._proc is not None and self._proc.poll() is None:
+            self._proc.stdin.close()
+            try:
+                self._proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self._proc.kill()
+        self._proc = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
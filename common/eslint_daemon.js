@@ -0,0 +1,49 @@
+// Long-lived ESLint server driven by common/eslint_client.py.
+// Loads ESLint, the config and its plugins once, then lints source text sent as one JSON request per line on stdin:
+//   {"id": 1, "code": "let x = 1;", "filePath": "/tmp/lint_x/snippet.js"}
+// and answers one JSON line per request on stdout, in order, with the same results `eslint --stdin --format=json` prints:
+//   {"id": 1, "results": [{"filePath": ..., "messages": [...], ...}]}   or   {"id": 1, "error": "..."}
+// Usage: node eslint_daemon.js [--config <file>] [--rules <json>] [--quiet]
+const readline = require('readline');
+const eslintModule = require('eslint');
+
+const quiet = process.argv.includes('--quiet');
+
+function argValue(name) {
+    const index = process.argv.indexOf(name);
+    return index !== -1 ? process.argv[index + 1] : undefined;
+}
+
+async function createLinter() {
+    const options = {};
+    if (argValue('--config')) options.overrideConfigFile = argValue('--config');
+    // Rule overrides from the lint profile, like `eslint --rule`
+    if (argValue('--rules')) options.overrideConfig = { rules: JSON.parse(argValue('--rules')) };
+    // loadESLint picks flat or eslintrc config the same way the eslint CLI does
+    const ESLintClass = eslintModule.loadESLint ? await eslintModule.loadESLint() : eslintModule.ESLint;
+    return { linter: new ESLintClass(options), ESLintClass };
+}
+
+async function main() {
+    const { linter, ESLintClass } = await createLinter();
+    const input = readline.createInterface({ input: process.stdin, crlfDelay: Infinity });
+    for await (const line of input) {
+        if (!line.trim()) continue;
+        let request = {};
+        let response;
+        try {
+            request = JSON.parse(line);
+            const results = await linter.lintText(request.code, { filePath: request.filePath, warnIgnored: true });
+            // --quiet: only errors, as `eslint --quiet` reports
+            response = { id: request.id, results: quiet ? ESLintClass.getErrorResults(results) : results };
+        } catch (error) {
+            response = { id: request.id === undefined ? null : request.id, error: String(error.message || error) };
+        }
+        process.stdout.write(JSON.stringify(response) + '\n');
+    }
+}
+
+main().catch(error => {
+    process.stderr.write(`ESLint daemon failed to start: ${error.message || error}\n`);
+    process.exit(1);
+});
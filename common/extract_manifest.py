@@ -0,0 +1,85 @@
+"""Snapshot manifest and snippet delta for incremental extraction.
+
+The manifest records, for every snapshot file, its size, mtime and SHA-256
+plus the snippet ids it produced (with their content hashes). Comparing the
+snippet maps before and after a run gives the delta of added, changed and
+removed snippet ids that downstream stages can restrict themselves to.
+"""
+import hashlib
+import json
+import os
+
+MANIFEST_VERSION = 1
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest(path):
+    if not os.path.exists(path):
+        return {'version': MANIFEST_VERSION, 'files': {}}
+    with open(path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('version') != MANIFEST_VERSION:
+        # Unknown layout: treat as empty so everything is re-extracted
+        return {'version': MANIFEST_VERSION, 'files': {}}
+    return manifest
+
+
+def save_manifest(path, manifest):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def fingerprint(path, previous=None):
+    """Return ``(entry, changed)`` for a snapshot file.
+
+    Size and mtime are checked first; the file is only hashed when they
+    differ from ``previous``, and a matching hash still counts as unchanged.
+    """
+    stat = os.stat(path)
+    entry = {'size': stat.st_size, 'mtime': stat.st_mtime}
+    if previous and previous.get('size') == entry['size'] and previous.get('mtime') == entry['mtime']:
+        return dict(previous, **entry), False
+    entry['sha256'] = file_sha256(path)
+    changed = not previous or previous.get('sha256') != entry['sha256']
+    if not changed:
+        entry['snippets'] = previous.get('snippets', {})
+    return entry, changed
+
+
+def snippet_map(file_entries):
+    """Merge per-file ``{snippet_id: content_hash}`` maps; later files win on id clashes."""
+    merged = {}
+    for name in sorted(file_entries):
+        merged.update(file_entries[name].get('snippets', {}))
+    return merged
+
+
+def compute_delta(old_snippets, new_snippets):
+    return {
+        'added': sorted(set(new_snippets) - set(old_snippets)),
+        'changed': sorted(i for i in set(new_snippets) & set(old_snippets) if new_snippets[i] != old_snippets[i]),
+        'removed': sorted(set(old_snippets) - set(new_snippets)),
+    }
+
+
+def save_delta(path, delta):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(delta, f, indent=2)
+
+
+def load_delta(path):
+    """Load a delta file as sets: ``added``, ``changed``, ``removed`` and ``touched`` (added | changed)."""
+    with open(path, 'r', encoding='utf-8') as f:
+        delta = json.load(f)
+    sets = {key: set(delta.get(key, [])) for key in ('added', 'changed', 'removed')}
+    sets['touched'] = sets['added'] | sets['changed']
+    return sets
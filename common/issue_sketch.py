@@ -0,0 +1,381 @@
+"""Bounded-memory streaming summaries of issue rows.
+
+For issue streams too large to hold (every commit version, or journals that
+grow across runs), ``StreamingAggregate`` consumes rows in ``ISSUE_COLUMNS``
+order one at a time and keeps, per group, an exact issue total and severity
+``Counter`` plus two sketches:
+
+* ``SpaceSaving`` (Metwally et al.) for the top rules: ``capacity`` counters.
+  Each reported count overestimates the true count by at most its recorded
+  error, which is at most N / capacity for a group of N issues. Every rule
+  occurring more than N / capacity times is reported.
+* ``HyperLogLog`` for distinct files and conversations: 2**precision
+  one-byte registers, with a relative standard error of about
+  1.04 / sqrt(2**precision). That is 1.6% at the default precision 12, for
+  4 KiB per counter. Small cardinalities use linear counting and are
+  nearly exact.
+
+Both sketches answer like the exact structures they replace (``most_common``
+like a ``Counter``, ``len`` like a ``set``), so the ``common.issue_summary``
+row helpers work on them unchanged. ``exact=True`` swaps in ``Counter`` and
+``set``: exact results, still streamed, memory no longer bounded.
+
+``stream_batches`` reads a raw linter output one record at a time, from a
+lint journal (``.ndjson``), through a fresh ``common.json_artifact``
+sidecar, or else by scanning the JSON itself with
+``common.snapshot_reader``, and yields the ingester rows for each record.
+The whole document is never loaded. ``streaming_source`` picks the file a
+script's ``--streaming [PATH]`` option points to.
+"""
+import hashlib
+import heapq
+import itertools
+import json
+import math
+import os
+from collections import Counter
+
+from common.issue_store import DEFAULT_STAGES, INGESTERS, ISSUE_COLUMNS
+from common.json_artifact import open_cached_artifact
+from common.lint_journal import read_journal
+from common.snapshot_reader import iter_json_entries, iter_nested_entries
+
+DEFAULT_TOP_K_CAPACITY = 200
+DEFAULT_PRECISION = 12
+
+_SEVERITY, _RULE, _SNIPPET, _CONVERSATION = (ISSUE_COLUMNS.index(name) for name in
+                                             ('severity', 'rule', 'snippet_id', 'conversation'))
+
+
+# === Sketches ===
+
+class SpaceSaving:
+    """Heavy hitters in ``capacity`` counters; ``most_common`` mirrors ``Counter.most_common``."""
+
+    def __init__(self, capacity=DEFAULT_TOP_K_CAPACITY):
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        self.total = 0
+        self.exact = True  # Until the first eviction
+        self._heap = []  # (count, order, item); stale entries are skipped when popped
+        self._order = itertools.count()
+
+    def __getitem__(self, item):
+        return self.counts.get(item, 0)
+
+    def __len__(self):
+        return len(self.counts)
+
+    def add(self, item, count=1):
+        self.total += count
+        if item in self.counts:
+            self.counts[item] += count
+        elif len(self.counts) < self.capacity:
+            self.counts[item] = count
+            self.errors[item] = 0
+        else:
+            # The new item takes over the smallest counter and inherits its count as error
+            smallest, evicted = self._pop_smallest()
+            self.exact = False
+            del self.counts[evicted], self.errors[evicted]
+            self.counts[item] = smallest + count
+            self.errors[item] = smallest
+        heapq.heappush(self._heap, (self.counts[item], next(self._order), item))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(count, next(self._order), item) for item, count in self.counts.items()]
+            heapq.heapify(self._heap)
+
+    def _pop_smallest(self):
+        while True:
+            count, _, item = heapq.heappop(self._heap)
+            if self.counts.get(item) == count:
+                return count, item
+
+    def update(self, counts):
+        for item, count in counts.items():
+            self.add(item, count)
+
+    def merge(self, other):
+        """Fold in another summary (Agarwal et al.), keeping the largest ``capacity`` counters.
+
+        An item only one side monitors may still have occurred on the other
+        side up to that side's minimum count, so that minimum is added to its
+        count and error.
+        """
+        floor, other_floor = self.error_bound(), other.error_bound()
+        counts, errors = {}, {}
+        for item in itertools.chain(self.counts, (item for item in other.counts if item not in self.counts)):
+            mine, theirs = item in self.counts, item in other.counts
+            counts[item] = (self.counts[item] if mine else floor) + (other.counts[item] if theirs else other_floor)
+            errors[item] = (self.errors[item] if mine else floor) + (other.errors[item] if theirs else other_floor)
+        kept = Counter(counts).most_common(self.capacity)
+        self.exact = self.exact and other.exact and len(counts) <= self.capacity
+        self.counts = dict(kept)
+        self.errors = {item: errors[item] for item, _ in kept}
+        self.total += other.total
+        self._heap = [(count, next(self._order), item) for item, count in self.counts.items()]
+        heapq.heapify(self._heap)
+        return self
+
+    def most_common(self, n=None):
+        return Counter(self.counts).most_common(n)
+
+    def error_bound(self):
+        """Most a reported count can overshoot, and most an unreported rule can occur (at most total / capacity)."""
+        return 0 if self.exact else min(self.counts.values())
+
+    def guaranteed(self, n):
+        """True if the reported top ``n`` are the true top ``n``: their lower bounds beat every other count."""
+        if self.exact:
+            return True
+        ranked = self.most_common()
+        rest = ranked[n][1] if len(ranked) > n else 0
+        return min(count - self.errors[item] for item, count in ranked[:n]) >= max(rest, self.error_bound())
+
+
+class HyperLogLog:
+    """Distinct count of strings in ``2**precision`` registers; ``len`` gives the estimate."""
+
+    def __init__(self, precision=DEFAULT_PRECISION):
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+        self._last = None
+
+    def add(self, item):
+        if item == self._last:
+            return  # Issues of one file arrive together; skip re-hashing it
+        self._last = item
+        value = int.from_bytes(hashlib.blake2b(item.encode('utf-8'), digest_size=8).digest(), 'big')
+        index = value >> (64 - self.precision)
+        rest = value & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, items):
+        for item in items:
+            self.add(item)
+
+    def merge(self, other):
+        if other.precision != self.precision:
+            raise ValueError("HyperLogLog precisions differ")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    def estimate(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / sum(2.0 ** -rank for rank in self.registers)
+        empty = self.registers.count(0)
+        if raw <= 2.5 * m and empty:
+            return m * math.log(m / empty)  # Linear counting for small cardinalities
+        return raw
+
+    def __len__(self):
+        return int(round(self.estimate()))
+
+    def relative_error(self):
+        return 1.04 / math.sqrt(len(self.registers))
+
+
+class ExactSet(set):
+    def merge(self, other):
+        self |= other
+        return self
+
+
+class ExactCounter(Counter):
+    def add(self, item, count=1):
+        self[item] += count
+
+    def merge(self, other):
+        self.update(other)
+        return self
+
+    def error_bound(self):
+        return 0
+
+    def guaranteed(self, n):
+        return True
+
+
+# === Streaming aggregate ===
+
+class SketchSummary:
+    """Same fields as ``common.issue_summary.IssueSummary``, with sketches for files, conversations and rules."""
+
+    __slots__ = ('total', 'files', 'conversations', 'severities', 'rules')
+
+    def __init__(self, exact=False, capacity=DEFAULT_TOP_K_CAPACITY, precision=DEFAULT_PRECISION):
+        self.total = 0
+        self.severities = Counter()
+        if exact:
+            self.files, self.conversations, self.rules = ExactSet(), ExactSet(), ExactCounter()
+        else:
+            self.files, self.conversations = HyperLogLog(precision), HyperLogLog(precision)
+            self.rules = SpaceSaving(capacity)
+
+    def add(self, row):
+        self.total += 1
+        self.severities[row[_SEVERITY]] += 1
+        self.files.add(row[_SNIPPET])
+        self.conversations.add(row[_CONVERSATION])
+        self.rules.add(row[_RULE])
+
+    def merge(self, other):
+        self.total += other.total
+        self.severities.update(other.severities)
+        self.files.merge(other.files)
+        self.conversations.merge(other.conversations)
+        self.rules.merge(other.rules)
+
+
+def _grouper(by):
+    """Row -> group key for a column name, a tuple of names (or ``()``) or a callable on the row."""
+    if callable(by):
+        return by
+    if isinstance(by, str):
+        position = ISSUE_COLUMNS.index(by)
+        return lambda row: row[position]
+    positions = [ISSUE_COLUMNS.index(name) for name in by]
+    return lambda row: tuple(row[p] for p in positions)
+
+
+class StreamingAggregate:
+    """Per-group and overall ``SketchSummary`` of a row stream, grouped ``by`` one fixed grouping."""
+
+    def __init__(self, by='category', exact=False, capacity=DEFAULT_TOP_K_CAPACITY, precision=DEFAULT_PRECISION):
+        self.by = by
+        self.exact = exact
+        self._group = _grouper(by)
+        self._new = lambda: SketchSummary(exact, capacity, precision)
+        self.groups = {}
+        self.all = self._new()
+
+    def add(self, row):
+        group = self._group(row)
+        if group is None:
+            return
+        summary = self.groups.get(group)
+        if summary is None:
+            summary = self.groups[group] = self._new()
+        summary.add(row)
+        self.all.add(row)
+
+    def update(self, rows):
+        for row in rows:
+            self.add(row)
+
+    def merge(self, other):
+        for group, summary in other.groups.items():
+            if group not in self.groups:
+                self.groups[group] = self._new()
+            self.groups[group].merge(summary)
+        self.all.merge(other.all)
+        return self
+
+    def summarize(self, by=None):
+        """``{group: SketchSummary}``; only the grouping given at construction is available."""
+        if by is not None and by != self.by:
+            raise ValueError(f"streaming aggregate is grouped by {self.by!r}, not {by!r}")
+        return self.groups
+
+    def overall(self):
+        return self.all
+
+    def error_note(self):
+        """One line stating the error bounds of the current results."""
+        if self.exact:
+            return "exact counts"
+        rules = self.all.rules
+        return (f"distinct files/conversations ±{self.all.files.relative_error():.1%} (1σ); "
+                f"rule counts overestimated by at most {rules.error_bound()}"
+                f"{'' if rules.guaranteed(5) else ' (top 5 order not guaranteed)'}")
+
+
+class CountHistogram:
+    """Mean, median and max of many small integers (e.g. issues per snippet) in O(distinct values) memory."""
+
+    def __init__(self):
+        self.counts = Counter()
+
+    def add(self, value):
+        self.counts[value] += 1
+
+    def __len__(self):
+        return sum(self.counts.values())
+
+    def total(self):
+        return sum(value * count for value, count in self.counts.items())
+
+    def mean(self):
+        return self.total() / len(self) if self.counts else float('nan')
+
+    def max(self):
+        return max(self.counts)
+
+    def _value_at(self, index):
+        seen = 0
+        for value in sorted(self.counts):
+            seen += self.counts[value]
+            if seen > index:
+                return value
+
+    def median(self):
+        """Same value as ``numpy.median`` over the expanded values."""
+        n = len(self)
+        if not n:
+            return float('nan')
+        return (self._value_at((n - 1) // 2) + self._value_at(n // 2)) / 2
+
+
+# === Row sources ===
+
+def stream_batches(source):
+    """Yield ``(issue_rows, snippet_rows)`` per record of a ``common.issue_store`` source dict.
+
+    ``.ndjson`` sources are lint journals (PylintBatch, step3), read one line
+    at a time. JSON sources are decoded one top-level entry at a time, from
+    the ``common.json_artifact`` sidecar when it is fresh, else straight from
+    the file (a stale sidecar is not rebuilt, as that would parse it whole).
+    Bandit reports are always scanned, one result and one metrics entry at a
+    time, since their sidecar holds the whole results list as one entry.
+    """
+    ingest = INGESTERS[source['kind']]
+    categories = None
+    if source.get('categories'):
+        with open(source['categories'], 'r', encoding='utf-8') as f:
+            categories = json.load(f)
+    stage = source.get('stage') or DEFAULT_STAGES[source['kind']]
+    if os.path.splitext(source['path'])[1] == '.ndjson':
+        for key, value in read_journal(source['path']):
+            if value is None:
+                continue  # Skipped item
+            yield ingest(value if source['kind'] == 'pylint' else {key: value}, categories, stage)
+        return
+    if source['kind'] == 'bandit':
+        for key, entry, value in iter_nested_entries(source['path'], ('results', 'metrics')):
+            yield ingest({'results': [value]} if key == 'results' else {'metrics': {entry: value}}, categories, stage)
+        return
+    view = open_cached_artifact(source['path'])
+    if view is None:
+        entries = iter_json_entries(source['path'])
+    else:
+        entries = enumerate(view) if source['kind'] == 'pylint' else view.items()
+    for key, value in entries:
+        yield ingest([value] if source['kind'] == 'pylint' else {key: value}, categories, stage)
+
+
+def stream_rows(source):
+    for issue_rows, _ in stream_batches(source):
+        yield from issue_rows
+
+
+def streaming_source(argv, default):
+    """Path given after ``--streaming`` in ``argv`` (e.g. a lint journal), else ``default``."""
+    if '--streaming' in argv:
+        following = argv[argv.index('--streaming') + 1:]
+        if following and not following[0].startswith('--'):
+            return following[0]
+    return default
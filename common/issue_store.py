@@ -0,0 +1,319 @@
+"""Columnar, dictionary-encoded issue table for every linter output.
+
+``pylint_output.json``, the Flake8 ``{file: [issues]}`` dict, the Bandit
+report and step3's ``linter_analysis_results.json`` are normalized into one
+issue table with the columns in ``ISSUE_COLUMNS``, plus a snippet table
+(``SNIPPET_COLUMNS``) listing every linted snippet, including clean ones, so
+per-snippet statistics keep their zeros.
+
+On disk each string column stores its distinct values once and one unsigned
+integer code per row (``array`` typecode B/H/I, picked by dictionary size);
+every column is zlib-compressed separately. The store records the size and
+mtime of the raw files it was built from: ``open_issues`` loads it without
+touching the JSON while those are unchanged and rebuilds it otherwise.
+Queries (``where``, ``counts``, ``most_common``, ``distinct``) run on the
+integer codes, and filters are evaluated once per distinct value.
+"""
+import json
+import os
+import struct
+import sys
+import zlib
+from array import array
+from collections import Counter
+
+from common.snippet_store import snippet_id
+from common.snippet_paths import conversation_of
+
+STORE_VERSION = 2
+MAGIC = b'ISSUES\x01\n'
+ISSUE_COLUMNS = ['tool', 'rule', 'category', 'severity', 'snippet_id', 'conversation', 'line', 'language', 'stage']
+SNIPPET_COLUMNS = ['tool', 'snippet_id', 'conversation', 'language', 'stage']
+INTEGER_COLUMNS = {'line'}
+DEFAULT_STAGES = {'pylint': 'generated', 'flake8': 'generated', 'bandit': 'generated', 'linter_results': 'fetched'}
+PYLINT_SEVERITY = {'C': 'convention', 'R': 'refactor', 'W': 'warning', 'E': 'error', 'F': 'fatal', 'I': 'info'}
+LANGUAGES = {'.py': 'python', '.js': 'javascript'}
+
+
+def flake8_category(code):
+    """Prefix-based category of a Flake8 code (plugins included)."""
+    if code.startswith(('E', 'W', 'N')):
+        return 'Code Style'
+    elif code.startswith('F'):
+        return 'Potential Bug'
+    elif code.startswith('C'):
+        return 'Code Smell'
+    elif code.startswith('B'):
+        return 'Potential Bug'
+    elif code.startswith('S'):
+        return 'Code Vulnerability'
+    else:
+        return 'Uncategorized'
+
+
+def language_of(path):
+    return LANGUAGES.get(os.path.splitext(path.lower())[1], '')
+
+
+def _snippet_row(tool, path, stage):
+    return (tool, snippet_id(path), conversation_of(path), language_of(path), stage)
+
+
+def _issue_row(tool, rule, category, severity, path, line, stage):
+    return (tool, rule or '', category, severity or '', snippet_id(path), conversation_of(path), line or 0,
+            language_of(path), stage)
+
+
+# === Ingesters: raw linter document -> (issue rows, snippet rows) ===
+
+def pylint_rows(results, categories=None, stage='generated'):
+    """``pylint_output.json``; Pylint only lists files with issues, so no snippet rows."""
+    categories = categories or {}
+    issues = []
+    for issue in results:
+        code = issue.get('message-id') or ''
+        issues.append(_issue_row('pylint', code, categories.get(code, {}).get('category', 'Uncategorized'),
+                                 issue.get('type') or PYLINT_SEVERITY.get(code[:1]), issue.get('path', ''),
+                                 issue.get('line'), stage))
+    return issues, []
+
+
+def flake8_rows(results, categories=None, stage='generated'):
+    issues, snippets = [], []
+    for file_path, file_issues in results.items():
+        snippets.append(_snippet_row('flake8', file_path, stage))
+        for issue in file_issues:
+            code = issue.get('code') or ''
+            issues.append(_issue_row('flake8', code, flake8_category(code), None, file_path,
+                                     issue.get('line_number'), stage))
+    return issues, snippets
+
+
+def bandit_rows(report, categories=None, stage='generated'):
+    categories = categories or {}
+    issues = []
+    for issue in report.get('results', []):
+        rule = issue.get('test_id') or ''
+        issues.append(_issue_row('bandit', rule, categories.get(rule, {}).get('category', 'Code Vulnerability'),
+                                 issue.get('issue_severity', 'Undefined'), issue.get('filename', ''),
+                                 issue.get('line_number'), stage))
+    snippets = [_snippet_row('bandit', filename, stage) for filename in report.get('metrics', {}) if filename != '_totals']
+    return issues, snippets
+
+
+def linter_results_rows(results, categories=None, stage='fetched'):
+    """step3's ``linter_analysis_results.json``: Pylint for ``.py`` keys, ESLint for ``.js`` keys."""
+    categories = categories or {}
+    issues, snippets = [], []
+    for snippet_path, entry in results.items():
+        tool = 'pylint' if snippet_path.endswith('.py') else 'eslint' if snippet_path.endswith('.js') else ''
+        snippets.append(_snippet_row(tool, snippet_path, stage))
+        for issue in entry["linter_results"]["fetched_issues"]:
+            code = issue.get('code') or ''
+            severity = PYLINT_SEVERITY.get(code[:1]) if tool == 'pylint' else None
+            issues.append(_issue_row(tool, code, categories.get(code, {}).get('category', 'Uncategorized'),
+                                     severity, snippet_path, issue.get('line'), stage))
+    return issues, snippets
+
+
+INGESTERS = {'pylint': pylint_rows, 'flake8': flake8_rows, 'bandit': bandit_rows,
+             'linter_results': linter_results_rows}
+
+
+# === In-memory table ===
+
+def _typecode(size):
+    return 'B' if size <= 0xFF else 'H' if size <= 0xFFFF else 'I'
+
+
+class IssueTable:
+    """Dictionary-encoded columns: ``codes[name]`` indexes into ``values[name]`` (raw ints for ``line``)."""
+
+    def __init__(self, columns, values, codes):
+        self.columns = columns
+        self.values = values
+        self.codes = codes
+
+    @classmethod
+    def from_rows(cls, columns, rows):
+        values, codes = {}, {}
+        for j, name in enumerate(columns):
+            if name in INTEGER_COLUMNS:
+                values[name], codes[name] = None, array('i', (row[j] for row in rows))
+                continue
+            index = {}
+            column = [index.setdefault(row[j], len(index)) for row in rows]
+            values[name], codes[name] = list(index), array(_typecode(len(index)), column)
+        return cls(columns, values, codes)
+
+    def __len__(self):
+        return len(self.codes[self.columns[0]])
+
+    def _matching(self, name, condition):
+        """Codes of ``name`` whose value satisfies ``condition`` (value, collection or predicate)."""
+        if callable(condition):
+            test = condition
+        elif isinstance(condition, (list, tuple, set, frozenset)):
+            test = condition.__contains__
+        else:
+            test = condition.__eq__
+        return {code for code, value in enumerate(self.values[name]) if test(value)}
+
+    def where(self, **conditions):
+        """Rows matching every ``column=condition``; conditions are tested once per distinct value."""
+        rows = range(len(self))
+        for name, condition in conditions.items():
+            codes = self.codes[name]
+            if name in INTEGER_COLUMNS:
+                test = condition if callable(condition) else condition.__eq__
+                rows = [i for i in rows if test(codes[i])]
+            else:
+                wanted = self._matching(name, condition)
+                rows = [i for i in rows if codes[i] in wanted]
+        return IssueTable(self.columns, self.values,
+                          {name: array(codes.typecode, (codes[i] for i in rows)) for name, codes in self.codes.items()})
+
+    def column(self, name):
+        codes = self.codes[name]
+        if name in INTEGER_COLUMNS:
+            return list(codes)
+        values = self.values[name]
+        return [values[code] for code in codes]
+
+    def counts(self, name):
+        """``{value: rows}`` in first-seen order, like incrementing a ``Counter`` row by row."""
+        if name in INTEGER_COLUMNS:
+            return dict(Counter(self.codes[name]))
+        values = self.values[name]
+        return {values[code]: count for code, count in Counter(self.codes[name]).items()}
+
+    def most_common(self, name, n=None):
+        """Same order as ``Counter.most_common`` over the rows (ties keep first-seen order)."""
+        return Counter(self.counts(name)).most_common(n)
+
+    def distinct(self, name):
+        return set(self.counts(name))
+
+    def group_counts(self, by, name):
+        """``{by value: Counter of name values}``, both in first-seen order."""
+        groups = {}
+        by_values, values = self.values[by], self.values[name]
+        for by_code, code in zip(self.codes[by], self.codes[name]):
+            groups.setdefault(by_code, Counter())[code] += 1
+        return {by_values[b]: Counter({values[c]: n for c, n in counter.items()}) for b, counter in groups.items()}
+
+    def group_distinct(self, by, name):
+        """``{by value: number of distinct name values}`` in first-seen order."""
+        return {key: len(counter) for key, counter in self.group_counts(by, name).items()}
+
+
+class IssueStore:
+    """The issue table and the linted-snippet table of one store file."""
+
+    def __init__(self, issues, snippets, sources=None):
+        self.issues = issues
+        self.snippets = snippets
+        self.sources = sources or []
+
+    def issues_per_snippet(self, **conditions):
+        """Issue count of every snippet row matching ``conditions``, zeros included."""
+        snippets = self.snippets.where(**conditions)
+        issues = self.issues.where(**conditions)
+        counts = Counter(zip(issues.column('stage'), issues.column('snippet_id')))
+        return [counts[key] for key in zip(snippets.column('stage'), snippets.column('snippet_id'))]
+
+
+# === Building, saving and loading ===
+
+def _fingerprint(path):
+    if not path:
+        return None
+    stat = os.stat(path)
+    return [os.path.abspath(path), stat.st_size, stat.st_mtime_ns]
+
+
+def source_fingerprint(sources):
+    return [[source['kind'], _fingerprint(source['path']), _fingerprint(source.get('categories')),
+             source.get('stage') or DEFAULT_STAGES[source['kind']]] for source in sources]
+
+
+def build_store(sources):
+    """Ingest each ``{'kind', 'path', 'categories'?, 'stage'?}`` source into one store."""
+    issue_rows, snippet_rows = [], []
+    for source in sources:
+        with open(source['path'], 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        categories = None
+        if source.get('categories'):
+            with open(source['categories'], 'r', encoding='utf-8') as f:
+                categories = json.load(f)
+        issues, snippets = INGESTERS[source['kind']](data, categories,
+                                                     source.get('stage') or DEFAULT_STAGES[source['kind']])
+        issue_rows.extend(issues)
+        snippet_rows.extend(snippets)
+    return IssueStore(IssueTable.from_rows(ISSUE_COLUMNS, issue_rows),
+                      IssueTable.from_rows(SNIPPET_COLUMNS, snippet_rows), source_fingerprint(sources))
+
+
+def save_store(store, path):
+    blobs, header = [], {'version': STORE_VERSION, 'byteorder': sys.byteorder, 'sources': store.sources, 'tables': {}}
+    for table_name, table in (('issues', store.issues), ('snippets', store.snippets)):
+        columns = {}
+        for name in table.columns:
+            blob = zlib.compress(table.codes[name].tobytes())
+            columns[name] = {'typecode': table.codes[name].typecode, 'values': table.values[name], 'length': len(blob)}
+            blobs.append(blob)
+        header['tables'][table_name] = {'columns': table.columns, 'data': columns}
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    head = zlib.compress(json.dumps(header).encode('utf-8'))
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<Q', len(head)))
+        f.write(head)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp_path, path)
+
+
+def load_store(path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    if not data.startswith(MAGIC):
+        raise ValueError(f"{path} is not an issue store")
+    (head_length,) = struct.unpack_from('<Q', data, len(MAGIC))
+    offset = len(MAGIC) + 8
+    header = json.loads(zlib.decompress(data[offset:offset + head_length]))
+    if header['version'] != STORE_VERSION:
+        raise ValueError(f"{path} has store version {header['version']}, expected {STORE_VERSION}")
+    offset += head_length
+
+    tables = {}
+    for table_name in ('issues', 'snippets'):
+        spec = header['tables'][table_name]
+        values, codes = {}, {}
+        for name in spec['columns']:
+            column = spec['data'][name]
+            codes[name] = array(column['typecode'])
+            codes[name].frombytes(zlib.decompress(data[offset:offset + column['length']]))
+            if header['byteorder'] != sys.byteorder:
+                codes[name].byteswap()
+            values[name] = column['values']
+            offset += column['length']
+        tables[table_name] = IssueTable(spec['columns'], values, codes)
+    return IssueStore(tables['issues'], tables['snippets'], header['sources'])
+
+
+def open_issues(path, sources):
+    """Load the store at ``path``, (re)building it from ``sources`` when missing or stale."""
+    if os.path.exists(path):
+        try:
+            store = load_store(path)
+            if store.sources == source_fingerprint(sources):
+                return store
+        except (ValueError, KeyError, zlib.error, struct.error):
+            pass
+    store = build_store(sources)
+    save_store(store, path)
+    return store
@@ -0,0 +1,304 @@
+"""One-pass aggregation of normalized issues, re-grouped on demand.
+
+``IssueAggregate.from_table`` reads an ``IssueTable`` (any mix of linters)
+once: the code columns are zipped and counted in C, and every distinct
+``(tool, category, severity, rule)`` cell keeps its issue count per snippet;
+each snippet's conversation is kept once. ``summarize(by)`` rolls the cells
+up to any grouping of those columns (per category, per severity, per tool
+and category, ...) with totals, distinct files and conversations, a
+severity breakdown and a rule ``Counter``; a roll-up only touches the cells,
+so re-summarizing costs milliseconds and is cached per grouping.
+
+Because cells count issues per snippet, aggregates are exact and mergeable
+both ways: ``merge`` folds in a new batch, ``subtract`` takes a batch back
+out and ``discard_snippets`` drops snippets, all without the old raw data.
+``save_aggregate`` / ``load_aggregate`` persist an aggregate with the list
+of batches folded into it, and ``aggregate_differences`` checks an
+incrementally maintained aggregate against a full recompute.
+
+Cells, groups and rules keep first-seen order, so ``Counter.most_common``
+breaks ties exactly as counting the raw issues one by one did (after a
+subtraction, tied rules may list in a different order than a recompute).
+The ``*_rows`` helpers turn summaries into the rows of the existing RQ1 CSVs.
+"""
+import csv
+import json
+import os
+from collections import Counter
+
+from common.issue_store import DEFAULT_STAGES, INGESTERS, ISSUE_COLUMNS, IssueTable, source_fingerprint
+
+AGGREGATE_VERSION = 1
+
+CELL_COLUMNS = ('tool', 'category', 'severity', 'rule')
+CATEGORIES = ['Code Style', 'Code Smell', 'Potential Bug', 'Code Vulnerability', 'Uncategorized']
+BANDIT_SEVERITIES = ['HIGH', 'MEDIUM', 'LOW', 'UNDEFINED']
+
+
+class IssueSummary:
+    """Totals of one group: issues, distinct files and conversations, severities and rules."""
+
+    __slots__ = ('total', 'files', 'conversations', 'severities', 'rules')
+
+    def __init__(self):
+        self.total = 0
+        self.files = set()
+        self.conversations = set()
+        self.severities = Counter()
+        self.rules = Counter()
+
+    def add(self, severity, rule, snippets):
+        count = sum(snippets.values())
+        self.total += count
+        self.files.update(snippets)
+        self.severities[severity] += count
+        self.rules[rule] += count
+
+
+EMPTY_SUMMARY = IssueSummary()
+
+
+def _grouping(by):
+    return (by,) if isinstance(by, str) else tuple(by)
+
+
+class IssueAggregate:
+    """``cells[(tool, category, severity, rule)] = Counter({snippet id: issues})``.
+
+    ``conversations`` maps every snippet id to its conversation and
+    ``batches`` lists what was merged in or subtracted, in order.
+    """
+
+    def __init__(self, cells=None, conversations=None, batches=None):
+        self.cells = cells if cells is not None else {}
+        self.conversations = conversations if conversations is not None else {}
+        self.batches = batches if batches is not None else []
+        self._rollups = {}
+
+    @classmethod
+    def from_table(cls, table):
+        names = CELL_COLUMNS + ('snippet_id',)
+        values = [table.values[name] for name in names]
+        cells = {}
+        for codes, count in Counter(zip(*(table.codes[name] for name in names))).items():
+            key = tuple(values[j][code] for j, code in enumerate(codes[:len(CELL_COLUMNS)]))
+            cell = cells.get(key)
+            if cell is None:
+                cell = cells[key] = Counter()
+            cell[values[-1][codes[-1]]] += count
+        snippets, conversations = table.values['snippet_id'], table.values['conversation']
+        return cls(cells, {snippets[s]: conversations[c]
+                           for s, c in zip(table.codes['snippet_id'], table.codes['conversation'])})
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Aggregate issue rows as produced by the ``common.issue_store`` ingesters."""
+        return cls.from_table(IssueTable.from_rows(ISSUE_COLUMNS, rows))
+
+    def merge(self, other):
+        """Add ``other``'s issues to this aggregate (cells new to it go last) and return self."""
+        for key, snippets in other.cells.items():
+            cell = self.cells.get(key)
+            if cell is None:
+                cell = self.cells[key] = Counter()
+            cell.update(snippets)
+        self.conversations.update(other.conversations)
+        self.batches.extend(other.batches)
+        self._rollups = {}
+        return self
+
+    def subtract(self, other):
+        """Take ``other``'s issues back out (e.g. a batch that was re-linted or removed) and return self."""
+        for key, snippets in other.cells.items():
+            cell = self.cells.get(key)
+            if cell is None:
+                continue
+            cell.subtract(snippets)
+            for snippet in [snippet for snippet, count in cell.items() if count <= 0]:
+                del cell[snippet]
+            if not cell:
+                del self.cells[key]
+        self._forget_unused_snippets()
+        self._rollups = {}
+        return self
+
+    def discard_snippets(self, snippet_ids):
+        """Drop every issue of the given snippets and return self."""
+        snippet_ids = set(snippet_ids)
+        for key in list(self.cells):
+            cell = self.cells[key]
+            for snippet in snippet_ids.intersection(cell):
+                del cell[snippet]
+            if not cell:
+                del self.cells[key]
+        self._forget_unused_snippets()
+        self._rollups = {}
+        return self
+
+    def _forget_unused_snippets(self):
+        used = set().union(*self.cells.values())
+        self.conversations = {snippet: conversation for snippet, conversation in self.conversations.items()
+                              if snippet in used}
+
+    def select(self, **conditions):
+        """A new aggregate with the cells whose columns equal the given values (e.g. ``tool='bandit'``)."""
+        positions = {CELL_COLUMNS.index(name): value for name, value in conditions.items()}
+        cells = {key: Counter(snippets) for key, snippets in self.cells.items()
+                 if all(key[p] == value for p, value in positions.items())}
+        used = set().union(*cells.values())
+        return IssueAggregate(cells, {snippet: conversation for snippet, conversation in self.conversations.items()
+                                      if snippet in used}, list(self.batches))
+
+    def summarize(self, by='category'):
+        """``{group: IssueSummary}`` in first-seen order; a group is a value, or a tuple for several columns."""
+        by = _grouping(by)
+        if by not in self._rollups:
+            positions = [CELL_COLUMNS.index(name) for name in by]
+            groups = {}
+            for key, snippets in self.cells.items():
+                group = tuple(key[p] for p in positions)
+                summary = groups.get(group)
+                if summary is None:
+                    summary = groups[group] = IssueSummary()
+                summary.add(key[2], key[3], snippets)
+            for summary in groups.values():
+                summary.conversations = {self.conversations[snippet] for snippet in summary.files}
+            if len(by) == 1:
+                groups = {group[0]: summary for group, summary in groups.items()}
+            self._rollups[by] = groups
+        return self._rollups[by]
+
+    def overall(self):
+        return self.summarize(()).get((), EMPTY_SUMMARY)
+
+
+# === Batches, persistence and checks ===
+
+def batch_record(op, source):
+    """Entry of ``IssueAggregate.batches``: what was done with which source file, as it was then."""
+    return {'op': op, 'kind': source['kind'], 'path': source['path'], 'source': source_fingerprint([source])[0]}
+
+
+def aggregate_source(source, snippet_index=None):
+    """Aggregate one raw linter output (a ``common.issue_store`` source dict) on its own.
+
+    With a ``SnippetIndex`` only issues of listed snippets are kept, as
+    PylintExec does with ``successful_python_snippets.txt``.
+    """
+    with open(source['path'], 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    categories = None
+    if source.get('categories'):
+        with open(source['categories'], 'r', encoding='utf-8') as f:
+            categories = json.load(f)
+    rows, _ = INGESTERS[source['kind']](data, categories, source.get('stage') or DEFAULT_STAGES[source['kind']])
+    table = IssueTable.from_rows(ISSUE_COLUMNS, rows)
+    if snippet_index is not None:
+        table = table.where(snippet_id=snippet_index.__contains__)
+    aggregate = IssueAggregate.from_table(table)
+    aggregate.batches.append(batch_record('add', source))
+    return aggregate
+
+
+def save_aggregate(aggregate, path):
+    """Write ``aggregate`` as JSON; snippet ids are stored once and cells refer to them by position."""
+    snippets = list(aggregate.conversations)
+    position = {snippet: i for i, snippet in enumerate(snippets)}
+    cells = []
+    for key, counts in aggregate.cells.items():
+        cells.append(list(key) + [[n for snippet, count in counts.items() for n in (position[snippet], count)]])
+    document = {'version': AGGREGATE_VERSION, 'batches': aggregate.batches, 'snippets': snippets,
+                'conversations': [aggregate.conversations[snippet] for snippet in snippets], 'cells': cells}
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(document, f)
+    os.replace(tmp_path, path)
+
+
+def load_aggregate(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        document = json.load(f)
+    if document.get('version') != AGGREGATE_VERSION:
+        raise ValueError(f"{path} has aggregate version {document.get('version')}, expected {AGGREGATE_VERSION}")
+    snippets = document['snippets']
+    cells = {}
+    for cell in document['cells']:
+        counts = cell[len(CELL_COLUMNS)]
+        cells[tuple(cell[:len(CELL_COLUMNS)])] = Counter({snippets[counts[i]]: counts[i + 1]
+                                                           for i in range(0, len(counts), 2)})
+    return IssueAggregate(cells, dict(zip(snippets, document['conversations'])), document['batches'])
+
+
+def aggregate_differences(aggregate, expected):
+    """Cells, snippets and conversations on which ``aggregate`` disagrees with ``expected`` (empty if none)."""
+    differences = []
+    for key in list(aggregate.cells) + [key for key in expected.cells if key not in aggregate.cells]:
+        got, want = aggregate.cells.get(key, Counter()), expected.cells.get(key, Counter())
+        if got != want:
+            changed = sorted(snippet for snippet in set(got) | set(want) if got[snippet] != want[snippet])
+            differences.append(f"{'/'.join(key)}: {sum(got.values())} issues, expected {sum(want.values())} "
+                               f"({len(changed)} snippets differ, e.g. {changed[0]})")
+    for snippet in sorted(set(aggregate.conversations) | set(expected.conversations)):
+        got, want = aggregate.conversations.get(snippet), expected.conversations.get(snippet)
+        if got != want:
+            differences.append(f"{snippet}: conversation {got}, expected {want}")
+    return differences
+
+
+# === Rows of the existing CSVs ===
+
+def top_rules_text(summary, n=3):
+    return ', '.join(f"{rule} ({count})" for rule, count in summary.rules.most_common(n))
+
+
+def category_rows(aggregate, categories=CATEGORIES, top=3, files=True):
+    """Per-category rows of ``pylint_analysis_summary.csv`` (PylintExec) and ``flake8_analysis_summary.csv``."""
+    by_category = aggregate.summarize('category')
+    rows = []
+    for category in categories:
+        summary = by_category.get(category, EMPTY_SUMMARY)
+        row = {'Category': category, 'Total Issues': summary.total,
+               'Conversations Affected': len(summary.conversations)}
+        if files:
+            row['Files Affected'] = len(summary.files)
+        row['Top Rules'] = top_rules_text(summary, top)
+        rows.append(row)
+    return rows
+
+
+def severity_rows(aggregate, severities=BANDIT_SEVERITIES):
+    """Rows of ``bandit_severity_summary.csv``; severities without issues are left out."""
+    by_severity = aggregate.summarize('severity')
+    return [{'Severity': severity, 'Total Issues': by_severity[severity].total,
+             'Files Affected': len(by_severity[severity].files),
+             'Conversations Affected': len(by_severity[severity].conversations)}
+            for severity in severities if severity in by_severity and by_severity[severity].total]
+
+
+def top_rule_rows(aggregate, rule_info, n=5):
+    """Rows of ``bandit_top5_issues.csv``: the ``n`` most frequent rules with their catalogue entry."""
+    return [{'Bandit Rule': rule, 'Occurrences': count,
+             'Severity': rule_info.get(rule, {}).get('default_severity', 'N/A'),
+             'Description': rule_info.get(rule, {}).get('description', 'No description')}
+            for rule, count in aggregate.overall().rules.most_common(n)]
+
+
+def write_rows(path, rows, fieldnames=None):
+    with open(path, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames or list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def write_category_totals(path, aggregate, top=5):
+    """``pylint_analysis_summary.csv`` as PylintAnalyze writes it: category totals, then the top rules."""
+    with open(path, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(['Category', 'Total Issues'])
+        for category, summary in aggregate.summarize('category').items():
+            writer.writerow([category, summary.total])
+        writer.writerow([])
+        writer.writerow([f'Top {top} Issues', 'Occurrences'])
+        for rule, count in aggregate.overall().rules.most_common(top):
+            writer.writerow([rule, count])
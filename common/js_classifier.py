@@ -0,0 +1,93 @@
+"""Python client for the long-lived JavaScript syntax workers (``RQ1/SyntaxJSWorker.js``).
+
+Each worker is a ``node`` process that speaks newline-delimited JSON over
+stdin/stdout, so Node start-up is paid once per worker instead of once per
+run or per snippet. ``JSWorkerPool`` splits items into batches and keeps one
+batch in flight per worker; results are returned in input order.
+"""
+import json
+import os
+import queue
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+NODE = os.environ.get('NODE', 'node')
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'RQ1', 'SyntaxJSWorker.js')
+DEFAULT_BATCH_SIZE = 200
+
+
+class JSWorker:
+    """One ``node SyntaxJSWorker.js`` process; ``check`` sends a batch and waits for its response."""
+
+    def __init__(self, node=NODE, script=WORKER_SCRIPT):
+        self._next_id = 0
+        self._proc = subprocess.Popen(
+            [node, script], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            text=True, encoding='utf-8', bufsize=1
+        )
+
+    def check(self, items):
+        """``items`` are ``{'path': ...}`` or ``{'content': ...}`` dicts; returns one facts dict per item."""
+        self._next_id += 1
+        self._proc.stdin.write(json.dumps({'id': self._next_id, 'items': items}) + '\n')
+        self._proc.stdin.flush()
+        line = self._proc.stdout.readline()
+        if not line:
+            raise RuntimeError(f"JavaScript worker exited with code {self._proc.poll()}")
+        response = json.loads(line)
+        if response.get('id') != self._next_id:
+            raise RuntimeError(f"JavaScript worker error: {response.get('error', 'out-of-order response')}")
+        return response['results']
+
+    def close(self):
+        if self._proc.poll() is None:
+            self._proc.stdin.close()
+            try:
+                self._proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self._proc.kill()
+
+
+class JSWorkerPool:
+    """Fan batches of JavaScript snippets out across ``workers`` Node processes."""
+
+    def __init__(self, workers=1, batch_size=DEFAULT_BATCH_SIZE, node=NODE):
+        self.batch_size = batch_size
+        self._workers = [JSWorker(node) for _ in range(max(1, workers))]
+        self._idle = queue.Queue()
+        for worker in self._workers:
+            self._idle.put(worker)
+        self._executor = ThreadPoolExecutor(max_workers=len(self._workers))
+
+    def _run_batch(self, batch):
+        worker = self._idle.get()
+        try:
+            return worker.check(batch)
+        finally:
+            self._idle.put(worker)
+
+    def check(self, items):
+        """Return facts (``syntax_ok``, ``has_function_or_class``, ``braces_balanced``, ``error``) in input order."""
+        items = list(items)
+        batches = [items[i:i + self.batch_size] for i in range(0, len(items), self.batch_size)]
+        results = []
+        for batch_results in self._executor.map(self._run_batch, batches):
+            results.extend(batch_results)
+        return results
+
+    def check_paths(self, paths):
+        return self.check([{'path': p} for p in paths])
+
+    def check_contents(self, contents):
+        return self.check([{'content': c} for c in contents])
+
+    def close(self):
+        self._executor.shutdown()
+        for worker in self._workers:
+            worker.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
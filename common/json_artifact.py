@@ -0,0 +1,234 @@
+"""Fast reloads of large pretty-printed JSON artifacts through a binary sidecar.
+
+``load_artifact(path)`` returns the same structure as ``json.load``. The
+first call parses the JSON and writes ``<path>.cache`` next to it; later
+calls read the sidecar instead. The sidecar stores the top-level dict
+entries (or list items) one by one, each ``marshal``-encoded and
+zlib-compressed, behind a header listing the keys and byte offsets.
+
+``open_artifact(path)`` maps the sidecar into memory and returns a lazy,
+read-only ``Mapping`` / ``Sequence`` that decodes an entry only when it is
+accessed, so listing keys or reading a few entries costs next to nothing.
+``open_cached_artifact(path)`` does the same but returns None instead of
+parsing the JSON when the sidecar is missing or stale.
+
+The sidecar records the size, mtime and SHA-256 of the JSON it was built
+from. It is rebuilt when the size or hash changes; a file that was only
+touched is hashed once and its sidecar kept. ``marshal`` is tied to the
+Python version, so the sidecar also records that and is rebuilt under
+another interpreter.
+"""
+import hashlib
+import json
+import marshal
+import mmap
+import os
+import struct
+import sys
+import zlib
+from collections.abc import Mapping, Sequence
+
+MAGIC = b'JSONART\x01\n'
+ARTIFACT_VERSION = 1
+SIDECAR_SUFFIX = '.cache'
+COMPRESSION_LEVEL = 1
+
+
+def sidecar_path(path):
+    return path + SIDECAR_SUFFIX
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _encode(value):
+    return zlib.compress(marshal.dumps(value), COMPRESSION_LEVEL)
+
+
+def _decode(blob):
+    return marshal.loads(zlib.decompress(blob))
+
+
+def _interpreter():
+    return [marshal.version, sys.version_info[0], sys.version_info[1]]
+
+
+def write_sidecar(data, path, source_path):
+    """Write ``data`` (as parsed from ``source_path``) to the sidecar file ``path``."""
+    stat = os.stat(source_path)
+    if isinstance(data, dict):
+        kind, keys, values = 'dict', list(data), data.values()
+    elif isinstance(data, list):
+        kind, keys, values = 'list', None, data
+    else:
+        kind, keys, values = 'value', None, [data]
+    blobs = [_encode(value) for value in values]
+    header = {'version': ARTIFACT_VERSION, 'interpreter': _interpreter(), 'kind': kind, 'keys': keys,
+              'lengths': [len(blob) for blob in blobs],
+              'source': {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': file_hash(source_path)}}
+    head = zlib.compress(json.dumps(header).encode('utf-8'))
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<Q', len(head)))
+        f.write(head)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp_path, path)
+
+
+def _read_header(data):
+    """Header and offset of the first entry; ValueError if ``data`` is not a sidecar."""
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError("not an artifact sidecar")
+    (head_length,) = struct.unpack_from('<Q', data, len(MAGIC))
+    start = len(MAGIC) + 8
+    header = json.loads(zlib.decompress(data[start:start + head_length]))
+    if header['version'] != ARTIFACT_VERSION or header['interpreter'] != _interpreter():
+        raise ValueError("sidecar written by another version")
+    return header, start + head_length
+
+
+def _is_fresh(header, source_path):
+    stat = os.stat(source_path)
+    source = header['source']
+    if stat.st_size != source['size']:
+        return False
+    return stat.st_mtime_ns == source['mtime_ns'] or file_hash(source_path) == source['sha256']
+
+
+class _Entries:
+    """Decodes entry ``i`` of a mapped sidecar on demand."""
+
+    def __init__(self, buffer, header, offset):
+        self.buffer = buffer
+        self.offsets = []
+        for length in header['lengths']:
+            self.offsets.append((offset, length))
+            offset += length
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __call__(self, i):
+        offset, length = self.offsets[i]
+        return _decode(self.buffer[offset:offset + length])
+
+
+class ArtifactDict(Mapping):
+    """Read-only, lazily decoded view of a top-level JSON object."""
+
+    def __init__(self, keys, entries):
+        self._keys = keys
+        self._position = {key: i for i, key in enumerate(keys)}
+        self._entries = entries
+
+    def __getitem__(self, key):
+        return self._entries(self._position[key])
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        return key in self._position
+
+    def items(self):
+        return ((key, self._entries(i)) for i, key in enumerate(self._keys))
+
+    def values(self):
+        return (self._entries(i) for i in range(len(self._keys)))
+
+
+class ArtifactList(Sequence):
+    """Read-only, lazily decoded view of a top-level JSON array."""
+
+    def __init__(self, entries):
+        self._entries = entries
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._entries(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self._entries(index)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def _open_sidecar(path, source_path):
+    """Memory-map a fresh sidecar and return ``(header, entries)``, or None if it is missing or stale."""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return None  # Empty file
+    try:
+        header, offset = _read_header(buffer)
+        if _is_fresh(header, source_path):
+            return header, _Entries(buffer, header, offset)
+    except (ValueError, KeyError, zlib.error, struct.error):
+        pass
+    # Unmap before the sidecar is replaced (Windows refuses to replace a mapped file)
+    buffer.close()
+    return None
+
+
+def _view(header, entries):
+    if header['kind'] == 'dict':
+        return ArtifactDict(header['keys'], entries)
+    if header['kind'] == 'list':
+        return ArtifactList(entries)
+    return entries(0)
+
+
+def _parse_and_cache(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    try:
+        write_sidecar(data, sidecar_path(path), path)
+    except OSError:
+        pass  # Read-only location: still return the parsed data
+    return data
+
+
+def open_artifact(path):
+    """Lazy view of the JSON at ``path``; the parsed JSON itself when the sidecar had to be (re)built."""
+    opened = _open_sidecar(sidecar_path(path), path)
+    if opened is None:
+        # The JSON had to be parsed anyway; the next call gets the view
+        return _parse_and_cache(path)
+    return _view(*opened)
+
+
+def open_cached_artifact(path):
+    """Lazy view of the JSON at ``path`` if its sidecar is fresh, else None (nothing is parsed)."""
+    opened = _open_sidecar(sidecar_path(path), path)
+    return None if opened is None else _view(*opened)
+
+
+def load_artifact(path):
+    """``json.load`` of ``path``, served from the sidecar when it is fresh."""
+    opened = _open_sidecar(sidecar_path(path), path)
+    if opened is None:
+        return _parse_and_cache(path)
+    header, entries = opened
+    values = [entries(i) for i in range(len(entries))]
+    entries.buffer.close()
+    if header['kind'] == 'dict':
+        return dict(zip(header['keys'], values))
+    if header['kind'] == 'list':
+        return values
+    return values[0]
@@ -0,0 +1,193 @@
+"""Persistent lint-result cache shared by every linting stage.
+
+Results are keyed by (normalized content hash, linter, linter version,
+effective config), so byte-identical code linted by PylintBatch.py, step3
+and step5 only runs the linter once. The config part holds whatever else
+changes the output: extra flags and a fingerprint of any config file the
+run picks up. Pylint keys also hold the module name (``cache_module``):
+files whose name cannot change pylint's output are linted under the neutral
+``NEUTRAL_MODULE`` and share one entry, the rest are keyed by their own name.
+Cached pylint issues are reported back under the requesting file's path and
+module (``localize_issues``). The SQLite file is shared safely by concurrent
+processes (WAL plus a busy timeout), trimmed to ``max_entries``
+least-recently-used entries, and counts hits/misses.
+"""
+import functools
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import subprocess
+import time
+
+from common.snippet_store import content_hash
+
+DEFAULT_CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Data', 'lint_cache.sqlite')
+DEFAULT_MAX_ENTRIES = 200000
+PYLINT_CONFIG_FILES = ('pylintrc', '.pylintrc', 'pyproject.toml', 'setup.cfg')
+ESLINT_CONFIG_FILES = ('eslint.config.mjs', 'eslint.config.js', '.eslintrc.json', '.eslintrc.js')
+
+# Module name cached code is linted under, so results do not depend on the snippet's file name
+NEUTRAL_MODULE = 'lint_cache_module'
+# pylint's default module-rgx (snake_case)
+_SNAKE_CASE_MODULE = re.compile(r'[^\W\dA-Z][^\WA-Z]*$')
+
+# Trim the table after this many writes instead of on every put
+_EVICT_EVERY = 1000
+
+
+@functools.lru_cache(maxsize=None)
+def linter_version(*cmd):
+    """Full ``--version`` output of a linter command (pylint's includes astroid and Python)."""
+    try:
+        result = subprocess.run(list(cmd) + ['--version'], capture_output=True, text=True, timeout=60)
+        return result.stdout.strip() or 'unknown'
+    except (OSError, subprocess.SubprocessError):
+        return 'unknown'
+
+
+def config_fingerprint(paths):
+    """Hash of the config files among ``paths`` that exist (missing ones count as absent)."""
+    digest = hashlib.sha256()
+    for path in paths:
+        if os.path.isfile(path):
+            with open(path, 'rb') as f:
+                digest.update(os.path.basename(path).encode('utf-8') + b'\0' + f.read() + b'\0')
+    return digest.hexdigest()
+
+
+def lint_key(content, linter, version, config):
+    payload = json.dumps([content_hash(content), linter, version, config], sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LintCache:
+    def __init__(self, path=DEFAULT_CACHE_FILE, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=60)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, linter TEXT, issues TEXT, last_used REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+        self._conn.commit()
+
+    def get(self, key):
+        """Cached issues for ``key``, or None."""
+        row = self._conn.execute("SELECT issues FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._conn.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+        self._conn.commit()
+        return json.loads(row[0])
+
+    def put(self, key, linter, issues):
+        self._conn.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                           (key, linter, json.dumps(issues), time.time()))
+        self._conn.commit()
+        self._writes += 1
+        if self._writes % _EVICT_EVERY == 0:
+            self.evict()
+
+    def lint(self, content, linter, version, config, run):
+        """Return cached issues, or call ``run()`` and cache its result (``None`` means the run failed)."""
+        key = lint_key(content, linter, version, config)
+        issues = self.get(key)
+        if issues is None:
+            issues = run()
+            if issues is not None:
+                self.put(key, linter, issues)
+        return issues
+
+    def evict(self):
+        """Drop the least recently used entries beyond ``max_entries``."""
+        count = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY last_used LIMIT ?)", (excess,)
+            )
+            self._conn.commit()
+
+    def stats(self):
+        total = self.hits + self.misses
+        rate = 100 * self.hits / total if total else 0.0
+        return f"{self.hits} hits, {self.misses} misses ({rate:.1f}% hit rate)"
+
+    def close(self):
+        self.evict()
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def neutral_path(path):
+    """``path`` with its file name replaced by the neutral module name (the extension is kept)."""
+    return os.path.join(os.path.dirname(path), NEUTRAL_MODULE + os.path.splitext(path)[1])
+
+
+def cache_module(content, path):
+    """Module name the pylint run for ``content`` as the file ``path`` is cached under.
+
+    ``NEUTRAL_MODULE`` when the real name cannot change the output: it conforms
+    to snake_case (no C0103 for the module) and neither name occurs in the code
+    (no W0406 import-self, no message naming the module). Otherwise the real name.
+    """
+    module = os.path.splitext(os.path.basename(path))[0]
+    if _SNAKE_CASE_MODULE.match(module) and not re.search(rf'\b({re.escape(module)}|{NEUTRAL_MODULE})\b', content):
+        return NEUTRAL_MODULE
+    return module
+
+
+def pylint_key(content, version, config, path):
+    """``(key, module)`` for pylint on ``content`` as the file ``path``; the key also holds the module from ``cache_module``."""
+    module = cache_module(content, path)
+    return lint_key(content, 'pylint', version, dict(config, module=module)), module
+
+
+def _rename(issues, module, path):
+    return [dict(issue, path=path, module=module) for issue in issues]
+
+
+def stored_issues(issues, module, path):
+    """Pylint issues of the file ``path`` linted under ``module``, as cached (no directory in the path)."""
+    return _rename(issues, module, module + os.path.splitext(path)[1])
+
+
+def localize_issues(issues, path, reported=None):
+    """Cached pylint issues reported for the file ``path`` (shown as ``reported``)."""
+    module = os.path.splitext(os.path.basename(path))[0]
+    return _rename(issues, module, path if reported is None else reported)
+
+
+def cached_lint_as(cache, content, linter, version, config, path, run):
+    """Issues of ``content`` reported as the file ``path``, cached independently of its file name where possible.
+
+    ``run(lint_path)`` lints ``content`` as ``lint_path``; it returns None if the
+    linter failed. Without a cache ``content`` is linted as ``path`` itself.
+    """
+    if cache is None:
+        return run(path)
+    if linter != 'pylint':
+        # ESLint messages do not name the file
+        return cache.lint(content, linter, version, config, lambda: run(neutral_path(path)))
+    key, module = pylint_key(content, version, config, path)
+    issues = cache.get(key)
+    if issues is None:
+        issues = run(os.path.join(os.path.dirname(path), module + os.path.splitext(path)[1]))
+        if issues is None:
+            return None  # Failed runs are not cached
+        cache.put(key, linter, stored_issues(issues, module, path))
+    return localize_issues(issues, path)
@@ -0,0 +1,184 @@
+"""Append-only, checkpointed lint results with resume.
+
+Each finished item is appended to ``<output>.ndjson`` as one
+``{"key": ..., "value": ...}`` line and flushed; the file is fsynced every
+``checkpoint_every`` records or ``checkpoint_seconds`` seconds and on close,
+so a crash or Ctrl-C loses at most the last unsynced records. With
+``resume=True`` the records already on disk are kept (a torn last line is cut
+off) and their keys are reported in ``done`` so callers can skip them.
+``write_all`` leaves out items without a result (timed out, quarantined or
+failed), so they are not mistaken for clean ones and a resume retries them.
+
+``finalize_list`` / ``finalize_dict`` stream the journal into the legacy
+``json.dump(..., indent=N)`` file byte for byte, without loading it whole.
+"""
+import json
+import os
+import time
+
+DEFAULT_CHECKPOINT_EVERY = 50
+DEFAULT_CHECKPOINT_SECONDS = 10
+# Bytes read at a time when looking for the last complete line on resume
+_TAIL_BLOCK = 64 * 1024
+
+
+def journal_path(output_path):
+    return os.path.splitext(output_path)[0] + '.ndjson'
+
+
+def read_journal(path):
+    """Yield ``(key, value)`` for every complete record; a torn last line is ignored."""
+    if not os.path.exists(path):
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.endswith('\n'):
+                return
+            record = json.loads(line)
+            yield record['key'], record['value']
+
+
+def _valid_length(path):
+    """Byte length of the journal up to its last complete line, reading backwards from the end in blocks."""
+    with open(path, 'rb') as f:
+        end = f.seek(0, os.SEEK_END)
+        while end > 0:
+            start = max(0, end - _TAIL_BLOCK)
+            f.seek(start)
+            newline = f.read(end - start).rfind(b'\n')
+            if newline >= 0:
+                return start + newline + 1
+            end = start
+    return 0
+
+
+class LintJournal:
+    def __init__(self, path, resume=False, checkpoint_every=DEFAULT_CHECKPOINT_EVERY,
+                 checkpoint_seconds=DEFAULT_CHECKPOINT_SECONDS):
+        self.path = path
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_seconds = checkpoint_seconds
+        self.done = set()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        if resume and os.path.exists(path):
+            self.done = {key for key, _ in read_journal(path)}
+            self._file = open(path, 'r+', encoding='utf-8')
+            self._file.truncate(_valid_length(path))
+            self._file.seek(0, os.SEEK_END)
+        else:
+            self._file = open(path, 'w', encoding='utf-8')
+        self._pending = 0
+        self._synced_at = time.monotonic()
+
+    def write(self, key, value):
+        self._file.write(json.dumps({'key': key, 'value': value}) + '\n')
+        self._file.flush()
+        self.done.add(key)
+        self._pending += 1
+        if self._pending >= self.checkpoint_every or time.monotonic() - self._synced_at >= self.checkpoint_seconds:
+            self.checkpoint()
+
+    def write_all(self, results, transform=None):
+        """Append every ``(key, value)`` of ``results`` whose value is not None; return the keys left out.
+
+        ``transform(key, value)`` turns a result into the recorded value.
+        """
+        left_out = []
+        for key, value in results:
+            if value is None:
+                left_out.append(key)
+            else:
+                self.write(key, value if transform is None else transform(key, value))
+        return left_out
+
+    def checkpoint(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+        self._synced_at = time.monotonic()
+
+    def close(self):
+        if not self._file.closed:
+            self.checkpoint()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _ordered_values(path, order):
+    """Journal values in ``order`` (keys missing from it follow in journal order), reading one record at a time."""
+    offsets = {}
+    with open(path, 'rb') as f:
+        while True:
+            offset = f.tell()
+            line = f.readline()
+            if not line.endswith(b'\n'):
+                break
+            offsets[json.loads(line)['key']] = offset
+        order = list(order)
+        ordered = set(order)
+        keys = [key for key in order if key in offsets] + [key for key in offsets if key not in ordered]
+        for key in keys:
+            f.seek(offsets[key])
+            yield json.loads(f.readline())['value']
+
+
+def _indented(value, indent, level):
+    """``json.dumps(value, indent=indent)`` as it appears nested ``level`` deep."""
+    return json.dumps(value, indent=indent).replace('\n', '\n' + ' ' * (indent * level))
+
+
+def _replace(output_path, write):
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        count = write(f)
+    os.replace(tmp_path, output_path)
+    return count
+
+
+def finalize_list(path, output_path, indent=4, head=(), order=None):
+    """Write ``head`` then every issue of every record (lists) as one JSON list; return the item count.
+
+    Records are written in journal order, or in the key ``order`` given
+    (e.g. the input order when items finished out of order).
+    """
+    def items():
+        yield from head
+        if order is None:
+            values = (value for _, value in read_journal(path))
+        else:
+            values = _ordered_values(path, order) if os.path.exists(path) else ()
+        for value in values:
+            yield from value
+
+    def write(f):
+        count = 0
+        pad = ' ' * indent
+        for item in items():
+            f.write(('[\n' if count == 0 else ',\n') + pad + _indented(item, indent, 1))
+            count += 1
+        f.write('\n]' if count else '[]')
+        return count
+    return _replace(output_path, write)
+
+
+def finalize_dict(path, output_path, indent=2):
+    """Write records with a non-null value as one JSON object (later records win); return the entry count."""
+    def write(f):
+        latest = {}
+        for number, (key, value) in enumerate(read_journal(path)):
+            latest[key] = number if value is not None else None
+        count = 0
+        pad = ' ' * indent
+        for number, (key, value) in enumerate(read_journal(path)):
+            if latest[key] != number:
+                continue
+            f.write(('{\n' if count == 0 else ',\n') + pad + json.dumps(key) + ': ' + _indented(value, indent, 1))
+            count += 1
+        f.write('\n}' if count else '{}')
+        return count
+    return _replace(output_path, write)
@@ -0,0 +1,80 @@
+"""One declarative lint profile, compiled into each linter's own flags.
+
+The profile (``lint_profile.json`` at the project root) lists the rules to
+enable/disable, third-party modules whose import errors are expected, and
+severity floors. Pushing it down as native flags means unwanted checks are
+never computed instead of being filtered afterwards:
+
+- pylint: ``--disable`` / ``--enable``. Third-party modules are not passed as
+  ``--ignored-modules``, which would also silence no-member (E1101, I1101)
+  and no-name-in-module (E0611) for them; their import errors (E0401) are
+  dropped by ``pylint_engine.filter_issues`` as before.
+- flake8: ``--select`` / ``--extend-ignore``
+- bandit: ``-s`` / ``-t`` and ``-l``/``-i`` repeated up to the severity/confidence floor
+- ESLint: ``--rule`` overrides and ``--quiet`` for an ``error`` floor
+"""
+import json
+import os
+
+DEFAULT_PROFILE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lint_profile.json')
+BANDIT_LEVELS = {'all': 0, 'low': 1, 'medium': 2, 'high': 3}
+
+
+def load_profile(path=DEFAULT_PROFILE_FILE):
+    with open(path, 'r', encoding='utf-8') as f:
+        profile = json.load(f)
+    for tool in ('pylint', 'flake8', 'bandit', 'eslint'):
+        profile.setdefault(tool, {})
+    profile.setdefault('third_party_modules', [])
+    return profile
+
+
+def pylint_args(profile):
+    section = profile['pylint']
+    args = []
+    if section.get('disable'):
+        args.append(f"--disable={','.join(section['disable'])}")
+    if section.get('enable'):
+        args.append(f"--enable={','.join(section['enable'])}")
+    return args
+
+
+def flake8_args(profile):
+    section = profile['flake8']
+    args = []
+    if section.get('select'):
+        args.append(f"--select={','.join(section['select'])}")
+    if section.get('ignore'):
+        args.append(f"--extend-ignore={','.join(section['ignore'])}")
+    return args
+
+
+def bandit_args(profile):
+    section = profile['bandit']
+    args = []
+    if section.get('skip'):
+        args += ['-s', ','.join(section['skip'])]
+    if section.get('tests'):
+        args += ['-t', ','.join(section['tests'])]
+    severity = BANDIT_LEVELS[section.get('severity', 'all').lower()]
+    if severity:
+        args.append('-' + 'l' * severity)
+    confidence = BANDIT_LEVELS[section.get('confidence', 'all').lower()]
+    if confidence:
+        args.append('-' + 'i' * confidence)
+    return args
+
+
+def eslint_rules(profile):
+    return dict(profile['eslint'].get('rules', {}))
+
+
+def eslint_quiet(profile):
+    return profile['eslint'].get('severity', 'warning') == 'error'
+
+
+def eslint_args(profile):
+    args = [f"--rule={json.dumps({rule: setting})}" for rule, setting in eslint_rules(profile).items()]
+    if eslint_quiet(profile):
+        args.append('--quiet')
+    return args
@@ -0,0 +1,275 @@
+"""Size-aware lint scheduling, adaptive per-file time budgets and quarantine.
+
+``LintHistory`` remembers, per linter and content hash, how long a file took
+to lint, its size and how often it timed out (``Data/lint_history.json``,
+shared by every stage). ``LintBudget`` turns that into per-file timeouts: a
+multiple of a percentile of the lint times seen so far (or of the file's own
+past time if it is slower), clamped to ``[minimum, maximum]``, with
+``maximum`` (the old fixed timeout) used until enough samples exist. A file
+that overruns its adaptive budget gets one more try at ``maximum``; a file
+that has timed out ``quarantine_after`` times is quarantined, i.e. skipped
+and listed in the quarantine report instead of stalling later runs.
+Quarantine lapses ``quarantine_days`` after the last timeout (the next
+timeout at ``maximum`` renews it), and ``LintHistory.clear_timeouts`` lifts
+it at once (the stages' ``--retry-quarantined``).
+
+``run_scheduled`` drives N workers over a job list ordered largest-first by
+historical lint time (or by size, scaled with the observed seconds per byte,
+for files never linted before), which keeps long files from landing at the
+end of a parallel run. Retries go to the back of the queue.
+"""
+import bisect
+import heapq
+import itertools
+import json
+import os
+import queue
+import subprocess
+import threading
+import time
+
+from common.snippet_store import content_hash
+
+DEFAULT_HISTORY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Data', 'lint_history.json')
+DEFAULT_QUARANTINE_REPORT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Data',
+                                         'lint_quarantine.json')
+DEFAULT_MIN_TIMEOUT = 5
+DEFAULT_PERCENTILE = 95
+DEFAULT_FACTOR = 3
+DEFAULT_WARMUP = 20
+DEFAULT_QUARANTINE_AFTER = 2
+DEFAULT_QUARANTINE_DAYS = 30
+
+
+def history_key(linter, content):
+    return f"{linter}:{content_hash(content)}"
+
+
+def quarantined_entry(entry, quarantine_after=DEFAULT_QUARANTINE_AFTER, quarantine_days=DEFAULT_QUARANTINE_DAYS):
+    """True if a history entry is quarantined: enough timeouts, the last one under ``quarantine_days`` ago."""
+    if entry.get('timeouts', 0) < quarantine_after:
+        return False
+    return quarantine_days is None or time.time() - entry.get('last_timeout', 0) < quarantine_days * 86400
+
+
+class LintHistory:
+    """Per-file lint times, sizes and timeout counts; ``save`` merges into the file so stages can share it."""
+
+    def __init__(self, path=DEFAULT_HISTORY_FILE):
+        self.path = path
+        self.entries = self._load()
+        self._changed = set()
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self.path and os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return {}
+
+    def get(self, key):
+        return self.entries.get(key, {})
+
+    def update(self, key, **fields):
+        with self._lock:
+            self.entries.setdefault(key, {}).update(fields)
+            self._changed.add(key)
+
+    def add_timeout(self, key, size, name):
+        with self._lock:
+            entry = self.entries.setdefault(key, {})
+            entry.update(size=size, name=name, timeouts=entry.get('timeouts', 0) + 1, last_timeout=time.time())
+            self._changed.add(key)
+            return entry['timeouts']
+
+    def clear_timeouts(self, linter=None):
+        """Forget the timeouts of every file (of ``linter`` only, if given), lifting quarantine; returns how many."""
+        with self._lock:
+            cleared = [key for key, entry in self.entries.items()
+                       if entry.get('timeouts') and (linter is None or key.startswith(linter + ':'))]
+            for key in cleared:
+                self.entries[key]['timeouts'] = 0
+            self._changed.update(cleared)
+            return len(cleared)
+
+    def seconds_per_byte(self, linter):
+        """Median lint seconds per source byte over files of ``linter`` linted before (None if unknown)."""
+        rates = sorted(entry['seconds'] / entry['size'] for key, entry in self.entries.items()
+                       if key.startswith(linter + ':') and entry.get('seconds') and entry.get('size'))
+        return rates[len(rates) // 2] if rates else None
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            merged = self._load()
+            for key in self._changed:
+                merged[key] = self.entries[key]
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(merged, f)
+            os.replace(tmp_path, self.path)
+            self.entries, self._changed = merged, set()
+
+
+class LintBudget:
+    """Adaptive per-file timeouts and quarantine for one linter."""
+
+    def __init__(self, linter, maximum, history=None, minimum=DEFAULT_MIN_TIMEOUT, percentile=DEFAULT_PERCENTILE,
+                 factor=DEFAULT_FACTOR, warmup=DEFAULT_WARMUP, quarantine_after=DEFAULT_QUARANTINE_AFTER,
+                 quarantine_days=DEFAULT_QUARANTINE_DAYS):
+        self.linter = linter
+        self.maximum = maximum
+        self.minimum = min(minimum, maximum)
+        self.history = history if history is not None else LintHistory(None)
+        self.percentile = percentile
+        self.factor = factor
+        self.warmup = warmup
+        self.quarantine_after = quarantine_after
+        self.quarantine_days = quarantine_days
+        self._samples = []
+        self._lock = threading.Lock()
+
+    def key(self, content):
+        return history_key(self.linter, content)
+
+    def is_quarantined(self, key):
+        return quarantined_entry(self.history.get(key), self.quarantine_after, self.quarantine_days)
+
+    def timeout_for(self, key, attempt=0):
+        """Adaptive budget on the first attempt, ``maximum`` on the retry or before ``warmup`` samples."""
+        with self._lock:
+            if attempt > 0 or len(self._samples) < self.warmup:
+                return self.maximum
+            typical = self._samples[min(len(self._samples) - 1, len(self._samples) * self.percentile // 100)]
+        own = self.history.get(key).get('seconds', 0)
+        return max(self.minimum, min(self.maximum, self.factor * max(typical, own)))
+
+    def record(self, key, size, seconds):
+        with self._lock:
+            bisect.insort(self._samples, seconds)
+        self.history.update(key, seconds=seconds, size=size)
+
+    def record_timeout(self, key, size, name, timeout):
+        """Count a timeout; True if the file should be retried at ``maximum``."""
+        if timeout < self.maximum:
+            return True
+        self.history.add_timeout(key, size, name)
+        return False
+
+    def estimated_cost(self, key, size, rate):
+        seconds = self.history.get(key).get('seconds')
+        if seconds:
+            return seconds
+        return size * rate if rate else size
+
+    def run(self, key, size, name, lint):
+        """Call ``lint(timeout)`` under this file's budget, retrying once at ``maximum``.
+
+        Raises ``subprocess.TimeoutExpired`` for quarantined files and files
+        that also overran ``maximum``.
+        """
+        if self.is_quarantined(key):
+            raise subprocess.TimeoutExpired([self.linter, name], 0, output='quarantined')
+        for attempt in (0, 1):
+            timeout = self.timeout_for(key, attempt)
+            started = time.monotonic()
+            try:
+                result = lint(timeout)
+            except subprocess.TimeoutExpired:
+                if self.record_timeout(key, size, name, timeout):
+                    continue
+                raise
+            self.record(key, size, time.monotonic() - started)
+            return result
+
+
+def largest_first(jobs, budget):
+    """``jobs`` of ``(job, key, size)`` sorted by estimated lint time, longest first (stable)."""
+    rate = budget.history.seconds_per_byte(budget.linter)
+    return sorted(jobs, key=lambda job: -budget.estimated_cost(job[1], job[2], rate))
+
+
+def run_scheduled(jobs, budget, make_worker, workers=1, name=str):
+    """Lint ``(job, key, size)`` tuples largest-first on ``workers`` workers; yield ``(job, result)`` as they finish.
+
+    ``make_worker()`` returns an object with ``lint(job, timeout)`` and
+    ``close()``; each worker thread owns one. The result is None for
+    quarantined files, files that timed out twice and failed runs.
+    """
+    todo, quarantined = [], []
+    counter = itertools.count()
+    for job, key, size in largest_first(jobs, budget):
+        if budget.is_quarantined(key):
+            quarantined.append(job)
+        else:
+            heapq.heappush(todo, (0, next(counter), job, key, size))
+    for job in quarantined:
+        print(f"🚧 Skipping quarantined {name(job)}")
+        yield job, None
+    todo_lock = threading.Lock()
+    total = len(todo)
+    pending = [total]
+    results = queue.Queue()
+
+    def work():
+        worker = make_worker()
+        try:
+            while True:
+                with todo_lock:
+                    if not todo:
+                        if pending[0] == 0:
+                            return
+                        retry_wait = True
+                    else:
+                        retry_wait = False
+                        attempt, _, job, key, size = heapq.heappop(todo)
+                if retry_wait:
+                    # Another worker may still requeue a timed-out file
+                    time.sleep(0.05)
+                    continue
+                timeout = budget.timeout_for(key, attempt)
+                started = time.monotonic()
+                try:
+                    result = worker.lint(job, timeout)
+                    budget.record(key, size, time.monotonic() - started)
+                except subprocess.TimeoutExpired:
+                    if budget.record_timeout(key, size, name(job), timeout):
+                        # Retried at full budget after the first-attempt jobs
+                        with todo_lock:
+                            heapq.heappush(todo, (1, next(counter), job, key, size))
+                        continue
+                    print(f"⏱️ {name(job)} timed out after {timeout:.0f}s")
+                    result = None
+                except Exception as e:
+                    print(f"⚠️ Lint failed on {name(job)}: {e}")
+                    result = None
+                with todo_lock:
+                    pending[0] -= 1
+                results.put((job, result))
+        finally:
+            worker.close()
+
+    threads = [threading.Thread(target=work, daemon=True) for _ in range(max(1, workers))]
+    for thread in threads:
+        thread.start()
+    for _ in range(total):
+        yield results.get()
+    for thread in threads:
+        thread.join()
+
+
+def write_quarantine_report(history, quarantine_after=DEFAULT_QUARANTINE_AFTER, path=DEFAULT_QUARANTINE_REPORT,
+                            quarantine_days=DEFAULT_QUARANTINE_DAYS):
+    """List every quarantined file (linter, name, size, timeouts) and return how many there are."""
+    quarantined = [
+        {'linter': key.split(':', 1)[0], 'name': entry.get('name'), 'size': entry.get('size'),
+         'timeouts': entry['timeouts'], 'last_timeout': entry.get('last_timeout'), 'key': key}
+        for key, entry in history.entries.items() if quarantined_entry(entry, quarantine_after, quarantine_days)
+    ]
+    quarantined.sort(key=lambda item: (item['linter'], -item['timeouts'], item['name'] or ''))
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(quarantined, f, indent=2)
+    return len(quarantined)
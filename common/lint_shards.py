@@ -0,0 +1,86 @@
+"""Sharded, concurrent Flake8 and Bandit runs.
+
+The file list is cut into contiguous shards (which also keeps every command
+line well below the OS argv limit) and each shard is linted by its own
+``flake8``/``bandit`` process. ``iter_shards`` yields each shard's parsed JSON
+as soon as it finishes; ``merge_flake8`` / ``merge_bandit`` combine shard
+outputs into exactly the document a single run over all files would produce.
+"""
+import json
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+DEFAULT_SHARD_SIZE = 500
+
+
+def make_shards(paths, shard_size=DEFAULT_SHARD_SIZE):
+    paths = list(paths)
+    return [paths[i:i + shard_size] for i in range(0, len(paths), shard_size)]
+
+
+def _run_json(cmd):
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if not result.stdout.strip():
+        return None
+    try:
+        return json.loads(result.stdout)
+    except json.JSONDecodeError:
+        raise RuntimeError(f"{cmd[0]} did not return JSON: {result.stderr.strip()[:500]}")
+
+
+def run_flake8(paths, extra_args=()):
+    """``{filename: [issues]}`` for one shard; shards already run in parallel, so flake8 uses one job."""
+    return _run_json(['flake8', '--format=json', '--jobs=1'] + list(extra_args) + list(paths)) or {}
+
+
+def run_bandit(paths, extra_args=()):
+    """Bandit's JSON report (errors, generated_at, metrics, results) for one shard."""
+    return _run_json(['bandit', '-f', 'json'] + list(extra_args) + list(paths)) or {}
+
+
+def iter_shards(run, shards, workers=1):
+    """Yield ``(shard_index, output)`` as each shard finishes (completion order)."""
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {executor.submit(run, shard): index for index, shard in enumerate(shards)}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+def merge_flake8(outputs):
+    """Merge shard outputs given in shard order; flake8 reports files in argv order."""
+    merged = {}
+    for output in outputs:
+        merged.update(output)
+    return merged
+
+
+def bandit_totals(metrics):
+    """Sum numeric per-file metrics the way Bandit builds ``_totals``."""
+    totals = {}
+    for filename, file_metrics in metrics.items():
+        if filename == '_totals':
+            continue
+        for key, value in file_metrics.items():
+            if isinstance(value, (int, float)):
+                totals[key] = totals.get(key, 0) + value
+    return totals
+
+
+def merge_bandit(outputs):
+    """Merge shard reports given in shard order; Bandit scans (and reports) files sorted by name."""
+    outputs = [o for o in outputs if o]
+    if not outputs:
+        return {}
+    by_file = lambda item: item.get('filename', '')
+    metrics = {}
+    for output in outputs:
+        metrics.update((k, v) for k, v in output.get('metrics', {}).items() if k != '_totals')
+    metrics = dict(sorted(metrics.items()))
+    metrics['_totals'] = bandit_totals(metrics)
+    return dict(
+        outputs[-1],
+        errors=sorted((e for o in outputs for e in o.get('errors', [])), key=by_file),
+        generated_at=max(o.get('generated_at', '') for o in outputs),
+        metrics=metrics,
+        results=sorted((r for o in outputs for r in o.get('results', [])), key=by_file),
+    )
@@ -0,0 +1,269 @@
+"""Single-parse classifier for Python snippets.
+
+Gives exactly the buckets of the original ``SyntaxPython.py`` logic
+(``compile`` + ``has_function_or_class`` / ``has_executable_code`` /
+``starts_with_import``), but parses each snippet once and derives every
+category from one traversal that stops as soon as the answer is known.
+"""
+import ast
+from collections import Counter
+
+# Bump whenever classification or fact extraction changes, to invalidate AstFactsCache
+CLASSIFIER_VERSION = 2
+
+SUCCESSFUL = 'Successful'
+EXECUTABLE = 'Executable'
+ONLY_IMPORT = 'Only Import'
+NO_DEFINITION = 'No Function/Class Definition'
+FAILED = 'Failed'
+CATEGORIES = [SUCCESSFUL, FAILED, EXECUTABLE, NO_DEFINITION, ONLY_IMPORT]
+
+DEFINITION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+EXECUTABLE_NODES = (ast.For, ast.While, ast.If, ast.With, ast.Assign, ast.Expr)
+IMPORT_NODES = (ast.Import, ast.ImportFrom)
+
+# Structural metrics: block statements that add a nesting level, and McCabe decision points
+BLOCK_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.If, ast.For, ast.AsyncFor,
+               ast.While, ast.With, ast.AsyncWith, ast.Try) + tuple(
+    getattr(ast, name) for name in ('TryStar', 'Match') if hasattr(ast, name))
+DECISION_NODES = (ast.If, ast.IfExp, ast.For, ast.AsyncFor, ast.While, ast.ExceptHandler, ast.Assert) + tuple(
+    getattr(ast, name) for name in ('match_case',) if hasattr(ast, name))
+
+# Every node type we look for is a statement, and statements only ever appear in
+# these list fields (of statements, except handlers and match cases), so the walk
+# never has to descend into expressions.
+STATEMENT_FIELDS = ('body', 'orelse', 'finalbody', 'handlers', 'cases')
+
+
+def parse_snippet(source, filename='<snippet>'):
+    """Parse once and run the compiler checks on the tree; raises SyntaxError/ValueError."""
+    tree = compile(source, filename, 'exec', ast.PyCF_ONLY_AST)
+    compile(tree, filename, 'exec')  # Compiler-stage errors (e.g. 'return' outside function) without re-parsing
+    return tree
+
+
+def classify_tree(tree):
+    """Return the category of a successfully parsed module."""
+    executable = False
+    stack = list(tree.body)
+    while stack:
+        node = stack.pop()
+        if isinstance(node, DEFINITION_NODES):
+            return SUCCESSFUL  # Highest-priority category: stop here
+        if not executable and isinstance(node, EXECUTABLE_NODES):
+            executable = True
+        for field in STATEMENT_FIELDS:
+            children = getattr(node, field, None)
+            if children:
+                stack.extend(children)
+
+    if executable:
+        return EXECUTABLE
+    if tree.body and isinstance(tree.body[0], IMPORT_NODES):
+        return ONLY_IMPORT
+    return NO_DEFINITION
+
+
+def classify_source(source, filename='<snippet>'):
+    """Return the category for one snippet's source text."""
+    if not source.strip():
+        return FAILED
+    try:
+        tree = parse_snippet(source, filename)
+    except (SyntaxError, ValueError):
+        return FAILED
+    return classify_tree(tree)
+
+
+def count_loc(source):
+    """Lines that are neither blank nor comment-only."""
+    return sum(1 for line in source.splitlines() if line.strip() and not line.lstrip().startswith('#'))
+
+
+def tree_metrics(tree):
+    """Node-type counts and structural metrics of a parsed module, from one traversal."""
+    node_counts = Counter()
+    nesting_depth = 0
+    decisions = 0
+    stack = [(tree, 0)]
+    while stack:
+        node, depth = stack.pop()
+        node_counts[type(node).__name__] += 1
+        if isinstance(node, BLOCK_NODES):
+            depth += 1
+            nesting_depth = max(nesting_depth, depth)
+        if isinstance(node, DECISION_NODES):
+            decisions += 1
+        elif isinstance(node, ast.BoolOp):
+            decisions += len(node.values) - 1
+        elif isinstance(node, ast.comprehension):
+            decisions += 1 + len(node.ifs)
+        stack.extend((child, depth) for child in ast.iter_child_nodes(node))
+    return {
+        'node_counts': dict(node_counts),
+        'node_count': sum(node_counts.values()),
+        'nesting_depth': nesting_depth,
+        'cyclomatic_complexity': 1 + decisions,
+        'import_count': node_counts['Import'] + node_counts['ImportFrom'],
+        'function_count': node_counts['FunctionDef'] + node_counts['AsyncFunctionDef'],
+        'class_count': node_counts['ClassDef'],
+    }
+
+
+def analyze_source(source, filename='<snippet>'):
+    """Return the cacheable facts for one snippet: syntax ok, category, line counts and ``tree_metrics``."""
+    facts = {
+        'syntax_ok': False, 'category': FAILED, 'line_count': len(source.splitlines()), 'loc': count_loc(source),
+        'node_counts': {}, 'node_count': 0, 'nesting_depth': 0, 'cyclomatic_complexity': 0,
+        'import_count': 0, 'function_count': 0, 'class_count': 0,
+    }
+    try:
+        tree = parse_snippet(source, filename)
+    except (SyntaxError, ValueError):
+        return facts
+    facts['syntax_ok'] = True
+    facts.update(tree_metrics(tree))
+    if source.strip():
+        facts['category'] = classify_tree(tree)
+    return facts
+
+
+# === Batch classification (serial or process pool) ===
+_worker_archive = None
+
+
+def _init_archive_worker(archive_base):
+    global _worker_archive
+    from common.snippet_archive import SnippetArchive
+    _worker_archive = SnippetArchive(archive_base)
+
+
+def classify_file(path):
+    """Return ``(category, error)`` for a snippet file; ``error`` is set if it could not be read or classified."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            source = f.read()
+        return classify_source(source, path), None
+    except Exception as e:
+        return FAILED, str(e)
+
+
+def classify_archived(snippet_id):
+    """Same as ``classify_file`` for a snippet in the worker's packed archive."""
+    try:
+        return classify_source(_worker_archive.read_text(snippet_id), snippet_id), None
+    except Exception as e:
+        return FAILED, str(e)
+
+
+def _analyze_item(item):
+    source, filename = item
+    try:
+        return analyze_source(source, filename), None
+    except Exception as e:
+        return None, str(e)
+
+
+def _read_item(item, archive):
+    if archive is not None:
+        return archive.read_text(item)
+    with open(item, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def default_chunk_size(count, workers):
+    # A few chunks per worker balances load without paying per-item IPC
+    return max(1, min(512, count // (workers * 4) or 1))
+
+
+def classify_many(items, workers=1, chunk_size=None, archive_base=None, cache=None):
+    """Classify snippet paths (or archive ids) and return ``(category, error)`` pairs in input order.
+
+    With ``workers > 1`` items are sent in chunks to a process pool; results
+    come back in input order, so outputs are identical to a serial run.
+    With an ``AstFactsCache`` only snippets whose content hash is not cached
+    are parsed.
+    """
+    items = list(items)
+    if cache is not None:
+        return [(facts['category'] if facts else FAILED, error)
+                for facts, error in analyze_many(items, cache, workers, chunk_size, archive_base)]
+    func = classify_archived if archive_base else classify_file
+    initializer, initargs = (_init_archive_worker, (archive_base,)) if archive_base else (None, ())
+
+    if workers <= 1:
+        if not archive_base:
+            return [func(item) for item in items]
+        global _worker_archive
+        _init_archive_worker(archive_base)
+        try:
+            return [func(item) for item in items]
+        finally:
+            _worker_archive.close()
+            _worker_archive = None
+
+    from concurrent.futures import ProcessPoolExecutor
+    chunk_size = chunk_size or default_chunk_size(len(items), workers)
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as executor:
+        return list(executor.map(func, items, chunksize=chunk_size))
+
+
+def analyze_many(items, cache=None, workers=1, chunk_size=None, archive_base=None):
+    """Return ``(facts, error)`` per snippet path (or archive id), served from ``cache`` where possible.
+
+    Snippets are read and hashed here; only distinct uncached contents are
+    parsed (in a process pool when ``workers > 1``), and their facts are
+    written back to the cache (if one is given).
+    """
+    from common.snippet_store import content_hash
+
+    archive = None
+    if archive_base:
+        from common.snippet_archive import SnippetArchive
+        archive = SnippetArchive(archive_base)
+    try:
+        digests, errors, sources = [], {}, {}
+        for index, item in enumerate(items):
+            try:
+                source = _read_item(item, archive)
+            except Exception as e:
+                digests.append(None)
+                errors[index] = str(e)
+                continue
+            digest = content_hash(source)
+            digests.append(digest)
+            sources.setdefault(digest, (source, str(item)))
+    finally:
+        if archive is not None:
+            archive.close()
+
+    known = cache.get_many(sources) if cache is not None else {}
+    pending = [digest for digest in sources if digest not in known]
+    work = [sources[digest] for digest in pending]
+    if workers <= 1 or len(work) < 2:
+        results = [_analyze_item(item) for item in work]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        chunk_size = chunk_size or default_chunk_size(len(work), workers)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_analyze_item, work, chunksize=chunk_size))
+
+    computed, failures = {}, {}
+    for digest, (facts, error) in zip(pending, results):
+        if error is None:
+            computed[digest] = facts
+        else:
+            failures[digest] = error  # Unexpected errors (e.g. RecursionError) are not cached
+    if cache is not None:
+        cache.put_many(computed)
+    known.update(computed)
+
+    out = []
+    for index, digest in enumerate(digests):
+        if digest is None:
+            out.append((None, errors[index]))
+        elif digest in failures:
+            out.append((None, failures[digest]))
+        else:
+            out.append((known[digest], None))
+    return out
@@ -0,0 +1,170 @@
+"""In-process Pylint engine.
+
+Pylint (and astroid) are imported once per process and files are linted in
+batches through ``pylint.lint.Run`` (one run per folder) with a
+``CollectingReporter``, instead of one ``pylint`` subprocess per snippet. Messages are converted to the same
+dicts as ``pylint --output-format=json`` and filtered as each batch finishes.
+``lint_many`` spreads batches over N long-lived worker processes and yields
+results in input order.
+"""
+import io
+import os
+import sys
+
+MISSING_DOCSTRING_CODES = ('C0114', 'C0115', 'C0116')
+THIRD_PARTY_LIBS = ['scrapy', 'selenium', 'pims', 'pandas', 'numpy', 'cv2', 'matplotlib', 'torch']
+
+# Checks that only ever fire across several files; a one-file pylint run never
+# emits them, so they are disabled to keep batched output identical.
+CROSS_FILE_CHECKS = ('duplicate-code', 'cyclic-import')
+DEFAULT_BATCH_SIZE = 50
+
+
+def filter_issues(issues, third_party_libs=THIRD_PARTY_LIBS, skip_codes=MISSING_DOCSTRING_CODES):
+    """Drop missing-docstring messages and import errors for known third-party libraries.
+
+    With the lint profile's flags pylint no longer emits missing docstrings;
+    third-party import errors are only dropped here (``torchvision`` matches
+    ``torch`` too).
+    """
+    filtered_issues = []
+    for issue in issues:
+        code = issue.get('message-id')
+        if code in skip_codes:
+            continue  # Skip missing docstrings
+
+        if code == 'E0401':
+            msg = issue.get('message', '').lower()
+            if any(lib.lower() in msg for lib in third_party_libs):
+                continue  # Skip known third-party import errors
+
+        filtered_issues.append(issue)
+    return filtered_issues
+
+
+def message_to_dict(msg):
+    """Same fields, in the same order, as pylint's JSON reporter."""
+    return {
+        'type': msg.category,
+        'module': msg.module,
+        'obj': msg.obj,
+        'line': msg.line,
+        'column': msg.column,
+        'endLine': msg.end_line,
+        'endColumn': msg.end_column,
+        'path': msg.path,
+        'symbol': msg.symbol,
+        'message': msg.msg or '',
+        'message-id': msg.msg_id,
+    }
+
+
+def _path_key(path):
+    return os.path.normcase(os.path.abspath(path))
+
+
+def _run(args):
+    from pylint.lint import Run
+    from pylint.reporters import CollectingReporter
+
+    reporter = CollectingReporter()
+    Run(['--score=n', f"--disable={','.join(CROSS_FILE_CHECKS)}"] + list(args), reporter=reporter, exit=False)
+    return [message_to_dict(msg) for msg in reporter.messages]
+
+
+def _forget_folder(folder):
+    """Drop astroid's cached modules loaded from ``folder`` (or below it)."""
+    from astroid import MANAGER
+
+    for name, module in list(MANAGER.astroid_cache.items()):
+        file = getattr(module, 'file', None)
+        if file and _path_key(file).startswith(folder + os.sep):
+            del MANAGER.astroid_cache[name]
+
+
+def lint_files(paths, extra_args=()):
+    """Lint several files, one pylint run per folder; returns ``{path: issues}`` for every path given.
+
+    Files of one folder see each other as they would in one-file runs. Between
+    folders ``sys.path`` is restored and astroid forgets the folder's modules,
+    so a module name shared by two folders never resolves to the other's file.
+    """
+    folders = {}
+    for path in paths:
+        folders.setdefault(os.path.dirname(_path_key(path)), []).append(path)
+    results = {p: [] for p in paths}
+    for folder, folder_paths in folders.items():
+        by_key = {_path_key(p): p for p in folder_paths}
+        saved_path = list(sys.path)
+        try:
+            issues = _run(list(extra_args) + folder_paths)
+        finally:
+            sys.path[:] = saved_path
+            _forget_folder(folder)
+        for issue in issues:
+            target = by_key.get(_path_key(issue['path']))
+            if target is not None:
+                results[target].append(issue)
+    return results
+
+
+def lint_source(path, text, extra_args=()):
+    """Lint ``text`` as if it were the file ``path`` (pylint ``--from-stdin``)."""
+    saved_stdin = sys.stdin
+    # pylint detaches sys.stdin's buffer, so hand it a real text wrapper
+    sys.stdin = io.TextIOWrapper(io.BytesIO(text.encode('utf-8')), encoding='utf-8')
+    try:
+        return _run(list(extra_args) + ['--from-stdin', path])
+    finally:
+        sys.stdin = saved_stdin
+
+
+def lint_batch(batch, extra_args=(), apply_filter=True):
+    """Lint ``[(path, text_or_None), ...]`` and return ``[(path, issues), ...]`` in order.
+
+    Files are linted together; snippets with ``text`` (e.g. from an archive)
+    are fed one at a time over stdin. A batch that crashes pylint is retried
+    file by file so one bad snippet cannot hide the others' results; issues
+    are None for a file pylint failed on. With ``apply_filter`` the issues are
+    passed through ``filter_issues``.
+    """
+    on_disk = [path for path, text in batch if text is None]
+    results = {}
+    if on_disk:
+        try:
+            results.update(lint_files(on_disk, extra_args))
+        except Exception:
+            for path in on_disk:
+                try:
+                    results.update(lint_files([path], extra_args))
+                except Exception as e:
+                    print(f"⚠️ Pylint failed on {path}: {e}")
+                    results[path] = None
+    for path, text in batch:
+        if text is not None:
+            try:
+                results[path] = lint_source(path, text, extra_args)
+            except Exception as e:
+                print(f"⚠️ Pylint failed on {path}: {e}")
+                results[path] = None
+    if apply_filter:
+        return [(path, filter_issues(results[path] or [])) for path, _ in batch]
+    return [(path, results[path]) for path, _ in batch]
+
+
+def lint_many(items, workers=1, batch_size=DEFAULT_BATCH_SIZE, extra_args=(), apply_filter=True):
+    """Yield ``lint_batch`` results for ``[(path, text_or_None), ...]`` in input order, one batch at a time."""
+    from functools import partial
+
+    items = list(items)
+    batches = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+    run_batch = partial(lint_batch, extra_args=tuple(extra_args), apply_filter=apply_filter)
+    if workers <= 1:
+        for batch in batches:
+            yield from run_batch(batch)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for results in executor.map(run_batch, batches):
+            yield from results
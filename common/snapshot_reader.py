@@ -0,0 +1,211 @@
+"""Incremental reader for DevGPT snapshot JSON files.
+
+The snapshot files (e.g. ``20230831_072722_file_sharings.json``) are a single
+``{"Sources": [...]}`` document that can be hundreds of MB. Instead of
+``json.load``-ing the whole document, this module scans the file in chunks and
+decodes one ``Sources`` element at a time, so memory use is bounded by the
+largest single source rather than by the size of the snapshot.
+
+``iter_json_entries`` and ``iter_nested_entries`` stream other large JSON
+documents (e.g. linter outputs) the same way.
+"""
+import json
+import os
+import re
+
+CHUNK_SIZE = 1 << 20  # 1 MiB
+WHITESPACE = ' \t\n\r'
+NUMBER_CHARS = '0123456789.eE+-'
+# Characters that matter when skipping a container, outside and inside strings
+_CONTAINER_SCAN = re.compile(r'["{}\[\]]')
+_STRING_SCAN = re.compile(r'["\\]')
+
+
+class _StreamScanner:
+    """Minimal pull scanner over a text file, built on ``JSONDecoder.raw_decode``."""
+
+    def __init__(self, fp, chunk_size=CHUNK_SIZE):
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _read_more(self, size=None):
+        # Drop the consumed prefix so the buffer only holds unread data
+        if self._pos:
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+        chunk = self._fp.read(size or self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf += chunk
+        return True
+
+    def peek(self):
+        """Return the next non-whitespace character without consuming it ('' at EOF)."""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._read_more():
+                return ''
+
+    def expect(self, chars):
+        """Consume the next non-whitespace character, which must be one of ``chars``."""
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"Malformed snapshot JSON: expected one of {chars!r}, found {char!r}")
+        self._pos += 1
+        return char
+
+    def decode_value(self):
+        """Decode and consume one complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+                # Value is truncated: grow the buffer geometrically and retry
+                self._read_more(max(self._chunk_size, len(self._buf)))
+                continue
+            # A scalar ending at the buffer edge may continue in the next chunk; a number
+            # cut after '.', 'e' or its sign decodes as a shorter number followed by that character
+            if not self._eof and (end == len(self._buf) or (
+                    isinstance(value, (int, float)) and self._buf[end] in NUMBER_CHARS)):
+                self._read_more()
+                continue
+            self._pos = end
+            return value
+
+    def skip_value(self):
+        """Consume one JSON value like ``decode_value`` without building it; containers are only scanned."""
+        if self.peek() not in '{[':
+            self.decode_value()
+            return
+        depth, in_string, i = 0, False, self._pos
+        while True:
+            match = (_STRING_SCAN if in_string else _CONTAINER_SCAN).search(self._buf, i)
+            if match is None or (match.group() == '\\' and match.end() == len(self._buf)):
+                # Out of data (or an escape cut at the edge): drop what was scanned and read on
+                self._pos = len(self._buf) if match is None else match.start()
+                if not self._read_more():
+                    raise ValueError("Malformed snapshot JSON: unexpected end of file")
+                i = self._pos
+                continue
+            char, i = match.group(), match.end()
+            if char == '\\':
+                i += 1  # Escaped character
+            elif char == '"':
+                in_string = not in_string
+            elif char in '{[':
+                depth += 1
+            else:
+                depth -= 1
+                if not depth:
+                    self._pos = i
+                    return
+
+
+def _iter_entries(scanner, keep=None):
+    """Yield ``(index, item)`` / ``(key, value)`` for the array or object the scanner is at.
+
+    Entries whose index or key ``keep`` rejects are skipped without being built.
+    """
+    closing = ']' if scanner.expect('[{') == '[' else '}'
+    if scanner.peek() == closing:
+        scanner.expect(closing)
+        return
+    index = 0
+    while True:
+        if closing == '}':
+            name = scanner.decode_value()
+            scanner.expect(':')
+        else:
+            name = index
+        if keep is None or keep(name):
+            yield name, scanner.decode_value()
+        else:
+            scanner.skip_value()
+        index += 1
+        if scanner.expect(',' + closing) == closing:
+            return
+
+
+def iter_json_entries(filepath, chunk_size=CHUNK_SIZE):
+    """Yield ``(index, item)`` of a top-level JSON array, or ``(key, value)`` of a top-level object, one at a time."""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        yield from _iter_entries(_StreamScanner(f, chunk_size))
+
+
+def iter_nested_entries(filepath, keys, chunk_size=CHUNK_SIZE, keep=None):
+    """Yield ``(key, entry_key, value)`` for the entries of the arrays/objects under the top-level ``keys``.
+
+    Other top-level values are skipped without being built, and so are
+    entries whose index or key ``keep`` rejects.
+    """
+    with open(filepath, 'r', encoding='utf-8') as f:
+        scanner = _StreamScanner(f, chunk_size)
+        scanner.expect('{')
+        if scanner.peek() == '}':
+            return
+        while True:
+            key = scanner.decode_value()
+            scanner.expect(':')
+            if key in keys and scanner.peek() in '[{':
+                for entry_key, value in _iter_entries(scanner, keep):
+                    yield key, entry_key, value
+            else:
+                scanner.skip_value()  # Unrelated top-level key
+            if scanner.expect(',}') == '}':
+                return
+
+
+def iter_sources(filepath, chunk_size=CHUNK_SIZE, keep=None):
+    """Yield ``(source_index, source)`` for every element of the top-level ``Sources`` array.
+
+    With ``keep`` only sources whose index it accepts are decoded; the others
+    are skipped over without being built.
+    """
+    for _, source_index, source in iter_nested_entries(filepath, ('Sources',), chunk_size, keep):
+        yield source_index, source
+
+
+def iter_sharings(filepath, chunk_size=CHUNK_SIZE, keep=None):
+    """Yield ``(source_index, sharing_index, source, sharing)`` for each ChatGPT sharing (of the kept sources)."""
+    for source_index, source in iter_sources(filepath, chunk_size, keep):
+        if not isinstance(source, dict):
+            continue
+        for sharing_index, sharing in enumerate(source.get("ChatgptSharing") or []):
+            yield source_index, sharing_index, source, sharing
+
+
+def iter_code_blocks(sharing):
+    """Yield every ``ListOfCode`` entry of a sharing, in conversation order."""
+    for conv in sharing.get("Conversations") or []:
+        for snippet in conv.get("ListOfCode") or []:
+            yield snippet
+
+
+def iter_code_records(filepath, chunk_size=CHUNK_SIZE):
+    """Yield one flat record per code block: Sources -> ChatgptSharing -> Conversations -> ListOfCode."""
+    file_name = os.path.basename(filepath)
+    for source_index, sharing_index, source, sharing in iter_sharings(filepath, chunk_size):
+        for conversation_index, conv in enumerate(sharing.get("Conversations") or []):
+            for code_index, snippet in enumerate(conv.get("ListOfCode") or []):
+                yield {
+                    "file": file_name,
+                    "source_index": source_index,
+                    "sharing_index": sharing_index,
+                    "conversation_index": conversation_index,
+                    "code_index": code_index,
+                    "url": source.get("URL", ""),
+                    "title": sharing.get("Title"),
+                    "type": snippet.get("Type"),
+                    "content": snippet.get("Content", ""),
+                }
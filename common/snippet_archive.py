@@ -0,0 +1,140 @@
+"""Packed snippet archive: one data file plus an offset index.
+
+``<base>.pack`` holds every snippet body back to back as UTF-8, and
+``<base>.idx.json`` lists, per snippet, its ``<conversation>/<file>`` id, byte
+offset, byte length, language, conversation and source/sharing ids. Readers
+mmap the pack and hand out zero-copy ``memoryview`` slices, so stages can scan
+tens of thousands of snippets without touching the filesystem per snippet.
+"""
+import json
+import mmap
+import os
+
+INDEX_VERSION = 1
+INDEX_FIELDS = ['snippet_id', 'offset', 'length', 'language', 'conversation', 'source_index', 'sharing_index', 'position']
+
+
+def archive_paths(base):
+    """Return the (data, index) file paths for an archive base path."""
+    return f"{base}.pack", f"{base}.idx.json"
+
+
+class ArchiveWriter:
+    def __init__(self, base):
+        self.base = base
+        self.data_path, self.index_path = archive_paths(base)
+        os.makedirs(os.path.dirname(os.path.abspath(self.data_path)), exist_ok=True)
+        self._data = open(self.data_path, 'wb')
+        self._entries = []
+
+    def add(self, snippet_id, content, language, conversation, source_index, sharing_index, position):
+        body = content.encode('utf-8')
+        offset = self._data.tell()
+        self._data.write(body)
+        self._entries.append([snippet_id, offset, len(body), language, conversation,
+                              source_index, sharing_index, position])
+
+    def close(self):
+        self._data.close()
+        with open(self.index_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_VERSION, 'fields': INDEX_FIELDS, 'entries': self._entries}, f)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def merge_archives(part_bases, base):
+    """Concatenate several part archives into one, rebasing offsets, then delete the parts."""
+    data_path, index_path = archive_paths(base)
+    entries = {}
+    with open(data_path, 'wb') as out:
+        for part in part_bases:
+            part_data, part_index = archive_paths(part)
+            shift = out.tell()
+            with open(part_data, 'rb') as f:
+                while True:
+                    chunk = f.read(1 << 20)
+                    if not chunk:
+                        break
+                    out.write(chunk)
+            with open(part_index, 'r', encoding='utf-8') as f:
+                for entry in json.load(f)['entries']:
+                    entry[1] += shift
+                    # A later snapshot file wins on id clashes, as it would in the folder tree
+                    entries[entry[0]] = entry
+            os.remove(part_data)
+            os.remove(part_index)
+    entries = sorted(entries.values(), key=lambda e: e[0])
+    with open(index_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': INDEX_VERSION, 'fields': INDEX_FIELDS, 'entries': entries}, f)
+
+
+class SnippetArchive:
+    """Read-only, mmap-backed view over a packed archive."""
+
+    def __init__(self, base):
+        self.base = base
+        self.data_path, self.index_path = archive_paths(base)
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get('version') != INDEX_VERSION:
+            raise ValueError(f"Unsupported archive index version in {self.index_path}")
+        self.entries = [dict(zip(index['fields'], entry)) for entry in index['entries']]
+        self._by_id = {entry['snippet_id']: entry for entry in self.entries}
+        self._file = open(self.data_path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        self._view = memoryview(self._map)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, snippet_id):
+        return snippet_id in self._by_id
+
+    def view(self, snippet_id):
+        """Zero-copy ``memoryview`` of a snippet's UTF-8 bytes."""
+        entry = self._by_id[snippet_id]
+        return self._view[entry['offset']:entry['offset'] + entry['length']]
+
+    def read_text(self, snippet_id):
+        return str(self.view(snippet_id), 'utf-8')
+
+    def get_text(self, snippet_id, default=None):
+        return self.read_text(snippet_id) if snippet_id in self._by_id else default
+
+    def iter_entries(self, language=None):
+        for entry in self.entries:
+            if language is None or entry['language'] == language:
+                yield entry
+
+    def iter_texts(self, language=None):
+        """Yield ``(entry, text)`` for every snippet, optionally of one language."""
+        for entry in self.iter_entries(language):
+            yield entry, self.read_text(entry['snippet_id'])
+
+    def export_tree(self, out_dir, language=None):
+        """Materialize ``<out_dir>/<conversation>/<file>`` for tools that need real paths."""
+        count = 0
+        for entry in self.iter_entries(language):
+            path = os.path.join(out_dir, *entry['snippet_id'].split('/'))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(self.view(entry['snippet_id']))
+            count += 1
+        return count
+
+    def close(self):
+        self._view.release()
+        if self._map:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
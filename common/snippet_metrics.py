@@ -0,0 +1,62 @@
+"""Per-snippet structural metrics table.
+
+One row per snippet, indexed by snippet id (``<conversation>/<file>``, the
+same key ``snippet_store.snippet_id`` gives lint result paths), with the
+facts of ``py_classifier.analyze_source``: syntax ok, category, LOC, nesting
+depth, cyclomatic complexity, import/function/class counts and one
+``node_<Type>`` column per AST node type. Facts come from ``analyze_many``,
+so the table is built in parallel and reuses the AST cache.
+"""
+import os
+
+import pandas as pd
+
+from common.py_classifier import analyze_many
+from common.snippet_store import snippet_id
+
+METRICS_FILE = "../Data/snippet_metrics.csv"
+SCALAR_COLUMNS = ['syntax_ok', 'category', 'line_count', 'loc', 'node_count', 'nesting_depth',
+                  'cyclomatic_complexity', 'import_count', 'function_count', 'class_count']
+
+
+def build_metrics(items, ids=None, workers=1, cache=None, archive_base=None):
+    """Return the metrics frame for snippet paths (or archive ids); unreadable snippets are left out."""
+    items = list(items)
+    ids = list(ids) if ids is not None else [snippet_id(item) for item in items]
+    rows, index, node_rows = [], [], []
+    for sid, (facts, error) in zip(ids, analyze_many(items, cache, workers, archive_base=archive_base)):
+        if error:
+            print(f"⚠️ Error reading {sid}: {error}")
+            continue
+        index.append(sid)
+        rows.append([facts[column] for column in SCALAR_COLUMNS])
+        node_rows.append(facts['node_counts'])
+
+    frame = pd.DataFrame(rows, index=pd.Index(index, name='snippet_id'), columns=SCALAR_COLUMNS)
+    nodes = pd.DataFrame.from_records(node_rows, index=frame.index).fillna(0).astype('int64')
+    nodes = nodes.reindex(sorted(nodes.columns), axis=1).add_prefix('node_')
+    return pd.concat([frame, nodes], axis=1)
+
+
+def save_metrics(frame, path=METRICS_FILE):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    frame.to_csv(path)
+
+
+def load_metrics(path=METRICS_FILE):
+    frame = pd.read_csv(path, index_col='snippet_id')
+    node_columns = [c for c in frame.columns if c.startswith('node_') and c != 'node_count']
+    frame[node_columns] = frame[node_columns].fillna(0).astype('int64')
+    return frame
+
+
+def join_issue_counts(metrics, snippet_ids, categories):
+    """Metrics with one ``issues_<category>`` column per category, counting each snippet's issues (0 if none).
+
+    ``snippet_ids`` and ``categories`` are parallel sequences, one entry per issue.
+    """
+    issues = pd.DataFrame({'snippet_id': snippet_ids, 'category': categories})
+    counts = issues.groupby(['snippet_id', 'category']).size().unstack(fill_value=0).add_prefix('issues_')
+    joined = metrics.join(counts)
+    joined[counts.columns] = joined[counts.columns].fillna(0).astype('int64')
+    return joined
@@ -0,0 +1,75 @@
+"""Resolve linter-reported paths to snippets and conversations.
+
+Linters report the same snippet as ``..\\conversations_new\\conv\\x.py``,
+``/abs/RQ1/../conversations_new/conv/x.py`` or ``conversations_new/conv/x.py``
+depending on the OS and on how they were invoked. ``path_parts`` reduces all
+of them to one tuple of components; ``SnippetIndex`` maps every component
+suffix of the snippet list to the first snippet that ends with it, so a path
+resolves in one dict lookup per component instead of a scan of the list. A
+match needs at least ``<conversation>/<file>``; a bare file name matches only
+when it is unique.
+The conversation of a snippet is the folder it sits in.
+"""
+
+UNKNOWN_CONVERSATION = "unknown_conversation"
+
+# A match must cover at least <conversation>/<file>, so two snippets with the
+# same file name in different conversations are never confused.
+MIN_SUFFIX_PARTS = 2
+
+
+def path_parts(path):
+    """Components of ``path`` with ``/`` and ``\\`` treated alike, ``.`` dropped and ``dir/..`` collapsed."""
+    parts = []
+    for part in path.replace('\\', '/').split('/'):
+        if part in ('', '.'):
+            continue
+        if part == '..' and parts and parts[-1] != '..':
+            parts.pop()
+        else:
+            parts.append(part)
+    return tuple(parts)
+
+
+def conversation_of(path):
+    """Name of the conversation folder a snippet path points into."""
+    parts = path_parts(path)
+    return parts[-2] if len(parts) >= 2 else UNKNOWN_CONVERSATION
+
+
+class SnippetIndex:
+    def __init__(self, paths):
+        self.paths = list(paths)
+        self._by_suffix = {}
+        self._name_counts = {}
+        for position, path in enumerate(self.paths):
+            parts = path_parts(path)
+            if parts:
+                self._name_counts[parts[-1]] = self._name_counts.get(parts[-1], 0) + 1
+            for start in range(len(parts)):
+                # First snippet in the list wins, as with a linear scan
+                self._by_suffix.setdefault(parts[start:], position)
+
+    def __contains__(self, path):
+        return self.resolve(path) is not None
+
+    def resolve(self, path):
+        """The snippet-list entry sharing the longest path suffix with ``path`` (None if there is none).
+
+        A bare file name only matches when exactly one snippet has that name.
+        """
+        parts = path_parts(path)
+        if len(parts) < MIN_SUFFIX_PARTS:
+            if len(parts) == 1 and self._name_counts.get(parts[0]) == 1:
+                return self.paths[self._by_suffix[parts]]
+            return None
+        for start in range(len(parts) - MIN_SUFFIX_PARTS + 1):
+            position = self._by_suffix.get(parts[start:])
+            if position is not None:
+                return self.paths[position]
+        return None
+
+    def conversation(self, path):
+        """Conversation of the snippet ``path`` resolves to (None if it is not in the list)."""
+        snippet = self.resolve(path)
+        return conversation_of(snippet) if snippet is not None else None
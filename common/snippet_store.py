@@ -0,0 +1,88 @@
+"""Content-addressed store for extracted snippets.
+
+Each unique (normalized) snippet body is written once as
+``<store>/objects/<hash[:2]>/snippet_<hash><ext>``. The occurrence table
+``<store>/occurrences.csv`` records every (conversation, position) that points
+to a body, using the same ``<conversation>/snippet_<s>_<c>_<n><ext>`` ids as
+the ``conversations_new/`` tree, so downstream stages can lint each body once
+and fan results back out to every occurrence.
+"""
+import csv
+import hashlib
+import os
+
+OCCURRENCES_FILE = 'occurrences.csv'
+OCCURRENCE_FIELDS = ['hash', 'snippet_id', 'conversation', 'source_index', 'sharing_index', 'position', 'language']
+
+
+def normalize_snippet(content):
+    """Normalize line endings so bodies that only differ in CR/LF share one hash."""
+    return content.replace('\r\n', '\n').replace('\r', '\n')
+
+
+def content_hash(content):
+    """SHA-256 of the normalized snippet body."""
+    return hashlib.sha256(normalize_snippet(content).encode('utf-8')).hexdigest()
+
+
+def snippet_id(path):
+    """Return the ``<conversation>/<file>`` id for a snippet path in any form."""
+    parts = [p for p in path.replace('\\', '/').split('/') if p]
+    return '/'.join(parts[-2:])
+
+
+class SnippetStore:
+    def __init__(self, store_dir):
+        self.store_dir = store_dir
+        self.objects_dir = os.path.join(store_dir, 'objects')
+
+    def object_path(self, digest, ext):
+        # The "snippet_" prefix keeps module names valid for linters (C0103)
+        return os.path.join(self.objects_dir, digest[:2], f"snippet_{digest}{ext}")
+
+    def add(self, content, ext):
+        """Store a snippet body if it is new and return its hash."""
+        body = normalize_snippet(content)
+        digest = hashlib.sha256(body.encode('utf-8')).hexdigest()
+        path = self.object_path(digest, ext)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+                f.write(body)
+            os.replace(tmp_path, path)  # Atomic, so concurrent writers of the same body are safe
+        return digest
+
+    def write_occurrences(self, rows):
+        os.makedirs(self.store_dir, exist_ok=True)
+        rows = sorted(rows, key=lambda r: r['snippet_id'])
+        with open(os.path.join(self.store_dir, OCCURRENCES_FILE), 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=OCCURRENCE_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+
+    def load_occurrences(self):
+        with open(os.path.join(self.store_dir, OCCURRENCES_FILE), 'r', newline='', encoding='utf-8') as f:
+            return list(csv.DictReader(f))
+
+    def hash_by_id(self):
+        """Map ``<conversation>/<file>`` ids to their content hash."""
+        return {row['snippet_id']: row['hash'] for row in self.load_occurrences()}
+
+    def unique_targets(self, paths):
+        """Collapse a list of snippet paths to unique store objects.
+
+        Returns ``(targets, fan_out)``: the object paths to process, and a map
+        from each object path to the original paths that share its body.
+        Paths not found in the store are passed through unchanged.
+        """
+        hashes = self.hash_by_id()
+        fan_out = {}
+        for path in paths:
+            digest = hashes.get(snippet_id(path))
+            if digest is None:
+                target = path
+            else:
+                target = os.path.abspath(self.object_path(digest, os.path.splitext(path)[1])).replace('\\', '/')
+            fan_out.setdefault(target, []).append(path)
+        return list(fan_out), fan_out
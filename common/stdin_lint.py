@@ -0,0 +1,96 @@
+"""Lint code held in memory, without writing temp files.
+
+``PylintServer`` keeps one worker process with pylint loaded and lints each
+snippet in it over ``--from-stdin`` (so thousands of snippets cost one
+interpreter start), with the same per-item timeout the subprocess calls had.
+``run_eslint_stdin`` pipes code to ``eslint --stdin``. Both report the code
+under ``virtual_path(name)``: the file name inside an empty directory, which
+is what the old per-snippet temp directories looked like to the linters.
+"""
+import atexit
+import json
+import multiprocessing
+import os
+import shutil
+import subprocess
+import tempfile
+
+_empty_dir = None
+
+
+def virtual_path(name):
+    """Path a snippet called ``name`` is reported under (nothing is written there)."""
+    global _empty_dir
+    if _empty_dir is None:
+        _empty_dir = tempfile.mkdtemp(prefix='lint_')
+        atexit.register(shutil.rmtree, _empty_dir, True)
+    return os.path.join(_empty_dir, name)
+
+
+def _lint_source(path, code, extra_args=()):
+    from common.pylint_engine import lint_source
+    from astroid import MANAGER
+
+    try:
+        return lint_source(path, code, extra_args)
+    finally:
+        # Forget the stdin module so a later snippet with the same name cannot import it
+        MANAGER.astroid_cache.pop(os.path.splitext(os.path.basename(path))[0], None)
+
+
+def _lint_items(batch, extra_args=()):
+    from common.pylint_engine import lint_batch
+    from astroid import MANAGER
+
+    try:
+        return lint_batch(batch, extra_args, apply_filter=False)
+    finally:
+        for path, _ in batch:
+            MANAGER.astroid_cache.pop(os.path.splitext(os.path.basename(path))[0], None)
+
+
+class PylintServer:
+    """Long-lived pylint worker; ``lint`` returns pylint JSON issues or raises ``subprocess.TimeoutExpired``.
+
+    ``timeout`` is the default per call; a call may pass its own budget.
+    """
+
+    def __init__(self, timeout=30, extra_args=()):
+        self.timeout = timeout
+        self.extra_args = list(extra_args)
+        self._pool = None
+
+    def _call(self, func, args, timeout, cmd):
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(1)
+        timeout = self.timeout if timeout is None else timeout
+        pending = self._pool.apply_async(func, args)
+        try:
+            return pending.get(timeout)
+        except multiprocessing.TimeoutError:
+            # The worker is stuck on this snippet: replace it
+            self._pool.terminate()
+            self._pool = None
+            raise subprocess.TimeoutExpired(cmd, timeout)
+
+    def lint(self, code, path, timeout=None):
+        return self._call(_lint_source, (path, code, self.extra_args), timeout, ['pylint', '--from-stdin', path])
+
+    def lint_items(self, batch, timeout=None):
+        """``pylint_engine.lint_batch`` (unfiltered) on ``[(path, text_or_None), ...]`` in the worker."""
+        return self._call(_lint_items, (batch, self.extra_args), timeout, ['pylint'] + [path for path, _ in batch])
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+
+def run_eslint_stdin(code, path, eslint_cmd='eslint', extra_args=(), timeout=30):
+    """ESLint JSON output (a list of file results) for ``code`` reported as ``path``; None if it printed nothing."""
+    result = subprocess.run(
+        [eslint_cmd, '--stdin', f'--stdin-filename={path}', '--format=json'] + list(extra_args),
+        input=code, capture_output=True, text=True, encoding='utf-8', timeout=timeout
+    )
+    return json.loads(result.stdout) if result.stdout else None
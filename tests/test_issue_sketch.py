@@ -0,0 +1,57 @@
+import os
+import random
+import sys
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.issue_sketch import SpaceSaving, streaming_source
+
+
+def check_bounds(summary, truth):
+    """Space-Saving guarantees: overestimates within the recorded error, nothing frequent left out."""
+    for item, count in summary.counts.items():
+        assert count - summary.errors[item] <= truth[item] <= count, item
+    for item, count in truth.items():
+        if item not in summary.counts:
+            assert count <= summary.error_bound(), item
+    assert summary.error_bound() <= summary.total / summary.capacity
+
+
+def test_merge_keeps_item_split_across_summaries():
+    a, b = SpaceSaving(2), SpaceSaving(2)
+    for item in 'zzzpppppqqqqq':
+        a.add(item)
+    for item in 'zzzzr':
+        b.add(item)
+    a.merge(b)
+    assert a.most_common(1)[0][0] == 'z'
+    assert not a.guaranteed(1)
+    check_bounds(a, Counter('zzzpppppqqqqqzzzzr'))
+
+
+def test_merge_matches_single_stream_guarantees():
+    rng = random.Random(0)
+    for capacity in (5, 20):
+        stream = [f"R{int(rng.paretovariate(1.2))}" for _ in range(5000)]
+        single = SpaceSaving(capacity)
+        for item in stream:
+            single.add(item)
+        parts = [SpaceSaving(capacity) for _ in range(4)]
+        for item in stream:
+            parts[rng.randrange(4)].add(item)
+        merged = parts[0]
+        for part in parts[1:]:
+            merged.merge(part)
+        truth = Counter(stream)
+        assert merged.total == single.total == len(stream)
+        check_bounds(single, truth)
+        check_bounds(merged, truth)
+        top = truth.most_common(1)[0][0]
+        assert merged.most_common(1)[0][0] == single.most_common(1)[0][0] == top
+
+
+def test_streaming_source():
+    assert streaming_source(['PylintAnalyze.py', '--streaming'], 'out.json') == 'out.json'
+    assert streaming_source(['PylintAnalyze.py', '--streaming', '--exact'], 'out.json') == 'out.json'
+    assert streaming_source(['PylintAnalyze.py', '--streaming', 'out.ndjson', '--exact'], 'out.json') == 'out.ndjson'
+    assert streaming_source(['PylintAnalyze.py'], 'out.json') == 'out.json'
@@ -0,0 +1,62 @@
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.issue_store import ISSUE_COLUMNS, open_issues, load_store, pylint_rows, linter_results_rows
+
+PYLINT_OUTPUT = [
+    {'type': 'warning', 'path': '..\\conversations_new\\conv_a\\main.py', 'line': 3, 'message-id': 'W0611'},
+    {'type': 'convention', 'path': '../conversations_new/conv_a/main.py', 'line': 9, 'message-id': 'C0301'},
+    {'type': 'error', 'path': 'conversations_new/conv_b/main.py', 'line': 1, 'message-id': 'E0401'},
+]
+CATEGORIES = {'W0611': {'category': 'Code Smell'}, 'E0401': {'category': 'Potential Bug'}}
+LINTER_RESULTS = {
+    'conv_a/fetched.py': {'linter_results': {'fetched_issues': [{'code': 'W0612', 'line': 2}]}},
+    'conv_b/clean.js': {'linter_results': {'fetched_issues': []}},
+}
+
+
+def write_json(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    return str(path)
+
+
+def test_pylint_rows_normalize_paths_and_categories():
+    issues, snippets = pylint_rows(PYLINT_OUTPUT, CATEGORIES)
+    rows = [dict(zip(ISSUE_COLUMNS, row)) for row in issues]
+    assert [row['snippet_id'] for row in rows] == ['conv_a/main.py', 'conv_a/main.py', 'conv_b/main.py']
+    assert [row['category'] for row in rows] == ['Code Smell', 'Uncategorized', 'Potential Bug']
+    assert rows[2]['conversation'] == 'conv_b' and rows[2]['language'] == 'python'
+    assert snippets == []
+
+
+def test_linter_results_rows_keep_clean_snippets():
+    issues, snippets = linter_results_rows(LINTER_RESULTS)
+    assert [(row[0], row[1], row[3]) for row in issues] == [('pylint', 'W0612', 'warning')]
+    assert [(row[0], row[1], row[3]) for row in snippets] == [('pylint', 'conv_a/fetched.py', 'python'),
+                                                               ('eslint', 'conv_b/clean.js', 'javascript')]
+
+
+def test_open_issues_rebuilds_only_when_a_source_changes(tmp_path):
+    sources = [{'kind': 'pylint', 'path': write_json(tmp_path / 'pylint_output.json', PYLINT_OUTPUT),
+                'categories': write_json(tmp_path / 'categories.json', CATEGORIES)},
+               {'kind': 'linter_results', 'path': write_json(tmp_path / 'results.json', LINTER_RESULTS)}]
+    store_path = str(tmp_path / 'store.issues')
+    store = open_issues(store_path, sources)
+    assert len(store.issues) == 4
+    assert store.issues.where(tool='pylint', stage='generated').counts('conversation') == {'conv_a': 2, 'conv_b': 1}
+    assert store.issues.where(line=lambda line: line > 2).column('rule') == ['W0611', 'C0301']
+    assert store.issues_per_snippet(stage='fetched') == [1, 0]
+
+    loaded = load_store(store_path)
+    assert loaded.issues.column('rule') == store.issues.column('rule')
+    assert loaded.sources == store.sources
+
+    mtime = os.stat(store_path).st_mtime_ns
+    assert len(open_issues(store_path, sources).issues) == 4
+    assert os.stat(store_path).st_mtime_ns == mtime  # Unchanged sources: the store is not rewritten
+
+    write_json(tmp_path / 'pylint_output.json', PYLINT_OUTPUT[:1])
+    assert len(open_issues(store_path, sources).issues) == 2
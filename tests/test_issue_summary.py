@@ -0,0 +1,72 @@
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'RQ1'))
+from common.issue_summary import (IssueAggregate, aggregate_differences, aggregate_source, batch_record,
+                                  load_aggregate, save_aggregate)
+from UpdateIssueAggregate import folded_in
+
+OLD_BATCH = {
+    'conv_a/main.py': [{'code': 'E501', 'line_number': 1}, {'code': 'E501', 'line_number': 2}],
+    'conv_b/main.py': [{'code': 'F401', 'line_number': 1}],
+}
+NEW_BATCH = {
+    'conv_b/main.py': [{'code': 'E501', 'line_number': 4}],
+    'conv_c/util.py': [{'code': 'C901', 'line_number': 7}],
+}
+
+
+def flake8_aggregate(tmp_path, name, results):
+    path = tmp_path / name
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f)
+    return aggregate_source({'kind': 'flake8', 'path': str(path)})
+
+
+def test_merge_matches_a_recompute(tmp_path):
+    merged = flake8_aggregate(tmp_path, 'old.json', OLD_BATCH).merge(flake8_aggregate(tmp_path, 'new.json', NEW_BATCH))
+    both = {path: OLD_BATCH.get(path, []) + NEW_BATCH.get(path, []) for path in {**OLD_BATCH, **NEW_BATCH}}
+    recomputed = flake8_aggregate(tmp_path, 'all.json', both)
+    assert aggregate_differences(merged, recomputed) == []
+    summary = merged.summarize('category')
+    assert summary['Code Style'].total == 3
+    assert summary['Code Style'].files == {'conv_a/main.py', 'conv_b/main.py'}
+    assert summary['Code Style'].conversations == {'conv_a', 'conv_b'}
+    assert merged.overall().total == 5
+
+
+def test_subtract_and_re_add(tmp_path):
+    old = flake8_aggregate(tmp_path, 'old.json', OLD_BATCH)
+    new = flake8_aggregate(tmp_path, 'new.json', NEW_BATCH)
+    aggregate = IssueAggregate().merge(old).merge(new)
+    aggregate.subtract(new)
+    assert aggregate_differences(aggregate, old) == []
+    assert 'conv_c/util.py' not in aggregate.conversations
+    aggregate.merge(new)
+    assert aggregate.overall().total == 5
+    assert aggregate.summarize('rule')['C901'].conversations == {'conv_c'}
+
+
+def test_folded_in_replays_adds_and_subtracts(tmp_path):
+    old_source = {'kind': 'flake8', 'path': str(tmp_path / 'old.json')}
+    new_source = {'kind': 'flake8', 'path': str(tmp_path / 'new.json')}
+    flake8_aggregate(tmp_path, 'old.json', OLD_BATCH)
+    flake8_aggregate(tmp_path, 'new.json', NEW_BATCH)
+    old, new = batch_record('add', old_source)['source'], batch_record('add', new_source)['source']
+    batches = [batch_record('add', old_source), batch_record('add', new_source), batch_record('subtract', new_source)]
+    assert folded_in(batches) == [old]
+    assert folded_in(batches + [batch_record('add', new_source)]) == [old, new]
+
+
+def test_discard_snippets_and_save_round_trip(tmp_path):
+    aggregate = flake8_aggregate(tmp_path, 'old.json', OLD_BATCH).merge(flake8_aggregate(tmp_path, 'new.json', NEW_BATCH))
+    aggregate.discard_snippets(['conv_b/main.py'])
+    assert set(aggregate.conversations) == {'conv_a/main.py', 'conv_c/util.py'}
+    assert aggregate.overall().total == 3
+    path = str(tmp_path / 'flake8_output.aggregate.json')
+    save_aggregate(aggregate, path)
+    loaded = load_aggregate(path)
+    assert aggregate_differences(loaded, aggregate) == []
+    assert loaded.batches == aggregate.batches
@@ -0,0 +1,55 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.lint_cache import LintCache, cached_lint_as, cache_module, stored_issues, localize_issues, NEUTRAL_MODULE
+
+CODE = "import os\n"
+
+
+def fake_pylint(lint_path):
+    module = os.path.splitext(os.path.basename(lint_path))[0]
+    issues = [{'module': module, 'path': lint_path, 'line': 1, 'message-id': 'W0611', 'message': "Unused import os"}]
+    if module != module.lower():
+        issues.append({'module': module, 'path': lint_path, 'line': 1, 'message-id': 'C0103',
+                       'message': f'Module name "{module}" doesn\'t conform to snake_case naming style'})
+    return issues
+
+
+def test_identical_initial_and_final_share_one_entry(tmp_path):
+    cache = LintCache(str(tmp_path / 'lint_cache.sqlite'))
+    config = {'config': 'rc', 'args': []}
+    results = {}
+    for name in ('initial_snippet.py', 'final_snippet.py'):
+        path = str(tmp_path / name)
+        results[name] = cached_lint_as(cache, CODE, 'pylint', '1.0', config, path, fake_pylint)
+    assert (cache.misses, cache.hits) == (1, 1)
+    assert results['final_snippet.py'] == fake_pylint(str(tmp_path / 'final_snippet.py'))
+    assert results['initial_snippet.py'] == fake_pylint(str(tmp_path / 'initial_snippet.py'))
+    cache.close()
+
+
+def test_names_that_change_the_output_are_linted_as_themselves(tmp_path):
+    cache = LintCache(str(tmp_path / 'lint_cache.sqlite'))
+    config = {'config': 'rc', 'args': []}
+    for name in ('snippet.py', 'Snippet.py', 'Snippet.py'):
+        path = str(tmp_path / name)
+        assert cached_lint_as(cache, CODE, 'pylint', '1.0', config, path, fake_pylint) == fake_pylint(path)
+    assert (cache.misses, cache.hits) == (2, 1)
+    cache.close()
+
+
+def test_without_cache_code_is_linted_under_its_own_name():
+    assert cached_lint_as(None, CODE, 'pylint', '1.0', {}, 'Snippet.py', lambda path: [path]) == ['Snippet.py']
+
+
+def test_cache_module():
+    assert cache_module(CODE, 'snippet_1_0_2.py') == NEUTRAL_MODULE
+    assert cache_module(CODE, 'Snippet.py') == 'Snippet'
+    assert cache_module("import snippet\n", 'snippet.py') == 'snippet'  # W0406 import-self
+    assert cache_module(f"import {NEUTRAL_MODULE}\n", 'snippet.py') == 'snippet'
+
+
+def test_stored_issues_round_trip():
+    issues = fake_pylint('snippet_1_0_2.py')
+    assert localize_issues(stored_issues(issues, NEUTRAL_MODULE, 'snippet_1_0_2.py'), 'snippet_1_0_2.py') == issues
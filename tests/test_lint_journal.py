@@ -0,0 +1,58 @@
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common import lint_journal
+from common.lint_journal import LintJournal, read_journal, finalize_list, finalize_dict
+
+
+def test_timed_out_file_is_retried_on_resume(tmp_path):
+    journal_file, output_file = str(tmp_path / 'out.ndjson'), str(tmp_path / 'out.json')
+    first_run = [('a.py', [{'line': 1}]), ('slow.py', None), ('b.py', [])]
+    with LintJournal(journal_file) as journal:
+        assert journal.write_all(first_run) == ['slow.py']
+    finalize_list(journal_file, output_file)
+    with LintJournal(journal_file, resume=True) as journal:
+        assert journal.done == {'a.py', 'b.py'}
+        todo = [name for name, _ in first_run if name not in journal.done]
+        assert todo == ['slow.py']
+        assert journal.write_all([('slow.py', [{'line': 7}])], lambda key, issues: issues * 2) == []
+    assert finalize_list(journal_file, output_file, order=['a.py', 'slow.py', 'b.py']) == 3
+
+
+def test_resume_cuts_off_a_torn_last_line(tmp_path, monkeypatch):
+    monkeypatch.setattr(lint_journal, '_TAIL_BLOCK', 8)  # the torn line spans several blocks
+    journal_file, output_file = str(tmp_path / 'out.ndjson'), str(tmp_path / 'out.json')
+    with LintJournal(journal_file) as journal:
+        journal.write('a.py', [{'line': 1}])
+    with open(journal_file, 'a', encoding='utf-8') as f:
+        f.write('{"key": "b.py", "value": [{"line": 2}, {"li')
+    with LintJournal(journal_file, resume=True) as journal:
+        assert journal.done == {'a.py'}
+        journal.write('b.py', [{'line': 2}])
+    assert [key for key, _ in read_journal(journal_file)] == ['a.py', 'b.py']
+    assert finalize_list(journal_file, output_file) == 2
+    with open(output_file, encoding='utf-8') as f:
+        assert json.load(f) == [{'line': 1}, {'line': 2}]
+
+
+def test_resume_of_a_journal_without_a_complete_line(tmp_path):
+    journal_file = str(tmp_path / 'out.ndjson')
+    with open(journal_file, 'w', encoding='utf-8') as f:
+        f.write('{"key": "a.py"')
+    with LintJournal(journal_file, resume=True) as journal:
+        assert journal.done == set()
+    assert os.path.getsize(journal_file) == 0
+
+
+def test_finalize_dict_keeps_the_latest_record(tmp_path):
+    journal_file, output_file = str(tmp_path / 'out.ndjson'), str(tmp_path / 'out.json')
+    with LintJournal(journal_file) as journal:
+        journal.write('a', {'issues': 1})
+        journal.write('b', {'issues': 2})
+        journal.write('a', {'issues': 3})
+        journal.write('b', None)
+    assert finalize_dict(journal_file, output_file) == 1
+    with open(output_file, encoding='utf-8') as f:
+        assert f.read() == json.dumps({'a': {'issues': 3}}, indent=2)
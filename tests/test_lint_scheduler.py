@@ -0,0 +1,85 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.lint_scheduler import LintBudget, LintHistory, run_scheduled, write_quarantine_report
+
+
+def always_times_out(timeout):
+    raise subprocess.TimeoutExpired(['pylint'], timeout)
+
+
+def test_timeout_retries_once_at_maximum_then_counts():
+    budget = LintBudget('pylint', maximum=30, warmup=1)
+    budget.record('pylint:fast', 10, 1.0)
+    timeouts = []
+
+    def lint(timeout):
+        timeouts.append(timeout)
+        return always_times_out(timeout)
+
+    key = budget.key("while True: pass\n")
+    with pytest.raises(subprocess.TimeoutExpired):
+        budget.run(key, 17, 'slow.py', lint)
+    assert timeouts == [5, 30]  # adaptive budget (3 x 1 s, at least the 5 s minimum), then the maximum
+    assert budget.history.get(key)['timeouts'] == 1
+    assert budget.run(budget.key("pass\n"), 5, 'ok.py', lambda timeout: ['ok']) == ['ok']
+
+
+def test_quarantine_after_repeated_timeouts_and_expiry():
+    budget = LintBudget('pylint', maximum=30, quarantine_after=2, quarantine_days=30)
+    key = budget.key("while True: pass\n")
+    for _ in range(2):
+        with pytest.raises(subprocess.TimeoutExpired) as raised:
+            budget.run(key, 17, 'slow.py', always_times_out)
+        assert raised.value.output != 'quarantined'
+    with pytest.raises(subprocess.TimeoutExpired) as raised:
+        budget.run(key, 17, 'slow.py', lambda timeout: pytest.fail("quarantined code was linted"))
+    assert raised.value.output == 'quarantined'
+
+    budget.history.update(key, last_timeout=time.time() - 31 * 86400)
+    assert not budget.is_quarantined(key)
+    assert budget.run(key, 17, 'slow.py', lambda timeout: []) == []
+
+
+def test_clear_timeouts_lifts_quarantine_per_linter(tmp_path):
+    history = LintHistory(str(tmp_path / 'lint_history.json'))
+    pylint, eslint = LintBudget('pylint', 30, history), LintBudget('eslint', 30, history)
+    pylint_key, eslint_key = pylint.key("x = 1\n"), eslint.key("let x = 1;\n")
+    for budget, key in ((pylint, pylint_key), (eslint, eslint_key)):
+        for _ in range(2):
+            history.add_timeout(key, 6, 'snippet')
+        assert budget.is_quarantined(key)
+    assert write_quarantine_report(history, path=str(tmp_path / 'quarantine.json')) == 2
+    assert history.clear_timeouts('pylint') == 1
+    assert not pylint.is_quarantined(pylint_key)
+    assert eslint.is_quarantined(eslint_key)
+    history.save()
+    with open(tmp_path / 'lint_history.json', encoding='utf-8') as f:
+        assert json.load(f)[pylint_key]['timeouts'] == 0
+
+
+class FakeWorker:
+    def lint(self, job, timeout):
+        if job == 'slow':
+            raise subprocess.TimeoutExpired(['pylint'], timeout)
+        return [job]
+
+    def close(self):
+        pass
+
+
+def test_run_scheduled_leaves_timed_out_and_quarantined_jobs_without_result():
+    budget = LintBudget('pylint', maximum=30)
+    for _ in range(2):
+        budget.history.add_timeout('pylint:stuck', 1, 'stuck')
+    jobs = [('small', 'pylint:small', 1), ('slow', 'pylint:slow', 50), ('stuck', 'pylint:stuck', 1),
+            ('big', 'pylint:big', 100)]
+    results = dict(run_scheduled(jobs, budget, FakeWorker, workers=2))
+    assert results == {'small': ['small'], 'big': ['big'], 'slow': None, 'stuck': None}
+    assert budget.history.get('pylint:slow')['timeouts'] == 1
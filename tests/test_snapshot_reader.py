@@ -0,0 +1,47 @@
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.snapshot_reader import iter_sources
+
+DOCUMENT = ('{"Meta": {"count": -3.5e10, "ok": true}, "Sources": [\n'
+            '  {"URL": "https://example.com/\\u00e9", "Score": -3.5, "Size": 1e5, "Ratio": 2.25E-3,\n'
+            '   "ChatgptSharing": [{"Title": "a \\"quoted\\" [title} \\\\", "Conversations": [], "Tokens": 123456}]},\n'
+            '  12, -0.5, 7E+2, null, "text", [1, 2.0, 3e-1],\n'
+            '  {"Score": 1e10}\n'
+            '], "Tail": 42}')
+
+
+def test_every_chunk_size(tmp_path):
+    path = tmp_path / 'snapshot.json'
+    path.write_text(DOCUMENT, encoding='utf-8')
+    expected = list(enumerate(json.loads(DOCUMENT)['Sources']))
+    for chunk_size in range(1, len(DOCUMENT) + 1):
+        assert list(iter_sources(str(path), chunk_size)) == expected, chunk_size
+
+
+def test_skipped_sources_at_every_chunk_size(tmp_path):
+    path = tmp_path / 'snapshot.json'
+    path.write_text(DOCUMENT, encoding='utf-8')
+    expected = [(i, source) for i, source in enumerate(json.loads(DOCUMENT)['Sources']) if i % 2]
+    for chunk_size in range(1, len(DOCUMENT) + 1):
+        assert list(iter_sources(str(path), chunk_size, keep=lambda i: i % 2)) == expected, chunk_size
+    # Skipping every container leaves the scanner on the next value
+    assert [i for i, _ in iter_sources(str(path), 3, keep=lambda i: i == 7)] == [7]
+
+
+def test_json_entries_at_every_chunk_size(tmp_path):
+    from common.snapshot_reader import iter_json_entries, iter_nested_entries
+
+    report = {'errors': [], 'metrics': {'a.py': {'loc': 3}, '_totals': {'loc': 3}},
+              'results': [{'test_id': 'B101', 'line_number': 1.5e1}, {'test_id': 'B602', 'code': 'x = "[{\\"}]"'}]}
+    report_path, list_path = tmp_path / 'report.json', tmp_path / 'issues.json'
+    report_path.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    list_path.write_text(json.dumps(report['results']), encoding='utf-8')
+    nested = [(key, entry, value) for key in ('metrics', 'results')
+              for entry, value in (report[key].items() if key == 'metrics' else enumerate(report[key]))]
+    for chunk_size in range(1, 40):
+        assert list(iter_json_entries(str(report_path), chunk_size)) == list(report.items())
+        assert list(iter_json_entries(str(list_path), chunk_size)) == list(enumerate(report['results']))
+        assert list(iter_nested_entries(str(report_path), ('results', 'metrics'), chunk_size)) == nested
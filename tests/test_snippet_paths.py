@@ -0,0 +1,36 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.snippet_paths import SnippetIndex, path_parts, conversation_of, UNKNOWN_CONVERSATION
+
+SNIPPETS = [
+    'conversations_new/conv_a/main.py',
+    'conversations_new/conv_b/main.py',
+    'conversations_new/conv_b/helper.py',
+]
+
+
+def test_path_parts_normalizes_separators_and_dots():
+    expected = ('conversations_new', 'conv_a', 'main.py')
+    assert path_parts('..\\conversations_new\\conv_a\\main.py') == ('..',) + expected
+    assert path_parts('/abs/RQ1/../conversations_new/./conv_a/main.py')[-3:] == expected
+    assert conversation_of('conversations_new/conv_a/main.py') == 'conv_a'
+    assert conversation_of('main.py') == UNKNOWN_CONVERSATION
+
+
+def test_resolve_needs_the_conversation_folder():
+    index = SnippetIndex(SNIPPETS)
+    assert index.resolve('C:\\data\\conversations_new\\conv_b\\main.py') == SNIPPETS[1]
+    assert index.resolve('conv_a/main.py') == SNIPPETS[0]
+    assert index.conversation('/abs/RQ1/../conversations_new/conv_b/main.py') == 'conv_b'
+    assert index.resolve('conv_c/main.py') is None
+    assert index.resolve('conv_a/helper.py') is None
+
+
+def test_bare_file_name_matches_only_when_unique():
+    index = SnippetIndex(SNIPPETS)
+    assert index.resolve('main.py') is None
+    assert 'main.py' not in index
+    assert index.resolve('helper.py') == SNIPPETS[2]
+    assert index.conversation('missing.py') is None